@@ -49,6 +49,18 @@ class MultipleFloatChromosome(MultipleValueChromosome, ChromosomeInterface):
         """
         return len(self._needs_opt_list)
 
+    def get_local_optimization_params(self):
+        """Get the current values of the local optimization parameters
+
+        Returns
+        -------
+        list of numeric
+            current values of the parameters
+        """
+        if not self._needs_opt_list:
+            return []
+        return [self.values[index] for index in self._needs_opt_list]
+
     def set_local_optimization_params(self, params):
         """Set local optimization parameters
 
@@ -3,6 +3,9 @@
 This module defines the a basic form of the evaluation phase of bingo
 evolutionary algorithms.
 """
+import numpy as np
+
+from .fitness_function import PopulationOptimizationMixin
 
 
 class Evaluation:
@@ -11,13 +14,30 @@ class Evaluation:
     A base class for the fitness evaluation of populations of genetic
     individuals (list of chromosomes) in bingo.  All individuals in the
     population are evaluated with a fitness function unless their fitness has
-    already been set.
+    already been set.  Fitness functions that are able to locally optimize a
+    whole population at once (i.e., `PopulationOptimizationMixin` s) do so
+    for all the unevaluated individuals before evaluation.
 
     Parameters
     ----------
     fitness_function : FitnessFunction
                         The function class that is used to calculate fitnesses
                         of individuals in the population.
+    interval_prescreening : bool
+                            (Optional) Whether to bound the equations of the
+                            individuals with interval arithmetic before
+                            evaluation.  Individuals that provably cannot
+                            evaluate to a finite value anywhere in the bounds
+                            of the training data are given a nan fitness
+                            without evaluation or local optimization.  This
+                            requires individuals with an
+                            `evaluate_equation_interval` method and training
+                            data with `x_bounds`, e.g., `AGraph` and
+                            `ExplicitTrainingData`.  Default False.
+    constant_bounds : tuple(numeric, numeric)
+                      (Optional) Lower and upper bounds of the constants of
+                      individuals that need local optimization, used in
+                      interval prescreening.  Default unbounded.
 
     Attributes
     ----------
@@ -27,8 +47,11 @@ class Evaluation:
     eval_count : int
                  the number of fitness function evaluations that have occurred
     """
-    def __init__(self, fitness_function):
+    def __init__(self, fitness_function, interval_prescreening=False,
+                 constant_bounds=None):
         self.fitness_function = fitness_function
+        self._interval_prescreening = interval_prescreening
+        self._constant_bounds = constant_bounds
 
     @property
     def eval_count(self):
@@ -47,6 +70,26 @@ class Evaluation:
         population : list of chromosomes
                      population for which fitness should be calculated
         """
+        unevaluated = [indv for indv in population if not indv.fit_set]
+        if self._interval_prescreening:
+            unevaluated = self._prescreen(unevaluated)
+        if isinstance(self.fitness_function, PopulationOptimizationMixin):
+            self.fitness_function.optimize_population(unevaluated)
+        for indv in unevaluated:
+            indv.fitness = self.fitness_function(indv)
+
+    def _prescreen(self, population):
+        x_bounds = self.fitness_function.training_data.x_bounds
+        remaining = []
         for indv in population:
-            if not indv.fit_set:
-                indv.fitness = self.fitness_function(indv)
+            lower, upper = indv.evaluate_equation_interval(
+                x_bounds, self._constant_bounds)
+            if _is_provably_invalid(lower, upper):
+                indv.fitness = np.nan
+            else:
+                remaining.append(indv)
+        return remaining
+
+
+def _is_provably_invalid(lower, upper):
+    return np.isnan(lower) or (lower == upper and np.isinf(lower))
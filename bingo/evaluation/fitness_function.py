@@ -52,6 +52,26 @@ class FitnessFunction(metaclass=ABCMeta):
         raise NotImplementedError
 
 
+class PopulationOptimizationMixin(metaclass=ABCMeta):
+    """Mixin for fitness functions that optimize whole populations
+
+    An interface for `FitnessFunction` s that are able to locally optimize
+    all the individuals of a population at once.  `Evaluation` uses it for
+    all the unevaluated individuals of a population before evaluating them
+    one at a time.
+    """
+    @abstractmethod
+    def optimize_population(self, population):
+        """Performs local optimization of a population
+
+        Parameters
+        ----------
+        population : list of chromosomes
+            The individuals to be optimized
+        """
+        raise NotImplementedError
+
+
 class VectorBasedFunction(FitnessFunction, metaclass=ABCMeta):
     """Fitness evaluation based on vectorized fitness
 
@@ -63,16 +83,47 @@ class VectorBasedFunction(FitnessFunction, metaclass=ABCMeta):
         String defining the measure of error to use. Available options are:
         'mean absolute error', 'mean squared error', and
         'root mean squared error'
+
+    Notes
+    -----
+    If the training data has sample `weights`, the fitness vector is expected
+    to be scaled by the square roots of the weights so that its sum of
+    squares is the weighted sum of squares.  The metrics are then the weighted
+    means over all the samples represented by the training data.  If the
+    training data also has an `aggregated_squared_error`, i.e., the squared
+    error lost by aggregating samples, it is included in the squared error
+    metrics.
+
+    Subclasses for which each entry of the fitness vector depends on a single
+    point of the training data set `POINTWISE_FITNESS_VECTOR`, i.e., the
+    fitness vector for a subset of the training data is the corresponding
+    subset of the fitness vector.
+
+    Subclasses that set `WORKSPACE_FITNESS_VECTOR` calculate the fitness
+    vector in a reusable workspace (see
+    `evaluate_fitness_vector_in_workspace`), and their fitness is calculated
+    in place, avoiding temporary fitness vectors.
     """
+    POINTWISE_FITNESS_VECTOR = False
+    WORKSPACE_FITNESS_VECTOR = False
+
     def __init__(self, training_data=None, metric="mae"):
         super().__init__(training_data)
+        self._workspace = None
 
         if metric in ["mean absolute error", "mae"]:
-            self._metric = VectorBasedFunction._mean_absolute_error
+            self._metric = self._mean_absolute_error
+            self._in_place_metric = self._in_place_mean_absolute_error
+            self._metric_derivatives = self._mean_absolute_error_derivatives
         elif metric in ["mean squared error", "mse"]:
-            self._metric = VectorBasedFunction._mean_squared_error
+            self._metric = self._mean_squared_error
+            self._in_place_metric = self._in_place_mean_squared_error
+            self._metric_derivatives = self._mean_squared_error_derivatives
         elif metric in ["root mean squared error", "rmse"]:
-            self._metric = VectorBasedFunction._root_mean_squared_error
+            self._metric = self._root_mean_squared_error
+            self._in_place_metric = self._in_place_root_mean_squared_error
+            self._metric_derivatives = \
+                self._root_mean_squared_error_derivatives
         else:
             raise KeyError("Invalid metric for Fitness Function")
 
@@ -92,6 +143,9 @@ class VectorBasedFunction(FitnessFunction, metaclass=ABCMeta):
          :
            fitness of the individual
         """
+        if self.WORKSPACE_FITNESS_VECTOR:
+            return self._in_place_metric(
+                self.evaluate_fitness_vector_in_workspace(individual))
         fitness_vector = self.evaluate_fitness_vector(individual)
         return self._metric(fitness_vector)
 
@@ -99,14 +153,112 @@ class VectorBasedFunction(FitnessFunction, metaclass=ABCMeta):
     def evaluate_fitness_vector(self, individual):
         raise NotImplementedError
 
-    @staticmethod
-    def _mean_absolute_error(vector):
-        return np.mean(np.abs(vector))
+    def evaluate_fitness_vector_in_workspace(self, individual):
+        """Fitness vector calculated in a reusable workspace
+
+        Identical to `evaluate_fitness_vector` except that, for subclasses
+        with `WORKSPACE_FITNESS_VECTOR`, the fitness vector is written to a
+        workspace owned by the fitness function, which is overwritten by the
+        next call.  The vector must therefore be used (or copied) before the
+        next evaluation.
+
+        Parameters
+        ----------
+        individual : chromosomes
+                     individual for which the fitness vector is calculated
+
+        Returns
+        -------
+        array of numeric
+            the fitness vector, possibly a view of the workspace
+        """
+        return self.evaluate_fitness_vector(individual)
+
+    def _get_workspace(self, shape):
+        if self._workspace is None or self._workspace.shape != shape:
+            self._workspace = np.empty(shape)
+        return self._workspace
+
+    def __getstate__(self):
+        # the workspace is scratch memory and is not worth pickling
+        state = self.__dict__.copy()
+        state["_workspace"] = None
+        return state
+
+    def evaluate_metric(self, fitness_vector):
+        """The metric of a fitness vector
+
+        Parameters
+        ----------
+        fitness_vector : array of numeric
+            a fitness vector for `training_data`
+
+        Returns
+        -------
+         :
+           the measure of error of the fitness vector
+        """
+        return self._metric(fitness_vector)
+
+    def _get_sample_weighting(self, vector):
+        # the square roots of the weights of each entry of the vector, the
+        # number of samples represented and the squared error lost by
+        # aggregating samples
+        weights = getattr(self.training_data, "weights", None)
+        if weights is None:
+            return 1., len(vector), 0.
+        entries_per_sample = len(vector) // len(weights)
+        aggregated_squared_error = getattr(self.training_data,
+                                           "aggregated_squared_error", None)
+        return np.repeat(np.sqrt(weights), entries_per_sample), \
+            entries_per_sample * np.sum(weights), \
+            0. if aggregated_squared_error is None \
+            else np.sum(aggregated_squared_error)
+
+    def _mean_absolute_error(self, vector):
+        sqrt_weights, num_samples, _ = self._get_sample_weighting(vector)
+        return np.sum(sqrt_weights * np.abs(vector)) / num_samples
+
+    def _root_mean_squared_error(self, vector):
+        return np.sqrt(self._mean_squared_error(vector))
+
+    def _mean_squared_error(self, vector):
+        _, num_samples, aggregated_squared_error = \
+            self._get_sample_weighting(vector)
+        return (np.sum(np.square(vector)) + aggregated_squared_error) \
+            / num_samples
+
+    # The in place metrics overwrite the vector rather than allocating
+    # temporaries; they are used with workspace vectors
+    def _in_place_mean_absolute_error(self, vector):
+        sqrt_weights, num_samples, _ = self._get_sample_weighting(vector)
+        np.abs(vector, out=vector)
+        if np.ndim(sqrt_weights) > 0:
+            vector *= sqrt_weights
+        return np.sum(vector) / num_samples
+
+    def _in_place_root_mean_squared_error(self, vector):
+        return np.sqrt(self._in_place_mean_squared_error(vector))
+
+    def _in_place_mean_squared_error(self, vector):
+        _, num_samples, aggregated_squared_error = \
+            self._get_sample_weighting(vector)
+        np.square(vector, out=vector)
+        return (np.sum(vector) + aggregated_squared_error) / num_samples
+
+    # The derivatives of the metrics with respect to the fitness vector, r,
+    # are given as the gradient, g, and the coefficients a and b of the
+    # hessian a*I + b*g*g^T
+    def _mean_absolute_error_derivatives(self, vector):
+        sqrt_weights, num_samples, _ = self._get_sample_weighting(vector)
+        return sqrt_weights * np.sign(vector) / num_samples, 0., 0.
 
-    @staticmethod
-    def _root_mean_squared_error(vector):
-        return np.sqrt(np.mean(np.square(vector)))
+    def _root_mean_squared_error_derivatives(self, vector):
+        _, num_samples, _ = self._get_sample_weighting(vector)
+        rmse = self._root_mean_squared_error(vector)
+        return vector / (num_samples * rmse), 1. / (num_samples * rmse), \
+            -1. / rmse
 
-    @staticmethod
-    def _mean_squared_error(vector):
-        return np.mean(np.square(vector))
+    def _mean_squared_error_derivatives(self, vector):
+        _, num_samples, _ = self._get_sample_weighting(vector)
+        return 2. * vector / num_samples, 2. / num_samples, 0.
@@ -0,0 +1,173 @@
+"""Mixins for fitness functions that can provide derivative information.
+
+This module defines interfaces that fitness functions can implement when they
+are able to calculate derivatives of their fitness (or fitness vector) with
+respect to the local optimization parameters of an individual.  Local
+optimizers use this information, when available, in place of finite
+differences.
+"""
+from abc import ABCMeta, abstractmethod
+
+import numpy as np
+
+
+class VectorGradientMixin(metaclass=ABCMeta):
+    """Mixin for vector based fitness functions with jacobians
+
+    An interface for `VectorBasedFunction` s that are able to calculate the
+    jacobian of their fitness vector with respect to the local optimization
+    parameters of an individual.
+    """
+    @abstractmethod
+    def get_fitness_vector_and_jacobian(self, individual):
+        """Fitness vector and its jacobian
+
+        Parameters
+        ----------
+        individual : chromosomes
+            individual for which the fitness vector and jacobian will be
+            calculated
+
+        Returns
+        -------
+        tuple(array of numeric of length M, MxL array of numeric)
+            the fitness vector and its derivatives with respect to the L local
+            optimization parameters of the individual
+        """
+        raise NotImplementedError
+
+    def has_jacobian_for(self, individual):
+        """Whether the jacobian can be calculated for an individual
+
+        Parameters
+        ----------
+        individual : chromosomes
+            individual for which the jacobian would be calculated
+
+        Returns
+        -------
+        bool
+            True unless the individual lacks the derivatives needed for the
+            jacobian, e.g., those only available in the Python AGraph
+        """
+        return True
+
+
+class VectorHessianMixin(VectorGradientMixin):
+    """Mixin for vector based fitness functions with second derivatives
+
+    An interface for `VectorBasedFunction` s that are able to calculate the
+    second derivatives of their fitness vector with respect to the local
+    optimization parameters of an individual.  The gradient, hessian and
+    hessian vector products of the fitness itself follow from the metric of
+    the `VectorBasedFunction`; these are used by Newton-type local
+    optimization algorithms.
+    """
+    @abstractmethod
+    def get_fitness_vector_jacobian_and_hessian(self, individual):
+        """Fitness vector and its first and second derivatives
+
+        Parameters
+        ----------
+        individual : chromosomes
+            individual for which the fitness vector and derivatives will be
+            calculated
+
+        Returns
+        -------
+        tuple(array of numeric of length M, MxL array of numeric,
+              MxLxL array of numeric)
+            the fitness vector and its first and second derivatives with
+            respect to the L local optimization parameters of the individual
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_fitness_vector_jacobian_and_hessian_vector_product(self,
+                                                               individual,
+                                                               vector):
+        """Fitness vector, its jacobian and its hessian vector product
+
+        Parameters
+        ----------
+        individual : chromosomes
+            individual for which the fitness vector and derivatives will be
+            calculated
+        vector : array of numeric of length L
+            vector by which the second derivatives are multiplied
+
+        Returns
+        -------
+        tuple(array of numeric of length M, MxL array of numeric,
+              MxL array of numeric)
+            the fitness vector, its jacobian and the product of its second
+            derivatives with `vector`
+        """
+        raise NotImplementedError
+
+    def get_fitness_gradient(self, individual):
+        """Gradient of the fitness
+
+        Parameters
+        ----------
+        individual : chromosomes
+            individual for which the gradient will be calculated
+
+        Returns
+        -------
+        array of numeric of length L
+            derivatives of the fitness with respect to the L local
+            optimization parameters of the individual
+        """
+        vector, jacobian = self.get_fitness_vector_and_jacobian(individual)
+        metric_gradient, _, _ = self._metric_derivatives(vector)
+        return jacobian.T.dot(metric_gradient)
+
+    def get_fitness_hessian(self, individual):
+        """Hessian of the fitness
+
+        Parameters
+        ----------
+        individual : chromosomes
+            individual for which the hessian will be calculated
+
+        Returns
+        -------
+        LxL array of numeric
+            second derivatives of the fitness with respect to the L local
+            optimization parameters of the individual
+        """
+        vector, jacobian, vector_hessian = \
+            self.get_fitness_vector_jacobian_and_hessian(individual)
+        metric_gradient, identity_coef, rank_one_coef = \
+            self._metric_derivatives(vector)
+        gradient = jacobian.T.dot(metric_gradient)
+        return identity_coef * jacobian.T.dot(jacobian) \
+            + rank_one_coef * np.outer(gradient, gradient) \
+            + np.tensordot(metric_gradient, vector_hessian, axes=1)
+
+    def get_fitness_hessian_vector_product(self, individual, vector):
+        """Product of the hessian of the fitness with a vector
+
+        Parameters
+        ----------
+        individual : chromosomes
+            individual for which the hessian vector product will be
+            calculated
+        vector : array of numeric of length L
+            vector by which the hessian is multiplied
+
+        Returns
+        -------
+        array of numeric of length L
+            the product of the hessian of the fitness with `vector`
+        """
+        fitness_vector, jacobian, vector_hessian_product = \
+            self.get_fitness_vector_jacobian_and_hessian_vector_product(
+                individual, vector)
+        metric_gradient, identity_coef, rank_one_coef = \
+            self._metric_derivatives(fitness_vector)
+        gradient = jacobian.T.dot(metric_gradient)
+        return identity_coef * jacobian.T.dot(jacobian.dot(vector)) \
+            + rank_one_coef * gradient * gradient.dot(vector) \
+            + vector_hessian_product.T.dot(metric_gradient)
@@ -0,0 +1,175 @@
+"""Evaluation by racing individuals on growing subsets of the training data
+
+This module defines an evaluation phase that is more computationally efficient
+than the basic `Evaluation` when large numbers of individuals are evaluated on
+large amounts of training data.  Individuals are raced in a successive halving
+scheme: all individuals are evaluated on a small random subset of the
+training data, the worst fraction is discarded and the subset is doubled for
+the survivors until the full training data is reached.  Only the survivors of
+the race are evaluated on the full training data.  Races can be limited to the
+groups of individuals that are compared in selection, e.g., parents and their
+offspring in deterministic crowding.
+"""
+import numpy as np
+
+from .evaluation import Evaluation
+from .fitness_function import PopulationOptimizationMixin
+from ..util.argument_validation import argument_validation
+
+
+class RacingEvaluation(Evaluation):
+    """Fitness evaluation of a population using successive halving.
+
+    Individuals whose fitness has not yet been set are raced on random subsets
+    of the training data that double in size each round.  After each round
+    only the best `survival_fraction` of the individuals (but at least
+    `min_survivors` of them) continue.  Discarded individuals are given a
+    conservative fitness, `discarded_fitness`, such that they are never
+    preferred over individuals with a full-data fitness.  `min_survivors`
+    should be chosen based on the needs of the selection in the evolutionary
+    algorithm, e.g., the number of offspring that can possibly be selected.
+
+    By default all unevaluated individuals race against each other, which
+    suits selections that compare the whole population (e.g., tournaments).
+    Selections that only compare individuals within groups need
+    `comparison_groups`: each group is raced separately, with individuals
+    whose fitness is already set competing on the data subsets without being
+    discarded.  E.g., for `DeterministicCrowdingEA` each child races only
+    against its parent with
+    `comparison_groups=DeterministicCrowding.get_parent_offspring_pairs`.
+
+    Parameters
+    ----------
+    fitness_function : FitnessFunction
+                        The function class that is used to calculate fitnesses
+                        of individuals in the population.  Its training data
+                        must support indexing and `len`.
+    initial_sample_size : int
+                          (Optional) The number of training data points used
+                          in the first round of the race.  Default 256.
+    survival_fraction : float (0 - 1)
+                        (Optional) The fraction of individuals that survive
+                        each round of the race.  Default 0.5.
+    min_survivors : int
+                    (Optional) The minimum number of individuals that are
+                    evaluated on the full training data.  Default 1.
+    discarded_fitness : numeric
+                        (Optional) The fitness given to discarded individuals.
+                        Default inf.
+    interval_prescreening : bool
+                            (Optional) Whether to bound the equations of the
+                            individuals with interval arithmetic before
+                            evaluation.  See `Evaluation`.  Default False.
+    constant_bounds : tuple(numeric, numeric)
+                      (Optional) Lower and upper bounds of the constants of
+                      individuals that need local optimization, used in
+                      interval prescreening.  Default unbounded.
+    comparison_groups : function
+                        (Optional) A function that splits the evaluated
+                        population into the groups of individuals that are
+                        compared in selection.  `min_survivors` then applies
+                        to each group.  Default None, i.e., a single race of
+                        all unevaluated individuals.
+
+    Attributes
+    ----------
+    fitness_function : FitnessFunction
+                        The function class that is used to calculate fitnesses
+                        of individuals in the population.
+    eval_count : int
+                 the number of fitness function evaluations that have occurred
+
+    Notes
+    -----
+    Individuals that need local optimization are optimized on the subset of
+    the first round of the race; their parameters are not re-optimized on the
+    larger subsets.
+    """
+    @argument_validation(initial_sample_size={">": 0},
+                         survival_fraction={">": 0, "<": 1},
+                         min_survivors={">": 0})
+    def __init__(self, fitness_function, initial_sample_size=256,
+                 survival_fraction=0.5, min_survivors=1,
+                 discarded_fitness=np.inf, interval_prescreening=False,
+                 constant_bounds=None, comparison_groups=None):
+        super().__init__(fitness_function, interval_prescreening,
+                         constant_bounds)
+        self._initial_sample_size = initial_sample_size
+        self._survival_fraction = survival_fraction
+        self._min_survivors = min_survivors
+        self._discarded_fitness = discarded_fitness
+        self._comparison_groups = comparison_groups
+
+    def __call__(self, population):
+        """Evaluates the fitness of a population
+
+        Parameters
+        ----------
+        population : list of chromosomes
+                     population for which fitness should be calculated
+        """
+        evaluated = [indv for indv in population if indv.fit_set]
+        unevaluated = [indv for indv in population if not indv.fit_set]
+        if self._interval_prescreening:
+            unevaluated = self._prescreen(unevaluated)
+        groups = self._get_racing_groups(population, evaluated, unevaluated)
+
+        full_training_data = self.fitness_function.training_data
+        try:
+            self._race(unevaluated, groups, full_training_data)
+        finally:
+            self.fitness_function.training_data = full_training_data
+
+        for indv in unevaluated:
+            if not indv.fit_set:
+                indv.fitness = self.fitness_function(indv)
+
+    def _get_racing_groups(self, population, evaluated, unevaluated):
+        if self._comparison_groups is None:
+            return [unevaluated]
+        # prescreened individuals do not race
+        racing_ids = {id(indv) for indv in evaluated + unevaluated}
+        unevaluated_ids = {id(indv) for indv in unevaluated}
+        groups = []
+        for group in self._comparison_groups(population):
+            group = [indv for indv in group if id(indv) in racing_ids]
+            if any(id(indv) in unevaluated_ids for indv in group):
+                groups.append(group)
+        return groups
+
+    def _race(self, unevaluated, groups, full_training_data):
+        data_size = len(full_training_data)
+        order = np.random.permutation(data_size)
+        sample_size = self._initial_sample_size
+        optimized = False
+        while sample_size < data_size and \
+                any(len(group) > self._min_survivors for group in groups):
+            self.fitness_function.training_data = \
+                full_training_data[np.sort(order[:sample_size])]
+            if not optimized:
+                self._optimize_population(unevaluated)
+                optimized = True
+            groups = [self._get_survivors(group) for group in groups]
+            sample_size *= 2
+
+        self.fitness_function.training_data = full_training_data
+        if not optimized:
+            self._optimize_population(unevaluated)
+
+    def _optimize_population(self, population):
+        if isinstance(self.fitness_function, PopulationOptimizationMixin):
+            self.fitness_function.optimize_population(population)
+
+    def _get_survivors(self, group):
+        if len(group) <= self._min_survivors:
+            return group
+        sample_fitness = np.array([self.fitness_function(indv)
+                                   for indv in group], dtype=float)
+        num_survivors = max(self._min_survivors,
+                            int(np.ceil(self._survival_fraction
+                                        * len(group))))
+        ranking = np.argsort(sample_fitness, kind="stable")
+        for i in ranking[num_survivors:]:
+            if not group[i].fit_set:
+                group[i].fitness = self._discarded_fitness
+        return [group[i] for i in ranking[:num_survivors]]
@@ -1,16 +1,45 @@
 """
 This module contains the abstract definition of the data containers that store
-training data for bingo evolutionary analysis.
+training data for bingo evolutionary analysis, along with utilities for
+storing training data on disk in memory-mappable .npy files.
 """
 
 import abc
 
+import numpy as np
+
 
 class TrainingData(metaclass=abc.ABCMeta):
     """An index-able data containing class
 
-    An abstract base class for a training data container.
+    An abstract base class for a training data container.  Containers whose
+    independent variable is a 2D array `x` get its (cached) bounds through
+    `x_bounds`.
     """
+    @property
+    def x(self):
+        """2D numpy array : independent variable"""
+        return self._x
+
+    @x.setter
+    def x(self, x):
+        self._x = x
+        self._x_bounds = None
+
+    @property
+    def x_bounds(self):
+        """2xD array of numeric : lower (first row) and upper (second row)
+        bounds of each of the D dimensions of x
+
+        Notes
+        -----
+        The bounds are calculated once and then cached until `x` is reassigned
+        """
+        if getattr(self, "_x_bounds", None) is None:
+            self._x_bounds = np.array([np.nanmin(self.x, axis=0),
+                                       np.nanmax(self.x, axis=0)])
+        return self._x_bounds
+
     @abc.abstractmethod
     def __getitem__(self, items):
         """This function allows for the sub-indexing of the training data
@@ -37,3 +66,79 @@ class TrainingData(metaclass=abc.ABCMeta):
             size of the training dataset
         """
         raise NotImplementedError
+
+
+def as_contiguous_slice(items):
+    """Converts indices of contiguous, ascending rows to a slice
+
+    Indexing numpy arrays (and memory maps) with a slice results in a view
+    rather than a copy of the data.
+
+    Parameters
+    ----------
+    items : slice, int or array-like of int
+        indices of a subset of training data
+
+    Returns
+    -------
+    slice, int or array-like of int :
+        an equivalent slice if the indices are contiguous and ascending,
+        otherwise `items` unchanged
+    """
+    if isinstance(items, (slice, int, np.integer)):
+        return items
+    indices = np.asarray(items)
+    if indices.ndim != 1 or indices.size == 0 \
+            or not np.issubdtype(indices.dtype, np.integer) \
+            or np.any(indices < 0):
+        return items
+    start = int(indices[0])
+    if not np.array_equal(indices, np.arange(start, start + indices.size)):
+        return items
+    return slice(start, start + indices.size)
+
+
+def save_npy(filename, array, column_major=False, chunk_size=2**16):
+    """Saves a 2D array to a .npy file that can be memory-mapped
+
+    The array is written in chunks of rows so that arrays larger than the
+    available memory (e.g., memory maps) can be saved.
+
+    Parameters
+    ----------
+    filename : str
+        the name of the .npy file
+    array : 2D array-like
+        the data to save
+    column_major : bool
+        Whether the data is stored in column major (Fortran) order, which
+        makes the loading of individual columns contiguous.  Default False.
+    chunk_size : int
+        the number of rows written at a time.  Default 2**16.
+    """
+    out = np.lib.format.open_memmap(filename, mode="w+",
+                                    dtype=array.dtype, shape=array.shape,
+                                    fortran_order=column_major)
+    for start in range(0, array.shape[0], chunk_size):
+        out[start:start + chunk_size] = array[start:start + chunk_size]
+    out.flush()
+    del out
+
+
+def load_npy(filename, mmap_mode="r"):
+    """Loads an array from a .npy file, memory-mapped by default
+
+    Parameters
+    ----------
+    filename : str
+        the name of the .npy file
+    mmap_mode : {None, 'r', 'r+', 'c'}
+        the mode in which the file is memory-mapped; None loads the entire
+        array into memory.  Default 'r'.
+
+    Returns
+    -------
+    numpy array or numpy memmap :
+        the data in the file
+    """
+    return np.load(filename, mmap_mode=mmap_mode)
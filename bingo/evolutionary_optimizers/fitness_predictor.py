@@ -15,7 +15,9 @@ import logging
 from copy import copy
 import numpy as np
 from ..util.argument_validation import argument_validation
-from ..evaluation.fitness_function import FitnessFunction
+from ..evaluation.fitness_function import FitnessFunction, VectorBasedFunction
+from ..local_optimizers.continuous_local_opt import \
+    ContinuousLocalOptimization
 
 LOGGER = logging.getLogger(__name__)
 
@@ -39,6 +41,27 @@ class FitnessPredictorFitnessFunction(FitnessFunction):
                          as trainers
     num_trainers : int
                    number of trainers to use
+
+    Attributes
+    ----------
+    point_eval_count : int
+                       the number of training data points at which
+                       individuals are evaluated in fitness predictions and
+                       true fitness evaluations
+
+    Notes
+    -----
+    If the full fitness function is a `VectorBasedFunction` with a pointwise
+    fitness vector (possibly wrapped in a `ContinuousLocalOptimization`) and
+    the training data is unweighted, the fitness vector of each trainer is
+    evaluated once on the full training data and cached, and its true
+    fitness is the metric of that vector.  Predicted fitness is then the
+    metric of the entries of the cached fitness vector that correspond to the
+    predictor, without re-evaluating the trainer, i.e., without adding to
+    `point_eval_count`.  Cached vectors are found by the key of the trainer
+    (see `get_individual_key`), so copies of the trainers also use them.  The
+    cached vector of a trainer is refreshed when it is replaced in
+    `add_trainer`.
     """
     @argument_validation(num_trainers={">": 0})
     def __init__(self, training_data, full_fitness_function,
@@ -47,9 +70,13 @@ class FitnessPredictorFitnessFunction(FitnessFunction):
         self._next_trainer_to_update = 0
         self.point_eval_count = 0
         self._fitness_function = copy(full_fitness_function)
-        self._trainers, self._true_fitness_for_trainers = \
+        self._vector_fitness_function = self._get_pointwise_vector_function()
+        self._trainers, self._true_fitness_for_trainers, \
+            self._trainer_fitness_vectors = \
             self._make_initial_trainer_population(potential_trainers,
                                                   num_trainers)
+        self._trainer_keys = [get_individual_key(trainer)
+                              for trainer in self._trainers]
 
     def __call__(self, individual):
         """Fitness function for subset fitness predictors
@@ -69,10 +96,11 @@ class FitnessPredictorFitnessFunction(FitnessFunction):
         """
         self.eval_count += 1
         error_in_fitness_predictions = 0.0
-        for trainer, true_fitness in zip(self._trainers,
-                                         self._true_fitness_for_trainers):
-            predicted_fitness = \
-                self.predict_fitness_for_trainer(individual, trainer)
+        for trainer, true_fitness, fitness_vector in zip(
+                self._trainers, self._true_fitness_for_trainers,
+                self._trainer_fitness_vectors):
+            predicted_fitness = self._predict_fitness(individual, trainer,
+                                                      fitness_vector)
             error_in_fitness_predictions += abs(true_fitness
                                                 - predicted_fitness)
         return error_in_fitness_predictions / len(self._trainers)
@@ -87,9 +115,14 @@ class FitnessPredictorFitnessFunction(FitnessFunction):
         trainer : chromosomes
                   individual to add to the training population
         """
+        true_fitness, fitness_vector = self._evaluate_trainer(trainer)
         self._trainers[self._next_trainer_to_update] = trainer.copy()
         self._true_fitness_for_trainers[self._next_trainer_to_update] = \
-            self.get_true_fitness_for_trainer(trainer)
+            true_fitness
+        self._trainer_fitness_vectors[self._next_trainer_to_update] = \
+            fitness_vector
+        self._trainer_keys[self._next_trainer_to_update] = \
+            get_individual_key(trainer)
         self._increment_next_trainer_to_update()
 
     def predict_fitness_for_trainer(self, individual, trainer):
@@ -108,13 +141,95 @@ class FitnessPredictorFitnessFunction(FitnessFunction):
         float :
                 predicted fitness
         """
+        fitness_vector = self._get_cached_fitness_vector(trainer)
+        if fitness_vector is None:
+            fitness_vector = self._get_fitness_vector_per_point(trainer)
+        return self._predict_fitness(individual, trainer, fitness_vector)
+
+    def predict_fitnesses_for_trainer(self, individuals, trainer):
+        """Get predicted values of fitness for a trainer from many predictors
+
+        Equivalent to `predict_fitness_for_trainer` for each of the
+        predictors, but the fitness vector of the trainer is evaluated (at
+        most) once.
+
+        Parameters
+        ----------
+        individuals : list of MultipleValueChromosome
+                      subset fitness predictors to use in calculating
+                      predicted fitness
+        trainer : chromosomes
+                  the trainer of which to calculate fitness
+
+        Returns
+        -------
+        list of float :
+                        predicted fitness for each of the predictors
+        """
+        fitness_vector = self._get_cached_fitness_vector(trainer)
+        if fitness_vector is None:
+            fitness_vector = self._get_fitness_vector_per_point(trainer)
+        return [self._predict_fitness(individual, trainer, fitness_vector)
+                for individual in individuals]
+
+    def _predict_fitness(self, individual, trainer, fitness_vector):
+        if fitness_vector is not None:
+            return self._vector_fitness_function.evaluate_metric(
+                fitness_vector[individual.values].reshape(-1))
+
+        # sorted indices gather (memory-mapped) training data sequentially
         subset_training_data = \
-            self.training_data[individual.values]
+            self.training_data[np.sort(individual.values)]
         self._fitness_function.training_data = subset_training_data
         predicted_fitness = self._fitness_function(trainer)
         self.point_eval_count += len(subset_training_data)
         return predicted_fitness
 
+    def _get_pointwise_vector_function(self):
+        if getattr(self.training_data, "weights", None) is not None:
+            return None
+        fitness_function = self._fitness_function
+        if isinstance(fitness_function, ContinuousLocalOptimization):
+            fitness_function = fitness_function.fitness_function
+        if isinstance(fitness_function, VectorBasedFunction) \
+                and fitness_function.POINTWISE_FITNESS_VECTOR:
+            return fitness_function
+        return None
+
+    def _get_cached_fitness_vector(self, trainer):
+        key = get_individual_key(trainer)
+        if key is None:
+            return None
+        for cached_key, fitness_vector in zip(self._trainer_keys,
+                                              self._trainer_fitness_vectors):
+            if cached_key == key:
+                return fitness_vector
+        return None
+
+    def _evaluate_trainer(self, trainer):
+        # the true fitness is the metric of the full fitness vector unless
+        # the trainer is locally optimized in its true fitness evaluation
+        needs_local_optimization = \
+            isinstance(self._fitness_function, ContinuousLocalOptimization) \
+            and trainer.needs_local_optimization()
+        if self._vector_fitness_function is None or needs_local_optimization:
+            true_fitness = self.get_true_fitness_for_trainer(trainer)
+            return true_fitness, self._get_fitness_vector_per_point(trainer)
+        fitness_vector = self._get_fitness_vector_per_point(trainer)
+        true_fitness = self._vector_fitness_function.evaluate_metric(
+            fitness_vector.reshape(-1))
+        return true_fitness, fitness_vector
+
+    def _get_fitness_vector_per_point(self, trainer):
+        # the fitness vector on the full training data, one row per point
+        if self._vector_fitness_function is None:
+            return None
+        self._vector_fitness_function.training_data = self.training_data
+        fitness_vector = \
+            self._vector_fitness_function.evaluate_fitness_vector(trainer)
+        self.point_eval_count += len(self.training_data)
+        return np.reshape(fitness_vector, (len(self.training_data), -1))
+
     def get_true_fitness_for_trainer(self, trainer):
         """Gets true (full) fitness of trainer
 
@@ -140,15 +255,17 @@ class FitnessPredictorFitnessFunction(FitnessFunction):
                                          num_trainers):
         trainers = []
         true_fitness_for_trainers = []
+        fitness_vectors = []
         for indv in potential_trainers:
-            true_fitness = self.get_true_fitness_for_trainer(indv)
+            true_fitness, fitness_vector = self._evaluate_trainer(indv)
             if not np.isnan(true_fitness):
                 trainers.append(indv.copy())
                 true_fitness_for_trainers.append(true_fitness)
+                fitness_vectors.append(fitness_vector)
             # TODO could implement a check to make sure no fitness predictors
             #  are nan for candidate individual
             if len(trainers) == num_trainers:
-                return trainers, true_fitness_for_trainers
+                return trainers, true_fitness_for_trainers, fitness_vectors
 
         raise RuntimeError("FitnessPredictorFitnessFunction could not be "
                            "initialized. Not enough valid trainers.")
@@ -159,6 +276,35 @@ class FitnessPredictorFitnessFunction(FitnessFunction):
             self._next_trainer_to_update -= len(self._trainers)
 
 
+def get_individual_key(individual):
+    """A hashable key identifying the fitness-relevant state of an individual
+
+    Parameters
+    ----------
+    individual : chromosomes
+                 an individual with a command array and constants (e.g., an
+                 `AGraph`) or with numeric values
+
+    Returns
+    -------
+    tuple or None :
+        a key of the type, structure and constants or values of the
+        individual; None if the individual needs local optimization (its
+        constants change when its fitness is evaluated) or cannot be keyed
+    """
+    if getattr(individual, "needs_local_optimization", lambda: False)():
+        return None
+    if hasattr(individual, "command_array"):
+        return (type(individual),
+                np.asarray(individual.command_array).tobytes(),
+                np.asarray(individual.constants, dtype=float).tobytes())
+    if hasattr(individual, "values"):
+        values = np.asarray(individual.values)
+        if values.dtype != object:
+            return type(individual), values.dtype.str, values.tobytes()
+    return None
+
+
 class FitnessPredictorIndexGenerator:
     """Generator of ints within a range
 
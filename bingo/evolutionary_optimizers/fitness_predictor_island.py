@@ -15,6 +15,8 @@ Lipson [1]_.
        736-749.
 """
 import logging
+import threading
+from collections import OrderedDict
 from copy import copy, deepcopy
 import numpy as np
 from ..util.argument_validation import argument_validation
@@ -26,7 +28,8 @@ from ..chromosomes.multiple_values import MultipleValueChromosomeGenerator, \
                                          SinglePointCrossover, \
                                          SinglePointMutation
 from .fitness_predictor import FitnessPredictorFitnessFunction, \
-                              FitnessPredictorIndexGenerator
+                              FitnessPredictorIndexGenerator, \
+                              get_individual_key
 
 LOGGER = logging.getLogger(__name__)
 
@@ -65,6 +68,9 @@ class FitnessPredictorIsland(Island):
         Default is 50.
     hall_of_fame : HallOfFame (Optional)
         The hall of fame object to be used for storing best individuals
+    concurrent_predictor_evolution : bool (Optional)
+        Whether the fitness predictors are evolved in a separate thread while
+        the main population evolves. Default is False.
 
     Attributes
     ----------
@@ -74,7 +80,34 @@ class FitnessPredictorIsland(Island):
         The population that is evolving
     hall_of_fame: HallOfFame
         An object containing the best individuals seen in the optimization
+
+    Notes
+    -----
+    With concurrent predictor evolution, a worker thread evolves the
+    predictor island during calls to `evolve` whenever the predictor
+    computation ratio is below its target.  It publishes its best predictor
+    after each predictor generation; the main island picks up the latest
+    published predictor every `predictor_update_frequency` generations
+    without waiting for the worker.  The main island holds the lock of the
+    worker whenever it uses the predictor fitness function or island, i.e.,
+    in trainer updates and true fitness evaluations (and when no predictor
+    has been published yet).  The predictors are evaluated with a separate
+    copy of the fitness function (sharing the training data), so the fitness
+    function of the main island is not modified by the worker.
+
+    Predictor generations that evaluate no data points (i.e., when all
+    predictions come from cached trainer fitness vectors, see
+    `FitnessPredictorFitnessFunction`) cannot raise the predictor computation
+    ratio; at most one of them is executed per generation of the main island.
+
+    The true fitness of the individuals used in the hall of fame and in
+    `get_best_individual` is cached, keyed by the structure (command array)
+    and constants of the individual or the values of a value-based
+    chromosome.  Up to `TRUE_FITNESS_CACHE_SIZE` fitness values are kept and
+    the cache is cleared if the full training data is changed.
     """
+    TRUE_FITNESS_CACHE_SIZE = 1024
+
     @argument_validation(population_size={">=": 0},
                          predictor_population_size={">=": 0},
                          predictor_update_frequency={">": 0},
@@ -86,13 +119,18 @@ class FitnessPredictorIsland(Island):
                  predictor_population_size=16, predictor_update_frequency=50,
                  predictor_size_ratio=0.1, predictor_computation_ratio=0.1,
                  trainer_population_size=16, trainer_update_frequency=50,
-                 hall_of_fame=None):
+                 hall_of_fame=None, concurrent_predictor_evolution=False):
         super().__init__(evolution_algorithm, generator, population_size,
                          None)
+        self._concurrent_predictor_evolution = concurrent_predictor_evolution
+        self._published_predictor = None
+        self._predictor_worker = None
 
         self._hof_w_true_fitness = hall_of_fame
         self._hof_w_predicted_fitness = deepcopy(hall_of_fame)
         self._potential_hof_members = {}
+        self._true_fitness_cache = OrderedDict()
+        self._true_fitness_cache_training_data = None
 
         self._fitness_function = self._ea.evaluation.fitness_function
         self._full_training_data = copy(self._fitness_function.training_data)
@@ -121,18 +159,39 @@ class FitnessPredictorIsland(Island):
         self._hof_w_true_fitness = hall_of_fame
         self._hof_w_predicted_fitness = deepcopy(hall_of_fame)
 
+    def _do_evolution(self, num_generations):
+        if not self._concurrent_predictor_evolution:
+            super()._do_evolution(num_generations)
+            return
+
+        self._predictor_worker = _PredictorWorker(self)
+        try:
+            super()._do_evolution(num_generations)
+        finally:
+            predictor_worker = self._predictor_worker
+            self._predictor_worker = None
+            predictor_worker.stop()
+
     def _execute_generational_step(self):
         LOGGER.debug("I> " + str(self.generational_age + 1))
         super()._execute_generational_step()
 
-        self._step_predictor_island_to_maintain_ratio()
+        if self._predictor_worker is not None:
+            self._predictor_worker.wake()
+        else:
+            self._step_predictor_island_to_maintain_ratio()
         self._update_predictor_if_needed()
         self._update_trainer_if_needed()
 
     def _make_fitness_predictor_fitness_function(self):
+        fitness_function = self._fitness_function
+        if self._concurrent_predictor_evolution:
+            training_data = fitness_function.training_data
+            fitness_function = deepcopy(fitness_function,
+                                        {id(training_data): training_data})
         pred_fit_func = \
             FitnessPredictorFitnessFunction(self._full_training_data,
-                                            self._fitness_function,
+                                            fitness_function,
                                             self.population,
                                             self._trainer_population_size)
         return pred_fit_func
@@ -157,11 +216,23 @@ class FitnessPredictorIsland(Island):
         return dc_ea
 
     def _step_predictor_island_to_maintain_ratio(self):
-        while (self._get_predictor_computation_ratio()
-               < self._target_predictor_computation_ratio):
-            LOGGER.debug("P> " +
-                         str(self._predictor_island.generational_age + 1))
-            self._predictor_island.evolve(1, suppress_logging=True)
+        while self._predictor_step_is_needed():
+            if not self._step_predictor_island():
+                break
+
+    def _predictor_step_is_needed(self):
+        return self._get_predictor_computation_ratio() \
+            < self._target_predictor_computation_ratio
+
+    def _step_predictor_island(self):
+        # returns whether the step evaluated any data points; predictions
+        # from cached trainer fitness vectors do not, so such steps cannot
+        # raise the computation ratio and are limited to one per generation
+        LOGGER.debug("P> " + str(self._predictor_island.generational_age + 1))
+        point_eval_count = self._predictor_fitness_function.point_eval_count
+        self._predictor_island.evolve(1, suppress_logging=True)
+        return self._predictor_fitness_function.point_eval_count \
+            > point_eval_count
 
     def _update_predictor_if_needed(self):
         if self.generational_age % self._predictor_update_frequency == 0:
@@ -175,14 +246,18 @@ class FitnessPredictorIsland(Island):
     def _update_trainer_if_needed(self):
         if self.generational_age % self._trainer_update_frequency == 0:
             LOGGER.debug("Updating trainer")
-            self._add_new_trainer()
-            self._reset_fitness(self._predictor_island.population)
-            self._predictor_island.evaluate_population()
+            with self._get_predictor_lock():
+                self._add_new_trainer()
+                self._reset_fitness(self._predictor_island.population)
+                self._predictor_island.evaluate_population()
 
     def _update_to_use_best_fitness_predictor(self):
-        best_predictor = self._predictor_island.get_best_individual()
+        best_predictor = self._published_predictor
+        if self._predictor_worker is None or best_predictor is None:
+            with self._get_predictor_lock():
+                best_predictor = self._predictor_island.get_best_individual()
         best_subset_data = \
-            self._full_training_data[best_predictor.values]
+            self._full_training_data[np.sort(best_predictor.values)]
         self._fitness_function.training_data = best_subset_data
 
     def _add_new_trainer(self):
@@ -201,9 +276,8 @@ class FitnessPredictorIsland(Island):
 
     def _calculate_predictor_variance_of(self, individual):
         predicted_fitness_list = \
-            [self._predictor_fitness_function.predict_fitness_for_trainer(
-                predictor, individual)
-             for predictor in self._predictor_island.population]
+            self._predictor_fitness_function.predict_fitnesses_for_trainer(
+                self._predictor_island.population, individual)
         try:
             variance = np.var(predicted_fitness_list)
         except (ArithmeticError, OverflowError, FloatingPointError,
@@ -226,10 +300,10 @@ class FitnessPredictorIsland(Island):
         self._hof_w_predicted_fitness.update(self.population)
         potential_members = []
         for indv_w_ped_fitness in self._hof_w_predicted_fitness:
-            indv_w_true_fitness = deepcopy(indv_w_ped_fitness)
+            # a shallow copy suffices: the hall of fame copies its new members
+            indv_w_true_fitness = copy(indv_w_ped_fitness)
             indv_w_true_fitness.fitness = \
-                self._predictor_fitness_function.get_true_fitness_for_trainer(
-                    indv_w_true_fitness)
+                self._get_true_fitness(indv_w_true_fitness)
             potential_members.append(indv_w_true_fitness)
         return potential_members
 
@@ -245,7 +319,95 @@ class FitnessPredictorIsland(Island):
             The chromosomes with the lowest fitness value
         """
         best_indv = super().get_best_individual().copy()
-        best_indv.fitness = \
-            self._predictor_fitness_function.get_true_fitness_for_trainer(
-                best_indv)
+        best_indv.fitness = self._get_true_fitness(best_indv)
         return best_indv
+
+    def _get_true_fitness(self, individual):
+        full_training_data = self._predictor_fitness_function.training_data
+        if full_training_data is not self._true_fitness_cache_training_data:
+            self._true_fitness_cache.clear()
+            self._true_fitness_cache_training_data = full_training_data
+
+        key = get_individual_key(individual)
+        if key is None:
+            return self._evaluate_true_fitness(individual)
+        if key in self._true_fitness_cache:
+            self._true_fitness_cache.move_to_end(key)
+            return self._true_fitness_cache[key]
+
+        true_fitness = self._evaluate_true_fitness(individual)
+        self._true_fitness_cache[key] = true_fitness
+        if len(self._true_fitness_cache) > self.TRUE_FITNESS_CACHE_SIZE:
+            self._true_fitness_cache.popitem(last=False)
+        return true_fitness
+
+    def _evaluate_true_fitness(self, individual):
+        with self._get_predictor_lock():
+            return self._predictor_fitness_function\
+                .get_true_fitness_for_trainer(individual)
+
+    def _get_predictor_lock(self):
+        # the predictor fitness function and island are shared with the
+        # worker thread during concurrent predictor evolution
+        if self._predictor_worker is None:
+            return _NoLock()
+        return self._predictor_worker.lock
+
+
+class _NoLock:
+    """A context manager that does nothing, used in place of a lock"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class _PredictorWorker:
+    """Evolves the predictor island of a FitnessPredictorIsland in a thread
+
+    The worker evolves the predictor island while the predictor computation
+    ratio is below its target and otherwise waits to be woken by the main
+    island.  It also waits after predictor generations that evaluate no data
+    points.  Predictor generations are executed while holding `lock`.
+    """
+    def __init__(self, island):
+        self._island = island
+        self.lock = threading.Lock()
+        self._wake_up = threading.Event()
+        self._stopped = threading.Event()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        """Signal that the predictor computation ratio may have changed"""
+        self._wake_up.set()
+
+    def stop(self):
+        """Stop the worker after its current predictor generation
+
+        Exceptions raised in the worker are re-raised here.
+        """
+        self._stopped.set()
+        self._wake_up.set()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self):
+        island = self._island
+        try:
+            while not self._stopped.is_set():
+                with self.lock:
+                    step_needed = island._predictor_step_is_needed()
+                    if step_needed:
+                        step_needed = island._step_predictor_island()
+                        best_predictor = \
+                            island._predictor_island.get_best_individual()
+                        island._published_predictor = best_predictor.copy()
+                if not step_needed:
+                    self._wake_up.wait()
+                    self._wake_up.clear()
+        except Exception as error:  # re-raised in the main thread
+            self._error = error
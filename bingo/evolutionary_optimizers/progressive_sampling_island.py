@@ -0,0 +1,155 @@
+"""An Island implementation using progressively growing data subsamples
+
+The primary goal of this island is to be more computationally efficient than
+the simple Island in cases where lots of TrainingData is needed for fitness
+evaluation.  Each generation, the population is evaluated on a fresh random
+subsample of the training data, similar in spirit to the use of mini-batches in
+stochastic gradient descent.  The size of the subsample grows geometrically
+over the course of evolution until the full training data is used.
+
+In contrast to the `FitnessPredictorIsland`, no additional population needs to
+be evolved.  The hall of fame, the best individual and thus the convergence
+checks of the `EvolutionaryOptimizer` are all based on the fitness calculated
+with the full training data.
+"""
+import logging
+from copy import copy, deepcopy
+import numpy as np
+
+from ..util.argument_validation import argument_validation
+from .island import Island
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ProgressiveSamplingIsland(Island):
+    """An island utilizing random subsamples of the training data
+
+    Parameters
+    ----------
+    evolution_algorithm : EvolutionaryAlgorithm
+        The desired algorithm to use in assessing the population
+    generator : Generator
+        The generator class that returns an instance of a chromosome
+    population_size : int
+        The desired size of the population
+    initial_sample_ratio : float (0 - 1] (Optional)
+        The fraction of the training data that is used in the first
+        generations.  Default is 0.1.
+    sample_growth_factor : float >= 1 (Optional)
+        The factor by which the subsample size grows every
+        `sample_growth_frequency` generations.  Default is 2.
+    sample_growth_frequency : int (Optional)
+        The number of generations between increases of the subsample size.
+        Default is 50.
+    hall_of_fame : HallOfFame (Optional)
+        The hall of fame object to be used for storing best individuals
+
+    Attributes
+    ----------
+    generational_age : int
+        The number of generational steps that have been executed
+    population : list of chromosomes
+        The population that is evolving
+    hall_of_fame: HallOfFame
+        An object containing the best individuals seen in the optimization
+    sample_size : int
+        The number of training data points in the current subsample
+    """
+    @argument_validation(population_size={">=": 0},
+                         initial_sample_ratio={">": 0, "<=": 1},
+                         sample_growth_factor={">=": 1},
+                         sample_growth_frequency={">": 0})
+    def __init__(self, evolution_algorithm, generator, population_size,
+                 initial_sample_ratio=0.1, sample_growth_factor=2.,
+                 sample_growth_frequency=50, hall_of_fame=None):
+        super().__init__(evolution_algorithm, generator, population_size,
+                         None)
+
+        self._hof_w_full_data_fitness = hall_of_fame
+        self._hof_w_sample_fitness = deepcopy(hall_of_fame)
+
+        self._fitness_function = self._ea.evaluation.fitness_function
+        self._full_training_data = copy(self._fitness_function.training_data)
+        self._full_data_size = len(self._full_training_data)
+
+        self._sample_growth_factor = sample_growth_factor
+        self._sample_growth_frequency = sample_growth_frequency
+        self.sample_size = max(1, int(initial_sample_ratio
+                                      * self._full_data_size))
+        self._sample_training_data = self._full_training_data
+        self._draw_new_sample()
+
+    @property
+    def hall_of_fame(self):
+        return self._hof_w_full_data_fitness
+
+    @hall_of_fame.setter
+    def hall_of_fame(self, hall_of_fame):
+        self._hof_w_full_data_fitness = hall_of_fame
+        self._hof_w_sample_fitness = deepcopy(hall_of_fame)
+
+    def _execute_generational_step(self):
+        self._draw_new_sample()
+        self._reset_fitness(self.population)
+        super()._execute_generational_step()
+        self._grow_sample_if_needed()
+
+    def _draw_new_sample(self):
+        if self.sample_size >= self._full_data_size:
+            self._sample_training_data = self._full_training_data
+        else:
+            subset = np.random.choice(self._full_data_size, self.sample_size,
+                                      replace=False)
+            self._sample_training_data = \
+                self._full_training_data[np.sort(subset)]
+        self._fitness_function.training_data = self._sample_training_data
+
+    def _grow_sample_if_needed(self):
+        if self.generational_age % self._sample_growth_frequency == 0 \
+                and self.sample_size < self._full_data_size:
+            self.sample_size = min(
+                self._full_data_size,
+                int(np.ceil(self.sample_size * self._sample_growth_factor)))
+            LOGGER.debug("Increasing sample size to %d", self.sample_size)
+
+    @staticmethod
+    def _reset_fitness(population):
+        for indv in population:
+            indv.fit_set = False
+
+    def _get_individuals_with_full_data_fitness(self, individuals):
+        individuals = [indv.copy() for indv in individuals]
+        if self._sample_training_data is self._full_training_data:
+            self._ea.evaluation(individuals)
+            return individuals
+
+        self._fitness_function.training_data = self._full_training_data
+        try:
+            self._reset_fitness(individuals)
+            self._ea.evaluation(individuals)
+        finally:
+            self._fitness_function.training_data = self._sample_training_data
+        return individuals
+
+    def _get_potential_hof_members(self):
+        # fitness values from different subsamples are not comparable, so only
+        # the current population is pre-screened with its subsample fitness
+        self._hof_w_sample_fitness.clear()
+        self._hof_w_sample_fitness.update(self.population)
+        return self._get_individuals_with_full_data_fitness(
+            self._hof_w_sample_fitness)
+
+    def get_best_individual(self):
+        """Finds the individual with the lowest fitness in a population.
+
+        This assures that the fitness is based on the full training data and
+        not on the current subsample.
+
+        Returns
+        -------
+        best : chromosomes
+            The chromosomes with the lowest fitness value
+        """
+        best_indv = super().get_best_individual()
+        return self._get_individuals_with_full_data_fitness([best_indv])[0]
@@ -0,0 +1,102 @@
+"""An Island implementation for training data that changes during evolution
+
+The primary goal of this island is to keep evolving a population while
+training data is streamed in, e.g., a sliding window of process data, rather
+than restarting evolution for each new batch of data.  After each update of
+the training data the population is re-evaluated, which is inexpensive with
+incremental fitness functions like the `StreamingExplicitRegression`.  The hall
+of fame is re-scored lazily, i.e., only when it is next updated.
+"""
+import logging
+
+from .island import Island
+
+LOGGER = logging.getLogger(__name__)
+
+
+class StreamingIsland(Island):
+    """An island with streaming training data
+
+    The training data of the fitness function of the evolutionary algorithm
+    must support `append` and `evict`, e.g., `StreamingExplicitTrainingData`.
+
+    Parameters
+    ----------
+    evolution_algorithm : EvolutionaryAlgorithm
+        The desired algorithm to use in assessing the population
+    generator : Generator
+        The generator class that returns an instance of a chromosome
+    population_size : int
+        The desired size of the population
+    hall_of_fame : HallOfFame (Optional)
+        The hall of fame object to be used for storing best individuals
+
+    Attributes
+    ----------
+    generational_age : int
+        The number of generational steps that have been executed
+    population : list of chromosomes
+        The population that is evolving
+    hall_of_fame: HallOfFame
+        An object containing the best individuals seen in the optimization
+    """
+    def __init__(self, evolution_algorithm, generator, population_size,
+                 hall_of_fame=None):
+        super().__init__(evolution_algorithm, generator, population_size,
+                         hall_of_fame)
+        self._hall_of_fame_is_stale = False
+
+    @property
+    def training_data(self):
+        """TrainingData : the training data used in evolution"""
+        return self._ea.evaluation.fitness_function.training_data
+
+    def append_training_data(self, *data):
+        """Appends data points to the training data
+
+        Parameters
+        ----------
+        data :
+            the new data points, e.g., x and y of
+            `StreamingExplicitTrainingData`
+        """
+        self.training_data.append(*data)
+        self._training_data_updated()
+
+    def evict_training_data(self, num_points):
+        """Evicts the oldest data points from the training data
+
+        Parameters
+        ----------
+        num_points : int
+            The number of data points to evict
+        """
+        self.training_data.evict(num_points)
+        self._training_data_updated()
+
+    def _training_data_updated(self):
+        LOGGER.debug("Training data updated: %d points",
+                     len(self.training_data))
+        for indv in self.population:
+            indv.fit_set = False
+        self._hall_of_fame_is_stale = True
+
+    def update_hall_of_fame(self):
+        """Manually update the hall of fame
+
+        Members of the hall of fame are re-scored with the current training
+        data first if the training data has changed since the last update.
+        """
+        if self.hall_of_fame is not None and self._hall_of_fame_is_stale:
+            self._rescore_hall_of_fame()
+            self.evaluate_population()
+        super().update_hall_of_fame()
+
+    def _rescore_hall_of_fame(self):
+        members = [indv.copy() for indv in self.hall_of_fame]
+        for indv in members:
+            indv.fit_set = False
+        self._ea.evaluation(members)
+        self.hall_of_fame.clear()
+        self.hall_of_fame.update(members)
+        self._hall_of_fame_is_stale = False
@@ -0,0 +1,279 @@
+"""Levenberg-Marquardt local optimization of a whole population
+
+This module contains a Levenberg-Marquardt solver that optimizes the
+continuous, real-valued parameters of many individuals in lockstep.  Each
+iteration evaluates the fitness vectors and jacobians of all individuals that
+have not yet converged and then solves all of their (small) damped normal
+equations in a single batched linear solve.  Individuals drop out of the batch
+as they converge.  This avoids the per-call overhead of running a separate
+SciPy optimization for each individual, which dominates for populations of
+small equations on modest amounts of data.
+"""
+import numpy as np
+
+from ..evaluation.fitness_function import FitnessFunction, \
+    PopulationOptimizationMixin
+from ..evaluation.gradient_mixin import VectorGradientMixin
+from ..util.argument_validation import argument_validation
+
+
+class BatchedLevenbergMarquardt(PopulationOptimizationMixin,
+                                FitnessFunction):
+    """Fitness evaluation with batched local optimization.
+
+    A fitness function wrapper that performs Levenberg-Marquardt local
+    optimization of the individuals that need it before evaluation.  When used
+    with `Evaluation`, all individuals in a population that need local
+    optimization are optimized together.
+
+    Parameters
+    ----------
+    fitness_function : `VectorGradientMixin`
+        A vector based fitness function that can calculate the jacobian of its
+        fitness vector, e.g., `ExplicitRegression`.
+    max_iterations : int
+        The maximum number of Levenberg-Marquardt iterations. Default 100.
+    tol : float
+        Relative tolerance on the change in the sum of squares of the fitness
+        vector and on the step size used to determine convergence.
+        Default 1e-6.
+
+    Attributes
+    ----------
+    eval_count : int
+                 the number of evaluations that have been performed by the
+                 wrapped fitness function
+    training_data :
+                   (Optional) data that can be used in the wrapped fitness
+                   function
+
+    Raises
+    ------
+    TypeError :
+        `fitness_function` must be a `VectorGradientMixin`
+    """
+    INITIAL_DAMPING = 1e-3
+    MAX_DAMPING = 1e16
+    DAMPING_FACTOR = 10.
+
+    @argument_validation(max_iterations={">": 0},
+                         tol={">": 0})
+    def __init__(self, fitness_function, max_iterations=100, tol=1e-6):
+        if not isinstance(fitness_function, VectorGradientMixin):
+            raise TypeError("BatchedLevenbergMarquardt requires "
+                            "VectorGradientMixin as a fitness function")
+        self._fitness_function = fitness_function
+        self._max_iterations = max_iterations
+        self._tol = tol
+
+    @property
+    def training_data(self):
+        """TrainingData : data that can be used in fitness evaluations"""
+        return self._fitness_function.training_data
+
+    @training_data.setter
+    def training_data(self, value):
+        self._fitness_function.training_data = value
+
+    @property
+    def eval_count(self):
+        """int : the number of evaluations that have been performed"""
+        return self._fitness_function.eval_count
+
+    @eval_count.setter
+    def eval_count(self, value):
+        self._fitness_function.eval_count = value
+
+    def __call__(self, individual):
+        """Evaluates the fitness of the individual, performing local
+        optimization first if necessary.
+
+        Parameters
+        ----------
+        individual : chromosomes
+            Individual to which to calculate the fitness.
+
+        Returns
+        -------
+        float :
+            The fitness of the invdividual
+        """
+        if individual.needs_local_optimization():
+            self.optimize_population([individual])
+        return self._fitness_function(individual)
+
+    def optimize_population(self, population):
+        """Performs local optimization of a population in lockstep
+
+        Only the individuals that need local optimization are optimized.
+
+        Parameters
+        ----------
+        population : list of chromosomes
+            The individuals to be optimized
+        """
+        individuals = [indv for indv in population
+                       if indv.needs_local_optimization()]
+        if not individuals:
+            return
+
+        batch = _LevenbergMarquardtBatch(individuals, self._fitness_function)
+        active = batch.initialize()
+        for _ in range(self._max_iterations):
+            if not np.any(active):
+                break
+            active = self._do_iteration(batch, np.flatnonzero(active), active)
+        batch.finalize()
+
+    def _do_iteration(self, batch, inds, active):
+        steps = batch.solve_damped_normal_equations(inds)
+        trial_params = batch.params[inds] + steps
+        trial_cost, trial_vectors, trial_jacobians = \
+            batch.evaluate(inds, trial_params)
+
+        improved = trial_cost < batch.cost[inds]
+        accepted = inds[improved]
+        cost_reduction = batch.cost[accepted] - trial_cost[improved]
+        step_norms = np.linalg.norm(steps[improved], axis=1)
+        param_norms = np.linalg.norm(batch.params[accepted], axis=1)
+
+        batch.accept(accepted, trial_params[improved], trial_cost[improved],
+                     trial_vectors[improved], trial_jacobians[improved])
+        batch.damping[accepted] = np.maximum(
+            batch.damping[accepted] / self.DAMPING_FACTOR, 1e-16)
+        batch.damping[inds[~improved]] *= self.DAMPING_FACTOR
+
+        converged = (cost_reduction <= self._tol * batch.cost[accepted]) | \
+                    (step_norms <= self._tol * (param_norms + self._tol))
+        active[accepted[converged]] = False
+        active[inds[batch.damping[inds] > self.MAX_DAMPING]] = False
+        return active
+
+
+class _LevenbergMarquardtBatch:
+    """The state of a batch of individuals in Levenberg-Marquardt optimization
+
+    Parameters of all individuals are stored in padded arrays so that their
+    normal equations can be solved together.  Padded parameters have a zero
+    jacobian and an identity normal equation, so they never change.
+    """
+    def __init__(self, individuals, fitness_function):
+        self._individuals = individuals
+        self._fitness_function = fitness_function
+        self._num_params = np.array(
+            [indv.get_number_local_optimization_params()
+             for indv in individuals])
+        max_params = np.max(self._num_params)
+        self._padding = np.arange(max_params) >= self._num_params[:, None]
+
+        self.params = np.random.uniform(-10000, 10000,
+                                        (len(individuals), max_params))
+        self.params[self._padding] = 0.
+        self.cost = np.full(len(individuals), np.inf)
+        self.damping = np.full(len(individuals),
+                               BatchedLevenbergMarquardt.INITIAL_DAMPING)
+        self._vectors = [None]*len(individuals)
+        self._jacobians = [None]*len(individuals)
+
+    def initialize(self):
+        """Evaluates the starting parameters of all individuals
+
+        Returns
+        -------
+        array of bool
+            Individuals whose starting points are valid, i.e., active
+        """
+        inds = np.arange(len(self._individuals))
+        cost, vectors, jacobians = self.evaluate(inds, self.params)
+        self.accept(inds, self.params, cost, vectors, jacobians)
+        return np.isfinite(cost)
+
+    def evaluate(self, inds, params):
+        """Evaluates fitness vectors and jacobians of some individuals
+
+        Parameters
+        ----------
+        inds : array of int
+            indices of the individuals to evaluate
+        params : 2d array of numeric
+            the (padded) parameters at which to evaluate each individual
+
+        Returns
+        -------
+        tuple(array, array of arrays, array of arrays)
+            the sums of squares of the fitness vectors, the fitness vectors
+            and the padded jacobians
+        """
+        cost = np.empty(len(inds))
+        vectors = np.empty(len(inds), dtype=object)
+        jacobians = np.empty(len(inds), dtype=object)
+        for i, (ind, ind_params) in enumerate(zip(inds, params)):
+            individual = self._individuals[ind]
+            num_params = self._num_params[ind]
+            individual.set_local_optimization_params(
+                np.copy(ind_params[:num_params]))
+            vector, jacobian = \
+                self._fitness_function.get_fitness_vector_and_jacobian(
+                    individual)
+            padded_jacobian = np.zeros((len(vector), len(ind_params)))
+            padded_jacobian[:, :num_params] = jacobian
+            vectors[i] = vector
+            jacobians[i] = padded_jacobian
+            cost[i] = np.sum(np.square(vector))
+            if not np.isfinite(cost[i]) or \
+                    not np.all(np.isfinite(padded_jacobian)):
+                cost[i] = np.inf
+        return cost, vectors, jacobians
+
+    def accept(self, inds, params, cost, vectors, jacobians):
+        """Updates the state of some individuals to new parameters"""
+        self.params[inds] = params
+        self.cost[inds] = cost
+        for ind, vector, jacobian in zip(inds, vectors, jacobians):
+            self._vectors[ind] = vector
+            self._jacobians[ind] = jacobian
+
+    def solve_damped_normal_equations(self, inds):
+        """Calculates Levenberg-Marquardt steps for some individuals
+
+        Parameters
+        ----------
+        inds : array of int
+            indices of the individuals
+
+        Returns
+        -------
+        2d array of numeric
+            the padded steps for each individual
+        """
+        normal_matrices = np.stack([self._jacobians[i].T.dot(
+            self._jacobians[i]) for i in inds])
+        gradients = np.stack([self._jacobians[i].T.dot(self._vectors[i])
+                              for i in inds])
+        diagonals = np.diagonal(normal_matrices, axis1=1, axis2=2)
+        scaling = np.maximum(diagonals, np.finfo(float).eps)
+        scaling = np.where(self._padding[inds], 1., scaling)
+        damped_diagonals = np.where(self._padding[inds], 1.,
+                                    diagonals +
+                                    self.damping[inds, None] * scaling)
+
+        systems = np.array(normal_matrices)
+        diag_inds = np.arange(systems.shape[1])
+        systems[:, diag_inds, diag_inds] = damped_diagonals
+        try:
+            steps = np.linalg.solve(systems, -gradients[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            steps = np.stack([np.linalg.lstsq(system, -gradient,
+                                              rcond=None)[0]
+                              for system, gradient in zip(systems,
+                                                          gradients)])
+        steps[self._padding[inds]] = 0.
+        return steps
+
+    def finalize(self):
+        """Sets the best parameters found in each individual"""
+        for individual, params, num_params in zip(self._individuals,
+                                                  self.params,
+                                                  self._num_params):
+            individual.set_local_optimization_params(
+                np.copy(params[:num_params]))
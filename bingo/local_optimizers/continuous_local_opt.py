@@ -6,11 +6,16 @@ defined as well as the interface that must implemented by chromosomes wishing
 to use the functionality.
 """
 from abc import ABCMeta, abstractmethod
+from collections import deque
+import time
 
 import numpy as np
 import scipy.optimize as optimize
 
 from ..evaluation.fitness_function import FitnessFunction, VectorBasedFunction
+from ..evaluation.gradient_mixin import VectorGradientMixin, \
+    VectorHessianMixin
+from ..util.argument_validation import argument_validation
 
 ROOT_SET = {
     # 'hybr',
@@ -30,16 +35,23 @@ MINIMIZE_SET = {
     'Powell',
     'CG',
     'BFGS',
-    # 'Newton-CG',
+    'Newton-CG',
     'L-BFGS-B',
     # 'TNC',
     # 'COBYLA',
-    'SLSQP'
+    'SLSQP',
     # 'trust-constr'
     # 'dogleg',
-    # 'trust-ncg',
-    # 'trust-exact',
-    # 'trust-krylov'
+    'trust-ncg',
+    'trust-exact',
+    'trust-krylov'
+}
+
+HESSIAN_SET = {
+    'Newton-CG',
+    'trust-ncg',
+    'trust-exact',
+    'trust-krylov'
 }
 
 
@@ -53,8 +65,9 @@ class ContinuousLocalOptimization(FitnessFunction):
     ----------
     fitness_function : `FitnessFunction`
         A FitnessFunction that evaluates the fitness of a `chromosomes` in
-        bingo. For certain algorithms, `VectorBasedFunction` is required.
-        Please see algorithm listing for details.
+        bingo. For certain algorithms, `VectorBasedFunction` or
+        `VectorHessianMixin` is required. Please see algorithm listing for
+        details.
     algorithm : string
         An algorithm that is used in the local optimization of a
         `chromosomes`. The default algorithm is *Nelder-Mead*. The
@@ -64,16 +77,16 @@ class ContinuousLocalOptimization(FitnessFunction):
                 - Powell
                 - CG
                 - BFGS
-                - Newton-CG (not available yet)
+                - Newton-CG (requires VectorHessianMixin)
                 - L-BFGS-B
                 - TNC (not available yet)
                 - COBYLA (not available yet)
                 - SLSQP
                 - trust-constr (not available yet)
                 - dogleg (not available yet)
-                - trust-ncg (not available yet)
-                - trust-exact (not available yet)
-                - trust-krylov (not available yet)
+                - trust-ncg (requires VectorHessianMixin)
+                - trust-exact (requires VectorHessianMixin)
+                - trust-krylov (requires VectorHessianMixin)
             2. VectorBasedFunction
                 - hybr (not available yet)
                 - lm
@@ -85,6 +98,39 @@ class ContinuousLocalOptimization(FitnessFunction):
                 - excitingmixing (not available yet)
                 - krylov (not available yet)
                 - df-sane (not available yet)
+    variable_projection : bool
+        Whether parameters that enter the individual linearly are solved for
+        with a linear least squares solve, leaving only the remaining
+        parameters to `algorithm` (variable projection). This requires a
+        `VectorGradientMixin` fitness function whose fitness vector is affine
+        in the output of the individual, e.g., `ExplicitRegression`.  The
+        least squares solution is exact for squared error metrics.  Not
+        available for the algorithms requiring `VectorHessianMixin`.  Default
+        False.
+    max_evals : int
+        (Optional) The maximum number of evaluations of the objective that a
+        single local optimization, including all of its starts, may use.
+    max_time : float
+        (Optional) The maximum wall time, in seconds, that a single local
+        optimization, including all of its starts, may use.
+    abandon_after_evals : int
+        (Optional) The number of evaluations of the objective after which a
+        local optimization is abandoned if its best objective is still worse
+        than the `abandon_quantile` of the final objectives of recent local
+        optimizations.
+    abandon_quantile : float (0 - 1]
+        The quantile used in early abandonment. Default 0.5.
+    num_starts : int
+        The number of starting points used in each local optimization.  With
+        more than one start, up to half of the starts are the individual's
+        current (inherited) parameters and recently optimized parameters of
+        individuals with the same number of parameters; the rest are random.
+        Poor starts are pruned by successive halving and the best start is
+        optimized to completion.  Default 1.
+    start_pruning_evals : int
+        The number of objective evaluations given to each start in the first
+        round of successive halving.  The number doubles every round.
+        Default 10.
 
     Attributes
     ----------
@@ -94,6 +140,20 @@ class ContinuousLocalOptimization(FitnessFunction):
     training_data :
                    (Optional) data that can be used in the wrapped fitness
                    function
+    local_opt_eval_count : int
+        the number of objective evaluations used in budgeted or multi-start
+        local optimizations
+    local_opt_time : float
+        the wall time, in seconds, used in budgeted or multi-start local
+        optimizations
+    truncated_count : int
+        the number of local optimizations stopped by `max_evals` or
+        `max_time`
+    abandoned_count : int
+        the number of local optimizations that were abandoned early
+    non_finite_start_count : int
+        the number of local optimizations that were skipped because the
+        evaluation of their starting point was aborted
 
     Raises
     ------
@@ -102,12 +162,67 @@ class ContinuousLocalOptimization(FitnessFunction):
     TypeError :
         `fitness_function` must Be a valid `FitnessFunction` for the specified
         algorithm
+    ValueError :
+        variable projection is not available for the specified algorithm
+
+    Notes
+    -----
+    The objective of a local optimization is the fitness for minimization
+    algorithms and the sum of squares of the fitness vector for root finding
+    algorithms.  When a local optimization is stopped by its budget, the
+    parameters with the best objective are used.
+
+    Local optimizations whose starting point has an aborted evaluation, i.e.,
+    a fitness vector that is nan everywhere (e.g., individuals whose
+    evaluation raises `NonFiniteEvaluationError` regardless of their
+    parameters), are skipped, leaving the starting point as the parameters.
+    Starting points that are non-finite at only some of the data points are
+    optimized as usual.
     """
-    def __init__(self, fitness_function, algorithm='Nelder-Mead'):
+    OBJECTIVE_HISTORY_SIZE = 100
+    MIN_HISTORY_FOR_ABANDONMENT = 10
+    START_CACHE_SIZE = 10
+
+    @argument_validation(max_evals={">": 0},
+                         max_time={">": 0},
+                         abandon_after_evals={">": 0},
+                         abandon_quantile={">": 0, "<=": 1},
+                         num_starts={">": 0},
+                         start_pruning_evals={">": 0})
+    def __init__(self, fitness_function, algorithm='Nelder-Mead',
+                 variable_projection=False, max_evals=None, max_time=None,
+                 abandon_after_evals=None, abandon_quantile=0.5,
+                 num_starts=1, start_pruning_evals=10):
         self._check_algorithm_is_valid(algorithm)
         self._check_root_alg_returns_vector(fitness_function, algorithm)
+        self._check_hessian_alg_has_hessian(fitness_function, algorithm)
+        if variable_projection:
+            self._check_variable_projection_has_jacobian(fitness_function)
+            self._check_variable_projection_alg_is_valid(algorithm)
         self._fitness_function = fitness_function
         self._algorithm = algorithm
+        self._variable_projection = variable_projection
+
+        self._max_evals = max_evals
+        self._max_time = max_time
+        self._abandon_after_evals = abandon_after_evals
+        self._abandon_quantile = abandon_quantile
+        self._objective_history = deque(maxlen=self.OBJECTIVE_HISTORY_SIZE)
+        self.local_opt_eval_count = 0
+        self.local_opt_time = 0.
+        self.truncated_count = 0
+        self.abandoned_count = 0
+        self.non_finite_start_count = 0
+        self._start_is_aborted = None
+
+        self._num_starts = num_starts
+        self._start_pruning_evals = start_pruning_evals
+        self._start_cache = {}
+
+    @property
+    def fitness_function(self):
+        """FitnessFunction : the fitness function that is optimized"""
+        return self._fitness_function
 
     @property
     def training_data(self):
@@ -160,36 +275,406 @@ class ContinuousLocalOptimization(FitnessFunction):
             raise TypeError("{} requires VectorBasedFunction\
                             as a fitness function".format(algorithm))
 
+    @staticmethod
+    def _check_hessian_alg_has_hessian(fitness_function, algorithm):
+        if algorithm in HESSIAN_SET and not isinstance(fitness_function,
+                                                       VectorHessianMixin):
+            raise TypeError("{} requires VectorHessianMixin as a fitness "
+                            "function".format(algorithm))
+
+    @staticmethod
+    def _check_variable_projection_alg_is_valid(algorithm):
+        if algorithm in HESSIAN_SET:
+            raise ValueError("Variable projection is not available for "
+                             "{}".format(algorithm))
+
+    @staticmethod
+    def _check_variable_projection_has_jacobian(fitness_function):
+        if not isinstance(fitness_function, VectorGradientMixin):
+            raise TypeError("Variable projection requires VectorGradientMixin"
+                            " as a fitness function")
+
     def _optimize_params(self, individual):
         num_params = individual.get_number_local_optimization_params()
-        c_0 = np.random.uniform(-10000, 10000, num_params)
-        params = self._run_algorithm_for_optimization(
-            self._sub_routine_for_fit_function, individual, c_0)
+        starts = self._get_starting_params(individual, num_params)
+        if self._variable_projection:
+            linear_mask = np.zeros(num_params, dtype=bool)
+            linear_mask[individual.get_linear_local_optimization_params()] = \
+                True
+            if np.any(linear_mask):
+                params = self._optimize_params_with_variable_projection(
+                    individual, starts, linear_mask)
+                self._cache_params(params)
+                return
+        params = self._run_multi_start_optimization(
+            self._sub_routine_for_fit_function, (individual, ), starts,
+            self._get_derivative_kwargs(individual))
         individual.set_local_optimization_params(params)
+        self._cache_params(params)
+
+    def _get_starting_params(self, individual, num_params):
+        starts = [np.random.uniform(-10000, 10000, num_params)
+                  for _ in range(self._num_starts)]
+        if self._num_starts > 1:
+            seeded_starts = self._get_inherited_params(individual, starts[0])
+            seeded_starts += [np.copy(params) for params in
+                              reversed(self._start_cache.get(num_params, []))]
+            num_seeded = min(len(seeded_starts), self._num_starts // 2)
+            starts[:num_seeded] = seeded_starts[:num_seeded]
+        return starts
+
+    @staticmethod
+    def _get_inherited_params(individual, random_params):
+        # e.g., bingocpp individuals do not expose their current parameters
+        if not hasattr(individual, "get_local_optimization_params"):
+            return []
+        inherited_params = individual.get_local_optimization_params()
+        if inherited_params is None:
+            return []
+        inherited_params = np.asarray(inherited_params,
+                                      dtype=float)[:len(random_params)]
+        if len(inherited_params) == 0 or \
+                not np.all(np.isfinite(inherited_params)):
+            return []
+        params = np.copy(random_params)
+        params[:len(inherited_params)] = inherited_params
+        return [params]
+
+    def _cache_params(self, params):
+        if self._num_starts == 1 or not np.all(np.isfinite(params)):
+            return
+        cache = self._start_cache.setdefault(
+            len(params), deque(maxlen=self.START_CACHE_SIZE))
+        cache.append(np.copy(params))
 
     def _sub_routine_for_fit_function(self, params, individual):
         individual.set_local_optimization_params(params)
         if self._algorithm in ROOT_SET:
-            return self._fitness_function.evaluate_fitness_vector(individual)
+            return self._evaluate_fitness_vector(individual)
+        if self._start_is_aborted is None and \
+                isinstance(self._fitness_function, VectorBasedFunction):
+            return self._evaluate_start_fitness(individual)
         return self._fitness_function(individual)
 
-    def _run_algorithm_for_optimization(self, sub_routine, individual, params):
+    def _evaluate_start_fitness(self, individual):
+        # the fitness of the starting point is calculated from its fitness
+        # vector, which shows whether its evaluation was aborted
+        fitness_vector = \
+            self._fitness_function.evaluate_fitness_vector(individual)
+        self._start_is_aborted = bool(np.all(np.isnan(fitness_vector)))
+        return self._fitness_function.evaluate_metric(fitness_vector)
+
+    def _evaluate_fitness_vector(self, individual):
+        # MINPACK copies the fitness vector immediately, so the 'lm' algorithm
+        # can use a fitness vector that is calculated in a workspace
+        if self._algorithm == "lm":
+            return self._fitness_function.\
+                evaluate_fitness_vector_in_workspace(individual)
+        return self._fitness_function.evaluate_fitness_vector(individual)
+
+    def _optimize_params_with_variable_projection(self, individual, starts,
+                                                  linear_mask):
+        params = np.copy(starts[0])
+        if not np.all(linear_mask):
+            derivative_kwargs = {}
+            if self._algorithm in ROOT_SET:
+                derivative_kwargs["jac"] = \
+                    self._jacobian_for_variable_projection
+            params[~linear_mask] = self._run_multi_start_optimization(
+                self._sub_routine_for_variable_projection,
+                (individual, params, linear_mask),
+                [start[~linear_mask] for start in starts], derivative_kwargs)
+        self._project_linear_params(params[~linear_mask], individual,
+                                    params, linear_mask)
+        return params
+
+    def _sub_routine_for_variable_projection(self, nonlinear_params,
+                                             individual, params, linear_mask):
+        fitness_vector = self._project_linear_params(nonlinear_params,
+                                                     individual, params,
+                                                     linear_mask)
+        if self._start_is_aborted is None:
+            self._start_is_aborted = bool(np.all(np.isnan(fitness_vector)))
         if self._algorithm in ROOT_SET:
-            optimize_result = optimize.root(sub_routine, params,
-                                            args=(individual),
-                                            method=self._algorithm,
-                                            tol=1e-6)
-        else:
-            optimize_result = optimize.minimize(sub_routine, params,
-                                                args=(individual),
+            return fitness_vector
+        return self._fitness_function(individual)
+
+    def _jacobian_for_variable_projection(self, nonlinear_params, individual,
+                                          params, linear_mask):
+        # the jacobian of the projected fitness vector is approximated by
+        # projecting the nonlinear jacobian onto the complement of the range
+        # of the linear jacobian (Kaufman's approximation)
+        self._project_linear_params(nonlinear_params, individual, params,
+                                    linear_mask)
+        _, jacobian = \
+            self._fitness_function.get_fitness_vector_and_jacobian(individual)
+        linear_jacobian = jacobian[:, linear_mask]
+        nonlinear_jacobian = jacobian[:, ~linear_mask]
+        if not np.all(np.isfinite(jacobian)):
+            return nonlinear_jacobian
+        return nonlinear_jacobian - linear_jacobian.dot(
+            np.linalg.lstsq(linear_jacobian, nonlinear_jacobian,
+                            rcond=None)[0])
+
+    def _project_linear_params(self, nonlinear_params, individual, params,
+                               linear_mask):
+        params[~linear_mask] = nonlinear_params
+        params[linear_mask] = 0.0
+        individual.set_local_optimization_params(np.copy(params))
+        fitness_vector, jacobian = \
+            self._fitness_function.get_fitness_vector_and_jacobian(individual)
+        linear_jacobian = jacobian[:, linear_mask]
+        if not np.all(np.isfinite(linear_jacobian)) or \
+                not np.all(np.isfinite(fitness_vector)):
+            params[linear_mask] = np.nan
+            individual.set_local_optimization_params(np.copy(params))
+            return np.full(fitness_vector.shape, np.nan)
+
+        params[linear_mask] = np.linalg.lstsq(linear_jacobian,
+                                              -fitness_vector, rcond=None)[0]
+        individual.set_local_optimization_params(np.copy(params))
+        return fitness_vector + linear_jacobian.dot(params[linear_mask])
+
+    def _run_multi_start_optimization(self, sub_routine, args, starts,
+                                      derivative_kwargs):
+        if len(starts) == 1 and not self._is_budgeted():
+            return self._call_optimizer(sub_routine, args, starts[0],
+                                        derivative_kwargs)
+
+        # the pruning rounds and the final optimization share one budget
+        budget = _LocalOptimizationBudget(sub_routine, self._max_evals,
+                                          self._max_time,
+                                          self._abandon_after_evals,
+                                          self._get_abandonment_threshold())
+        try:
+            params = self._prune_starts(budget, args, starts,
+                                        derivative_kwargs)
+            params = self._call_optimizer(budget.tracked_sub_routine, args,
+                                          params, derivative_kwargs)
+        except _BudgetExhausted:
+            params = budget.best_params
+            if budget.abandoned:
+                self.abandoned_count += 1
+            else:
+                self.truncated_count += 1
+        self._objective_history.append(budget.best_objective)
+        self.local_opt_eval_count += budget.num_evals
+        self.local_opt_time += budget.elapsed_time()
+        return params
+
+    def _prune_starts(self, budget, args, starts, derivative_kwargs):
+        max_evals = self._start_pruning_evals
+        while len(starts) > 1:
+            results = [self._run_pruning_round(budget, args, start,
+                                               max_evals, derivative_kwargs)
+                       for start in starts]
+            order = np.argsort([objective for objective, _ in results],
+                               kind="stable")
+            starts = [results[i][1] for i in order[:(len(starts) + 1) // 2]]
+            max_evals *= 2
+        return starts[0]
+
+    def _run_pruning_round(self, budget, args, params, max_evals,
+                           derivative_kwargs):
+        round_budget = _LocalOptimizationBudget(budget.tracked_sub_routine,
+                                                max_evals, None, None, None)
+        try:
+            params = self._call_optimizer(round_budget.tracked_sub_routine,
+                                          args, params, derivative_kwargs)
+        except _BudgetExhausted:
+            if budget.exhausted:
+                raise
+            params = round_budget.best_params
+        return round_budget.best_objective, params
+
+    def _call_optimizer(self, sub_routine, args, params, derivative_kwargs):
+        sub_routine = _StartCheckedSubRoutine(
+            sub_routine, self._is_aborted_evaluation).sub_routine
+        self._start_is_aborted = None
+        try:
+            if self._algorithm in ROOT_SET:
+                optimize_result = optimize.root(sub_routine, params,
+                                                args=args,
                                                 method=self._algorithm,
-                                                tol=1e-6)
+                                                tol=1e-6, **derivative_kwargs)
+            else:
+                optimize_result = optimize.minimize(
+                    sub_routine, params, args=args, method=self._algorithm,
+                    tol=1e-6, **derivative_kwargs)
+        except _NonFiniteStart:
+            self.non_finite_start_count += 1
+            return params
         return optimize_result.x
 
+    def _is_aborted_evaluation(self, value, *_):
+        # aborted evaluations result in fitness vectors which are nan
+        # everywhere; a non-finite scalar objective may hide a fitness vector
+        # which is only partially non-finite, so the fitness vector of the
+        # start (kept by the objective) is checked instead
+        if np.all(np.isfinite(value)):
+            return False
+        if np.ndim(value) > 0:
+            return np.all(np.isnan(value))
+        return bool(self._start_is_aborted)
+
+    def _get_derivative_kwargs(self, individual):
+        if self._algorithm in ROOT_SET:
+            # finite differences are used when no jacobian is available
+            if isinstance(self._fitness_function, VectorGradientMixin) and \
+                    self._fitness_function.has_jacobian_for(individual):
+                return {"jac": self._jacobian_for_fit_function}
+            return {}
+        if self._algorithm not in HESSIAN_SET:
+            return {}
+        if self._algorithm == 'trust-exact':
+            return {"jac": self._gradient_for_fit_function,
+                    "hess": self._hessian_for_fit_function}
+        return {"jac": self._gradient_for_fit_function,
+                "hessp": self._hessian_vector_product_for_fit_function}
+
+    def _jacobian_for_fit_function(self, params, individual):
+        individual.set_local_optimization_params(params)
+        _, jacobian = \
+            self._fitness_function.get_fitness_vector_and_jacobian(individual)
+        return jacobian
+
+    def _gradient_for_fit_function(self, params, individual):
+        individual.set_local_optimization_params(params)
+        return self._fitness_function.get_fitness_gradient(individual)
+
+    def _hessian_for_fit_function(self, params, individual):
+        individual.set_local_optimization_params(params)
+        return self._fitness_function.get_fitness_hessian(individual)
+
+    def _hessian_vector_product_for_fit_function(self, params, vector,
+                                                 individual):
+        individual.set_local_optimization_params(params)
+        return self._fitness_function.get_fitness_hessian_vector_product(
+            individual, vector)
+
+    def _is_budgeted(self):
+        return self._max_evals is not None or self._max_time is not None \
+               or self._abandon_after_evals is not None
+
+    def _get_abandonment_threshold(self):
+        if self._abandon_after_evals is None or \
+                len(self._objective_history) < \
+                self.MIN_HISTORY_FOR_ABANDONMENT:
+            return None
+        return np.percentile(self._objective_history,
+                             100 * self._abandon_quantile)
+
     def _evaluate_fitness(self, individual):
         return self._fitness_function(individual)
 
 
+class _NonFiniteStart(Exception):
+    """Raised to skip a local optimization with an aborted starting point"""
+
+
+class _StartCheckedSubRoutine:
+    """Wraps an objective so that its first evaluation must not be aborted
+
+    Parameters
+    ----------
+    sub_routine : function
+        the objective of the local optimization
+    is_aborted : function
+        checks whether a value of the objective (given the arguments of the
+        objective) comes from an aborted evaluation
+    """
+    def __init__(self, sub_routine, is_aborted):
+        self._sub_routine = sub_routine
+        self._is_aborted = is_aborted
+        self._is_first_call = True
+
+    def sub_routine(self, params, *args):
+        """The objective, which raises _NonFiniteStart if its first evaluation
+        is aborted"""
+        value = self._sub_routine(params, *args)
+        if self._is_first_call:
+            self._is_first_call = False
+            if self._is_aborted(value, *args):
+                raise _NonFiniteStart
+        return value
+
+
+class _BudgetExhausted(Exception):
+    """Raised to stop a local optimization that has exhausted its budget"""
+
+
+class _LocalOptimizationBudget:
+    """Tracks the objective evaluations of a single local optimization
+
+    Parameters
+    ----------
+    sub_routine : function
+        the objective of the local optimization
+    max_evals : int
+        maximum number of evaluations of the objective (None for no limit)
+    max_time : float
+        maximum wall time in seconds (None for no limit)
+    abandon_after_evals : int
+        number of evaluations after which the optimization is abandoned if the
+        best objective is worse than `abandonment_threshold`
+    abandonment_threshold : float
+        objective value used in early abandonment (None for no abandonment)
+    """
+    def __init__(self, sub_routine, max_evals, max_time, abandon_after_evals,
+                 abandonment_threshold):
+        self._sub_routine = sub_routine
+        self._max_evals = max_evals
+        self._max_time = max_time
+        self._abandon_after_evals = abandon_after_evals
+        self._abandonment_threshold = abandonment_threshold
+        self._start_time = time.perf_counter()
+        self.num_evals = 0
+        self.best_objective = np.inf
+        self.best_params = None
+        self.abandoned = False
+        self.exhausted = False
+
+    def tracked_sub_routine(self, params, *args):
+        """The objective, which raises _BudgetExhausted when out of budget"""
+        if self._is_exhausted():
+            self.exhausted = True
+            raise _BudgetExhausted
+        self.num_evals += 1
+        value = self._sub_routine(params, *args)
+        objective = self._get_objective(value)
+        if objective < self.best_objective or self.best_params is None:
+            self.best_objective = objective
+            self.best_params = np.copy(params)
+        return value
+
+    def elapsed_time(self):
+        """float : wall time since the start of the optimization"""
+        return time.perf_counter() - self._start_time
+
+    def _is_exhausted(self):
+        if self.best_params is None:
+            return False
+        if self._max_evals is not None and self.num_evals >= self._max_evals:
+            return True
+        if self._max_time is not None and \
+                self.elapsed_time() >= self._max_time:
+            return True
+        if self._abandonment_threshold is not None and \
+                self.num_evals >= self._abandon_after_evals and \
+                not self.best_objective <= self._abandonment_threshold:
+            self.abandoned = True
+            return True
+        return False
+
+    @staticmethod
+    def _get_objective(value):
+        objective = np.sum(np.square(value)) if np.ndim(value) > 0 \
+            else value
+        if np.isnan(objective):
+            return np.inf
+        return objective
+
+
 class ChromosomeInterface(metaclass=ABCMeta):
     """For chromosomes with continuous local optimization
 
@@ -218,6 +703,32 @@ class ChromosomeInterface(metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    def get_local_optimization_params(self):
+        """Get the current values of the local optimization parameters
+
+        These are used as a starting point in multi-start local optimization.
+        By default, the current values are unknown.
+
+        Returns
+        -------
+        list-like of numeric or None
+            current values of the parameters, None if they are unknown
+        """
+        return None
+
+    def get_linear_local_optimization_params(self):
+        """Get the indices of local optimization parameters that are linear
+
+        Linear parameters are those on which the individual depends linearly.
+        By default, no parameters are known to be linear.
+
+        Returns
+        -------
+        list of int
+            indices of the linear parameters
+        """
+        return []
+
     @abstractmethod
     def set_local_optimization_params(self, params):
         """Set local optimization parameters
@@ -37,25 +37,51 @@ class DeterministicCrowding(Selection):
             raise ValueError('Target population size cannot be greater\
                  than the length of the population')
 
-        offspring = population[target_population_size:]
-        population = population[:target_population_size]
+        next_generation = []
+        for parent, child in self.get_parent_offspring_pairs(population):
+            next_generation.append(self._return_most_fit(child, parent))
+        return next_generation
 
-        for i in range(target_population_size//2):
-            parent_1 = population[i*2]
-            parent_2 = population[i*2+1]
+    @staticmethod
+    def get_parent_offspring_pairs(population):
+        """Pairs each offspring with the parent it competes against
+
+        Parents are paired with the offspring that are closest to them, as in
+        selection.  The pairing does not depend on fitness, e.g., it can be
+        used to limit comparisons during evaluation to the individuals that
+        compete in selection.
+
+        Parameters
+        ----------
+        population : list of chromosomes
+                     The parent and child populations, with the parents in the
+                     first half and the children in the latter half
+
+        Returns
+        -------
+        list of tuple(chromosome, chromosome) :
+            (parent, child) pairs in the order of the parents
+        """
+        if (len(population) % 4) > 0:
+            raise ValueError('Population must be of even length')
+        num_parents = len(population) // 2
+        offspring = population[num_parents:]
+        parents = population[:num_parents]
+
+        pairs = []
+        for i in range(num_parents//2):
+            parent_1 = parents[i*2]
+            parent_2 = parents[i*2+1]
             child_1 = offspring[i*2]
             child_2 = offspring[i*2+1]
 
             dist_a = parent_1.distance(child_1) + parent_2.distance(child_2)
             dist_b = parent_1.distance(child_2) + parent_2.distance(child_1)
             if dist_a <= dist_b:
-                population[i*2] = self._return_most_fit(child_1, parent_1)
-                population[i*2+1] = self._return_most_fit(child_2, parent_2)
+                pairs += [(parent_1, child_1), (parent_2, child_2)]
             else:
-                population[i*2] = self._return_most_fit(child_2, parent_1)
-                population[i*2+1] = self._return_most_fit(child_1, parent_2)
-
-        return population
+                pairs += [(parent_1, child_2), (parent_2, child_1)]
+        return pairs
 
     @staticmethod
     def _return_most_fit(child, parent):
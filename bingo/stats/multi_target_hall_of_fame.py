@@ -0,0 +1,71 @@
+"""
+The multi-target hall of fame captures the best individuals for each of the
+targets of a multi-target fitness function, e.g.,
+`MultiTargetExplicitRegression`.  A separate hall of fame is kept for each
+target; its members have constants optimized for, and fitness evaluated on,
+that target.
+"""
+from .hall_of_fame import HallOfFame
+
+
+class MultiTargetHallOfFame:
+    """Keeping track of the best individuals for each target.
+
+    Parameters
+    ----------
+    max_size : int
+        The maximum number of individuals to track for each target.
+    fitness_function : MultiTargetExplicitRegression
+        The multi-target fitness function, which provides copies of
+        individuals for each target via `get_target_individuals`
+    similarity_function : function (optional)
+        The function used to identify similar individuals. The signature of the
+        function should be`func(chromosomes, chromosomes)`
+
+    Attributes
+    ----------
+    target_halls_of_fame : list of HallOfFame
+        The hall of fame of each target
+    """
+    def __init__(self, max_size, fitness_function, similarity_function=None):
+        self._fitness_function = fitness_function
+        self.target_halls_of_fame = \
+            [HallOfFame(max_size, similarity_function=similarity_function)
+             for _ in range(fitness_function.num_targets)]
+
+    def update(self, population):
+        """Update the hall of fame of each target based on the given population
+
+        Parameters
+        ----------
+        population : list of chromosomes
+            The list of individuals to be considered for induction into the
+            halls of fame
+        """
+        for indv in population:
+            target_individuals = \
+                self._fitness_function.get_target_individuals(indv)
+            for hall_of_fame, target_indv in zip(self.target_halls_of_fame,
+                                                 target_individuals):
+                hall_of_fame.update([target_indv])
+
+    def clear(self):
+        """Remove all hall of fame members"""
+        for hall_of_fame in self.target_halls_of_fame:
+            hall_of_fame.clear()
+
+    def __len__(self):
+        return sum(len(hall_of_fame)
+                   for hall_of_fame in self.target_halls_of_fame)
+
+    def __getitem__(self, i):
+        return list(self)[i]
+
+    def __iter__(self):
+        for hall_of_fame in self.target_halls_of_fame:
+            yield from hall_of_fame
+
+    def __str__(self):
+        return '\n'.join(["Target {}:\n{}".format(target, hall_of_fame)
+                          for target, hall_of_fame
+                          in enumerate(self.target_halls_of_fame)])
@@ -55,6 +55,7 @@ try:
 except ImportError as e:
     print(e)
     from . import backend as Backend
+from . import backend as PythonBackend
 
 LOGGER = logging.getLogger(__name__)
 
@@ -192,6 +193,29 @@ class AGraph(Equation, continuous_local_opt.ChromosomeInterface):
         """
         return self._num_constants
 
+    def get_local_optimization_params(self):
+        """values of the constants
+
+        These may be fewer than the number of parameters for local
+        optimization, e.g., when constants have been added by variation.
+
+        Returns
+        -------
+        list-like of numeric
+            Current values of the constants
+        """
+        return self._constants
+
+    def get_linear_local_optimization_params(self):
+        """indices of the parameters which enter the equation linearly
+
+        Returns
+        -------
+        list of int
+            Indices of the constants which enter the equation linearly
+        """
+        return Backend.get_linear_constants(self._short_command_array)
+
     def set_local_optimization_params(self, params):
         """Set the local optimization parameters.
 
@@ -225,10 +249,12 @@ class AGraph(Equation, continuous_local_opt.ChromosomeInterface):
             f_of_x = Backend.evaluate(self._short_command_array,
                                       x, self._constants)
             return f_of_x
+        except PythonBackend.NonFiniteEvaluationError as err:
+            LOGGER.debug("%s in stack evaluation", err)
         except (ArithmeticError, OverflowError, ValueError,
                 FloatingPointError) as err:
             LOGGER.warning("%s in stack evaluation", err)
-            return np.full(x.shape, np.nan)
+        return np.full((x.shape[0], 1), np.nan)
 
     def evaluate_equation_with_x_gradient_at(self, x):
         """Evaluate Agraph and get its derivatives.
@@ -250,11 +276,12 @@ class AGraph(Equation, continuous_local_opt.ChromosomeInterface):
             f_of_x, df_dx = Backend.evaluate_with_derivative(
                 self._short_command_array, x, self._constants, True)
             return f_of_x, df_dx
+        except PythonBackend.NonFiniteEvaluationError as err:
+            LOGGER.debug("%s in stack evaluation/deriv", err)
         except (ArithmeticError, OverflowError, ValueError,
                 FloatingPointError) as err:
             LOGGER.warning("%s in stack evaluation/deriv", err)
-            nan_array = np.full(x.shape, np.nan)
-            return nan_array, np.array(nan_array)
+        return np.full((x.shape[0], 1), np.nan), np.full(x.shape, np.nan)
 
     def evaluate_equation_with_local_opt_gradient_at(self, x):
         """Evaluate Agraph and get its derivatives.
@@ -277,11 +304,209 @@ class AGraph(Equation, continuous_local_opt.ChromosomeInterface):
             f_of_x, df_dc = Backend.evaluate_with_derivative(
                 self._short_command_array, x, self._constants, False)
             return f_of_x, df_dc
+        except PythonBackend.NonFiniteEvaluationError as err:
+            LOGGER.debug("%s in stack evaluation/const-deriv", err)
         except (ArithmeticError, OverflowError, ValueError,
                 FloatingPointError) as err:
             LOGGER.warning("%s in stack evaluation/const-deriv", err)
-            nan_array = np.full((x.shape[0], len(self._constants)), np.nan)
-            return nan_array, np.array(nan_array)
+        nan_f_of_x = np.full((x.shape[0], 1), np.nan)
+        nan_df_dc = np.full((x.shape[0], len(self._constants)), np.nan)
+        return nan_f_of_x, nan_df_dc
+
+    def evaluate_equation_with_mixed_derivative_at(self, x):
+        """Evaluate Agraph, its x gradient and the constant derivatives of the
+        x gradient.
+
+        Evaluate the agraph equation at x and get the gradient of x and its
+        derivatives with respect to the constants. Constants are of length L.
+
+        Parameters
+        ----------
+        x : MxD array of numeric.
+            Values at which to evaluate the equations. D is the number of
+            dimensions in x and M is the number of data points in x.
+
+        Returns
+        -------
+        tuple(Mx1 array of numeric, MxD array of numeric,
+              MxDxL array of numeric)
+            :math:`f(x)`, :math:`df(x)/dx_i` and :math:`d^2f(x)/dx_i dc_j`
+        """
+        try:
+            return PythonBackend.evaluate_with_mixed_derivative(
+                self._short_command_array, x, self._constants)
+        except PythonBackend.NonFiniteEvaluationError as err:
+            LOGGER.debug("%s in stack evaluation/mixed-deriv", err)
+        except (ArithmeticError, OverflowError, ValueError,
+                FloatingPointError) as err:
+            LOGGER.warning("%s in stack evaluation/mixed-deriv", err)
+        return np.full((x.shape[0], 1), np.nan), \
+            np.full(x.shape, np.nan), \
+            np.full(x.shape + (len(self._constants), ), np.nan)
+
+    def evaluate_equation_with_local_opt_hessian_at(self, x):
+        """Evaluate Agraph and get its first and second derivatives.
+
+        Evaluate the agraph equation at x and get the gradient and hessian of
+        constants. Constants are of length L.
+
+        Parameters
+        ----------
+        x : MxD array of numeric.
+            Values at which to evaluate the equations. D is the number of
+            dimensions in x and M is the number of data points in x.
+
+        Returns
+        -------
+        tuple(Mx1 array of numeric, MxL array of numeric,
+              MxLxL array of numeric)
+            :math:`f(x)`, :math:`df(x)/dc_i` and :math:`d^2f(x)/dc_i dc_j`
+        """
+        try:
+            return PythonBackend.evaluate_with_hessian(
+                self._short_command_array, x, self._constants)
+        except PythonBackend.NonFiniteEvaluationError as err:
+            LOGGER.debug("%s in stack evaluation/const-hessian", err)
+        except (ArithmeticError, OverflowError, ValueError,
+                FloatingPointError) as err:
+            LOGGER.warning("%s in stack evaluation/const-hessian", err)
+        num_constants = len(self._constants)
+        return np.full((x.shape[0], 1), np.nan), \
+            np.full((x.shape[0], num_constants), np.nan), \
+            np.full((x.shape[0], num_constants, num_constants), np.nan)
+
+    def evaluate_equation_with_local_opt_hessian_vector_product_at(self, x,
+                                                                   vector):
+        """Evaluate Agraph, its derivatives and a hessian vector product.
+
+        Evaluate the agraph equation at x and get the gradient of constants
+        and the product of the hessian of constants with a vector. Constants
+        are of length L.
+
+        Parameters
+        ----------
+        x : MxD array of numeric.
+            Values at which to evaluate the equations. D is the number of
+            dimensions in x and M is the number of data points in x.
+        vector : array of numeric of length L
+            The vector by which the hessian is multiplied
+
+        Returns
+        -------
+        tuple(Mx1 array of numeric, MxL array of numeric, MxL array of numeric)
+            :math:`f(x)`, :math:`df(x)/dc_i` and
+            :math:`\\sum_j d^2f(x)/dc_i dc_j v_j`
+        """
+        try:
+            return PythonBackend.evaluate_with_hessian_vector_product(
+                self._short_command_array, x, self._constants, vector)
+        except PythonBackend.NonFiniteEvaluationError as err:
+            LOGGER.debug("%s in stack evaluation/const-hessian", err)
+        except (ArithmeticError, OverflowError, ValueError,
+                FloatingPointError) as err:
+            LOGGER.warning("%s in stack evaluation/const-hessian", err)
+        num_constants = len(self._constants)
+        return np.full((x.shape[0], 1), np.nan), \
+            np.full((x.shape[0], num_constants), np.nan), \
+            np.full((x.shape[0], num_constants), np.nan)
+
+    def evaluate_equation_at_constant_sets(self, x, constant_sets):
+        """Evaluate the agraph equation at multiple sets of constants.
+
+        evaluation of the Agraph equation at points x for each of K sets of
+        constants.
+
+        Parameters
+        ----------
+        x : MxD array of numeric.
+            Values at which to evaluate the equations. D is the number of
+            dimensions in x and M is the number of data points in x.
+        constant_sets : KxL array of numeric.
+            K sets of values for the L constants of the equation
+
+        Returns
+        -------
+        MxK array of numeric
+            :math:`f(x)` for each set of constants
+        """
+        try:
+            return PythonBackend.evaluate_at_constant_sets(
+                self._short_command_array, x, constant_sets)
+        except PythonBackend.NonFiniteEvaluationError as err:
+            LOGGER.debug("%s in stack evaluation", err)
+        except (ArithmeticError, OverflowError, ValueError,
+                FloatingPointError) as err:
+            LOGGER.warning("%s in stack evaluation", err)
+        return np.full((x.shape[0], len(constant_sets)), np.nan)
+
+    def evaluate_equation_with_local_opt_gradient_at_constant_sets(
+            self, x, constant_sets):
+        """Evaluate Agraph and get its derivatives at multiple sets of
+        constants.
+
+        Evaluate the agraph equation at x and get the gradient of constants
+        for each of K sets of constants. Constants are of length L.
+
+        Parameters
+        ----------
+        x : MxD array of numeric.
+            Values at which to evaluate the equations. D is the number of
+            dimensions in x and M is the number of data points in x.
+        constant_sets : KxL array of numeric.
+            K sets of values for the L constants of the equation
+
+        Returns
+        -------
+        tuple(MxK array of numeric, MxLxK array of numeric)
+            :math:`f(x)` and :math:`df(x)/dc_i` for each set of constants
+        """
+        try:
+            return PythonBackend.evaluate_with_derivative_at_constant_sets(
+                self._short_command_array, x, constant_sets, False)
+        except PythonBackend.NonFiniteEvaluationError as err:
+            LOGGER.debug("%s in stack evaluation/const-deriv", err)
+        except (ArithmeticError, OverflowError, ValueError,
+                FloatingPointError) as err:
+            LOGGER.warning("%s in stack evaluation/const-deriv", err)
+        num_sets, num_constants = np.shape(constant_sets)
+        nan_f_of_x = np.full((x.shape[0], num_sets), np.nan)
+        nan_df_dc = np.full((x.shape[0], num_constants, num_sets), np.nan)
+        return nan_f_of_x, nan_df_dc
+
+    def evaluate_equation_interval(self, x_bounds, constant_bounds=None):
+        """Bound the value of the agraph equation.
+
+        Interval arithmetic is used to bound the agraph equation for x within
+        the given bounds, without evaluating it at any particular x.
+
+        Parameters
+        ----------
+        x_bounds : 2xD array of numeric.
+            Lower (first row) and upper (second row) bounds of each of the D
+            dimensions of x.
+        constant_bounds : tuple(numeric, numeric)
+            (Optional) lower and upper bounds of all the constants. By default
+            constants are unbounded if they need local optimization and fixed
+            at their values otherwise.
+
+        Returns
+        -------
+        tuple(numeric, numeric)
+            lower and upper bounds of :math:`f(x)`; (nan, nan) if the equation
+            can only evaluate to nan
+        """
+        num_constants = max(self._num_constants, len(self._constants))
+        if constant_bounds is not None:
+            constant_bounds = np.tile(np.reshape(constant_bounds, (2, 1)),
+                                      (1, num_constants))
+        elif self._needs_opt:
+            constant_bounds = np.tile([[-np.inf], [np.inf]],
+                                      (1, num_constants))
+        else:
+            constant_bounds = np.array([self._constants, self._constants],
+                                       dtype=float)
+        return PythonBackend.evaluate_interval(self._short_command_array,
+                                               x_bounds, constant_bounds)
 
     def __str__(self):
         """Console string output of Agraph equation.
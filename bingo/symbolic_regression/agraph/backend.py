@@ -9,6 +9,19 @@ import numpy as np
 from .maps import IS_ARITY_2_MAP, IS_TERMINAL_MAP
 from . import backend_nodes as Nodes
 
+FORWARD_MODE_MAX_DIRECTIONS = 4
+FORWARD_MODE_MAX_STACK_SIZE = 32
+EARLY_ABORT_ON_NAN = True
+
+
+class NonFiniteEvaluationError(FloatingPointError):
+    """Raised when an equation is known to evaluate to nan everywhere
+
+    With `EARLY_ABORT_ON_NAN`, evaluation is stopped as soon as a command
+    evaluates to nan at every point and the nan provably propagates to the
+    result of the stack.
+    """
+
 
 def is_cpp():
     """Identify whether the backend is C++
@@ -43,7 +56,7 @@ def evaluate(stack, x, constants):
         :math`f(x)`
     """
     forward_eval = _forward_eval(stack, x, constants)
-    return forward_eval[-1].reshape((-1, 1))
+    return _as_result_column(forward_eval[-1], x)
 
 
 def simplify_and_evaluate(stack, x, constants):
@@ -72,7 +85,7 @@ def simplify_and_evaluate(stack, x, constants):
     used_commands_mask = get_utilized_commands(stack)
     forward_eval = _forward_eval_with_mask(stack, x, constants,
                                            used_commands_mask)
-    return forward_eval[-1].reshape((-1, 1))
+    return _as_result_column(forward_eval[-1], x)
 
 
 def simplify_and_evaluate_with_derivative(stack, x, constants,
@@ -138,6 +151,214 @@ def evaluate_with_derivative(stack, x, constants, wrt_param_x_or_c):
     return _evaluate_with_derivative(stack, x, constants, wrt_param_x_or_c)
 
 
+def evaluate_with_hessian(stack, x, constants):
+    """Evaluate equation and its first and second derivatives wrt constants
+
+    Evaluate the gradient and hessian of the equation associated with an
+    Agraph, with respect to its constants, at the values x.  The second
+    derivatives are calculated by forward-mode differentiation of the reverse
+    derivative calculation (forward-over-reverse).
+
+    Parameters
+    ----------
+    stack : Nx3 numpy array of int.
+            The command stack associated with an equation. N is the number of
+            commands in the stack.
+    x : MxD array of numeric.
+        Values at which to evaluate the equations. D is the number of
+        dimensions in x and M is the number of data points in x.
+    constants : list-like of numeric.
+                numeric constants that are used in the equation
+
+    Returns
+    -------
+    tuple(Mx1 array of numeric, MxL array of numeric, MxLxL array of numeric)
+        :math`f(x)`, :math`df(x)/dc_i` and :math`d^2f(x)/dc_i dc_j`
+    """
+    tangents = np.eye(len(constants))
+    return _evaluate_with_second_derivative(stack, x, constants, tangents,
+                                            False)
+
+
+def evaluate_with_hessian_vector_product(stack, x, constants, vector):
+    """Evaluate equation, its gradient and a hessian vector product
+
+    Evaluate the gradient of the equation associated with an Agraph, with
+    respect to its constants, and the product of its hessian with a vector,
+    at the values x.  This requires a single forward-over-reverse pass
+    regardless of the number of constants.
+
+    Parameters
+    ----------
+    stack : Nx3 numpy array of int.
+            The command stack associated with an equation. N is the number of
+            commands in the stack.
+    x : MxD array of numeric.
+        Values at which to evaluate the equations. D is the number of
+        dimensions in x and M is the number of data points in x.
+    constants : list-like of numeric.
+                numeric constants that are used in the equation
+    vector : list-like of numeric.
+             vector (of the same length as constants) by which the hessian is
+             multiplied
+
+    Returns
+    -------
+    tuple(Mx1 array of numeric, MxL array of numeric, MxL array of numeric)
+        :math`f(x)`, :math`df(x)/dc_i` and
+        :math`\\sum_j d^2f(x)/dc_i dc_j v_j`
+    """
+    tangents = np.reshape(vector, (-1, 1))
+    f_of_x, derivative, second_derivative = \
+        _evaluate_with_second_derivative(stack, x, constants, tangents, False)
+    return f_of_x, derivative, second_derivative[:, :, 0]
+
+
+def evaluate_with_mixed_derivative(stack, x, constants):
+    """Evaluate equation, its x derivatives and their constant derivatives
+
+    Evaluate the derivatives of the equation associated with an Agraph with
+    respect to x and the derivatives of those with respect to the constants
+    (mixed second derivatives), at the values x.  All are calculated in a
+    single forward-over-reverse pass.
+
+    Parameters
+    ----------
+    stack : Nx3 numpy array of int.
+            The command stack associated with an equation. N is the number of
+            commands in the stack.
+    x : MxD array of numeric.
+        Values at which to evaluate the equations. D is the number of
+        dimensions in x and M is the number of data points in x.
+    constants : list-like of numeric.
+                numeric constants that are used in the equation
+
+    Returns
+    -------
+    tuple(Mx1 array of numeric, MxD array of numeric, MxDxL array of numeric)
+        :math`f(x)`, :math`df(x)/dx_i` and :math`d^2f(x)/dx_i dc_j`
+    """
+    tangents = np.eye(len(constants))
+    return _evaluate_with_second_derivative(stack, x, constants, tangents,
+                                            True)
+
+
+def evaluate_at_constant_sets(stack, x, constant_sets):
+    """Evaluate an equation at multiple sets of constants
+
+    Evauluate the equation associated with an Agraph, at the values x, for
+    each of K sets of constants.  Commands which do not depend on the
+    constants are evaluated only once and shared by all of the sets.
+
+    Parameters
+    ----------
+    stack : Nx3 numpy array of int.
+            The command stack associated with an equation. N is the number of
+            commands in the stack.
+    x : MxD array of numeric.
+        Values at which to evaluate the equations. D is the number of
+        dimensions in x and M is the number of data points in x.
+    constant_sets : KxL array of numeric.
+                    K sets of the L numeric constants that are used in the
+                    equation
+
+    Returns
+    -------
+    MxK array of numeric
+        :math`f(x)` for each set of constants
+    """
+    forward_eval = _forward_eval_at_constant_sets(stack, x, constant_sets)
+    return _broadcast_to_constant_sets(forward_eval[-1], x, constant_sets)
+
+
+def evaluate_with_derivative_at_constant_sets(stack, x, constant_sets,
+                                              wrt_param_x_or_c):
+    """Evaluate equation and take derivative at multiple sets of constants
+
+    Evaluate the derivatives of the equation associated with an Agraph, at the
+    values x, for each of K sets of constants.  A single forward and reverse
+    pass is performed for all of the sets.
+
+    Parameters
+    ----------
+    stack : Nx3 numpy array of int.
+            The command stack associated with an equation. N is the number of
+            commands in the stack.
+    x : MxD array of numeric.
+        Values at which to evaluate the equations. D is the number of
+        dimensions in x and M is the number of data points in x.
+    constant_sets : KxL array of numeric.
+                    K sets of the L numeric constants that are used in the
+                    equation
+    wrt_param_x_or_c : boolean
+                       Take derivative with respect to x or constants. True
+                       signifies derivatives are wrt x. False signifies
+                       derivatives are wrt constants.
+
+    Returns
+    -------
+    tuple(MxK array of numeric, MxDxK or MxLxK array of numeric)
+        :math`f(x)` and the derivatives of all dimensions of x/constants at
+        location x, for each set of constants.
+    """
+    forward_eval = _forward_eval_at_constant_sets(stack, x, constant_sets)
+    f_of_x = _broadcast_to_constant_sets(forward_eval[-1], x, constant_sets)
+
+    if wrt_param_x_or_c:  # x
+        deriv_shape = x.shape + (f_of_x.shape[1],)
+        deriv_wrt_node = 0
+    else:  # c
+        deriv_shape = (x.shape[0],) + np.shape(constant_sets)[::-1]
+        deriv_wrt_node = 1
+
+    derivative = _reverse_eval(deriv_shape, deriv_wrt_node, forward_eval,
+                               stack, seed=np.ones(f_of_x.shape))
+    return f_of_x, derivative
+
+
+def evaluate_interval(stack, x_bounds, constant_bounds):
+    """Bound the value of an equation
+
+    Interval arithmetic is used to find bounds on the value of the equation
+    associated with an Agraph for any x and constants within the given bounds.
+    The bounds include infinite values but not undefined (nan) ones; they are
+    conservative, i.e., not necessarily tight.
+
+    Parameters
+    ----------
+    stack : Nx3 numpy array of int.
+            The command stack associated with an equation. N is the number of
+            commands in the stack.
+    x_bounds : 2xD array of numeric.
+               Lower (first row) and upper (second row) bounds of each of the D
+               dimensions of x.
+    constant_bounds : 2xL array of numeric.
+                      Lower (first row) and upper (second row) bounds of each
+                      of the L constants of the equation
+
+    Returns
+    -------
+    tuple(numeric, numeric)
+        lower and upper bounds of :math:`f(x)`; (nan, nan) if the equation can
+        only evaluate to nan
+    """
+    intervals = [None] * stack.shape[0]
+    with np.errstate(all="ignore"):
+        for i, (node, param1, param2) in enumerate(stack):
+            if node == 0:
+                intervals[i] = (x_bounds[0][param1], x_bounds[1][param1])
+            elif node == 1:
+                intervals[i] = (constant_bounds[0][param1],
+                                constant_bounds[1][param1])
+            elif np.isnan(intervals[param1][0]) or \
+                    np.isnan(intervals[param2][0]):
+                intervals[i] = _propagate_undefined_interval(node)
+            else:
+                intervals[i] = Nodes.interval_function(node, intervals[param1],
+                                                       intervals[param2])
+    return intervals[-1]
+
+
 def get_utilized_commands(stack):
     """Find which commands are utilized.
 
@@ -166,6 +387,80 @@ def get_utilized_commands(stack):
     return util
 
 
+def get_linear_constants(stack):
+    """Find which constants enter the equation linearly.
+
+    A constant enters linearly if the equation can be written as
+    :math:`f(x) = c_k g(x) + h(x)` where neither g nor h depend on any of the
+    linear constants.  Such constants are found by decomposing the equation,
+    starting at the last command, into terms through additions and
+    subtractions.  A constant is linear if it is one of these terms or if it
+    scales a term through a chain of multiplications (or as the numerator of
+    divisions).  Only commands that are referenced once are decomposed, which
+    ensures that the linear constants do not appear elsewhere in the equation.
+
+    Parameters
+    ----------
+    stack : Nx3 numpy array of int.
+            The command stack associated with an equation. N is the number of
+            commands in the stack.
+
+    Returns
+    -------
+    list of int
+        Sorted indices of the constants which enter the equation linearly.
+    """
+    used_commands = get_utilized_commands(stack)
+    num_references = _count_references(stack, used_commands)
+
+    def find_scaling_constant(row):
+        node, param1, param2 = stack[row]
+        if node == 1:
+            return row
+        if node == 4 and param1 != param2:
+            for param in (param1, param2):
+                if num_references[param] == 1:
+                    constant_row = find_scaling_constant(param)
+                    if constant_row is not None:
+                        return constant_row
+        if node == 5 and param1 != param2 and num_references[param1] == 1:
+            return find_scaling_constant(param1)
+        return None
+
+    linear_rows = set()
+    terms_to_decompose = [stack.shape[0] - 1]
+    while terms_to_decompose:
+        row = terms_to_decompose.pop()
+        node, param1, param2 = stack[row]
+        if node in (2, 3):
+            terms_to_decompose += [param for param in (param1, param2)
+                                   if num_references[param] == 1]
+        else:
+            constant_row = find_scaling_constant(row)
+            if constant_row is not None:
+                linear_rows.add(constant_row)
+
+    linear_constants = set()
+    nonlinear_constants = set()
+    for row, (node, param1, _) in enumerate(stack):
+        if used_commands[row] and node == 1:
+            if row in linear_rows:
+                linear_constants.add(int(param1))
+            else:
+                nonlinear_constants.add(int(param1))
+    return sorted(linear_constants - nonlinear_constants)
+
+
+def _count_references(stack, used_commands):
+    num_references = [0]*stack.shape[0]
+    for i, (node, param1, param2) in enumerate(stack):
+        if used_commands[i] and not IS_TERMINAL_MAP[node]:
+            num_references[param1] += 1
+            if IS_ARITY_2_MAP[node]:
+                num_references[param2] += 1
+    return num_references
+
+
 def simplify_stack(stack):
     """Simplifies a stack.
 
@@ -207,7 +502,10 @@ def simplify_stack(stack):
 
 
 def _forward_eval(stack, x, constants):
-    forward_eval = np.empty((stack.shape[0], x.shape[0]))
+    # commands which do not depend on x are kept as scalars and are only
+    # broadcast to the M points of x where they are combined with x
+    constants = np.asarray(constants, dtype=float)
+    forward_eval = [None] * stack.shape[0]
     for i, (node, param1, param2) in enumerate(stack):
         forward_eval[i] = Nodes.forward_eval_function(node,
                                                       param1,
@@ -215,11 +513,13 @@ def _forward_eval(stack, x, constants):
                                                       x,
                                                       constants,
                                                       forward_eval)
+        _check_for_nan_result(stack, i, forward_eval[i])
     return forward_eval
 
 
 def _forward_eval_with_mask(stack, x, constants, used_commands_mask):
-    forward_eval = np.empty((stack.shape[0], x.shape[0]))
+    constants = np.asarray(constants, dtype=float)
+    forward_eval = [None] * stack.shape[0]
     for i, command_is_used in enumerate(used_commands_mask):
         if command_is_used:
             node, param1, param2 = stack[i]
@@ -229,9 +529,65 @@ def _forward_eval_with_mask(stack, x, constants, used_commands_mask):
                                                           x,
                                                           constants,
                                                           forward_eval)
+            _check_for_nan_result(stack, i, forward_eval[i])
+    return forward_eval
+
+
+def _check_for_nan_result(stack, command_index, command_value):
+    # checking the first value makes the check nearly free for valid commands
+    command_value = np.ravel(command_value)
+    if EARLY_ABORT_ON_NAN and command_value.size > 0 and \
+            np.isnan(command_value[0]) and np.all(np.isnan(command_value)) \
+            and _nan_reaches_result(stack, command_index):
+        raise NonFiniteEvaluationError(
+            "command {} evaluates to nan".format(command_index))
+
+
+def _nan_reaches_result(stack, command_index):
+    # power is the only node which can turn nan into a number (|nan|^0 = 1)
+    reaches = np.zeros(stack.shape[0], dtype=bool)
+    reaches[command_index] = True
+    for i in range(command_index + 1, stack.shape[0]):
+        node, param1, param2 = stack[i]
+        reaches[i] = not IS_TERMINAL_MAP[node] and node != 10 and \
+            (reaches[param1] or reaches[param2])
+    return reaches[-1]
+
+
+def _forward_eval_at_constant_sets(stack, x, constant_sets):
+    # x is given a trailing axis and constants are transposed so that commands
+    # depending only on x have shape (M, 1), commands depending only on
+    # constants have shape (K,) and all others broadcast to (M, K)
+    x_columns = x[:, :, None]
+    constants = np.transpose(constant_sets)
+    forward_eval = [None] * stack.shape[0]
+    for i, (node, param1, param2) in enumerate(stack):
+        forward_eval[i] = Nodes.forward_eval_function(node,
+                                                      param1,
+                                                      param2,
+                                                      x_columns,
+                                                      constants,
+                                                      forward_eval)
     return forward_eval
 
 
+def _as_result_column(values, x):
+    return np.array(np.broadcast_to(values, (x.shape[0], ))).reshape((-1, 1))
+
+
+def _broadcast_to_constant_sets(values, x, constant_sets):
+    return np.array(np.broadcast_to(values, (x.shape[0],
+                                             len(constant_sets))))
+
+
+def _propagate_undefined_interval(node):
+    # nan propagates through every node except power, where |nan|^0 and 1^nan
+    # are both 1
+    if node == 10:
+        return 0., np.inf
+    return np.nan, np.nan
+
+
 def _evaluate_with_derivative(stack, x, constants, wrt_param_x_or_c):
 
     forward_eval = _forward_eval(stack, x, constants)
@@ -243,10 +599,14 @@ def _evaluate_with_derivative(stack, x, constants, wrt_param_x_or_c):
         deriv_shape = (x.shape[0], len(constants))
         deriv_wrt_node = 1
 
-    derivative = _reverse_eval(deriv_shape, deriv_wrt_node, forward_eval,
-                               stack)
+    if _use_forward_mode(deriv_shape[1], stack.shape[0]):
+        derivative = _forward_derivative_eval(deriv_shape, deriv_wrt_node,
+                                              forward_eval, stack)
+    else:
+        derivative = _reverse_eval(deriv_shape, deriv_wrt_node, forward_eval,
+                                   stack)
 
-    return forward_eval[-1].reshape((-1, 1)), derivative
+    return _as_result_column(forward_eval[-1], x), derivative
 
 
 def _evaluate_with_derivative_and_mask(stack, x, constants, used_commands_mask,
@@ -262,17 +622,72 @@ def _evaluate_with_derivative_and_mask(stack, x, constants, used_commands_mask,
         deriv_shape = (x.shape[0], len(constants))
         deriv_wrt_node = 1
 
-    derivative = _reverse_eval_with_mask(deriv_shape, deriv_wrt_node,
-                                         forward_eval, stack,
-                                         used_commands_mask)
+    if _use_forward_mode(deriv_shape[1], stack.shape[0]):
+        derivative = _forward_derivative_eval(deriv_shape, deriv_wrt_node,
+                                              forward_eval, stack,
+                                              used_commands_mask)
+    else:
+        derivative = _reverse_eval_with_mask(deriv_shape, deriv_wrt_node,
+                                             forward_eval, stack,
+                                             used_commands_mask)
+
+    return _as_result_column(forward_eval[-1], x), derivative
+
+
+def _use_forward_mode(num_directions, stack_size):
+    # forward mode carries a tangent per direction through the commands in a
+    # single pass; reverse mode needs a second pass through the stack but
+    # carries only one adjoint, so it wins when there are many directions.
+    # The tangents of long stacks accumulate many direction products, which
+    # makes reverse mode faster there even for few directions.
+    return num_directions <= FORWARD_MODE_MAX_DIRECTIONS and \
+        stack_size <= FORWARD_MODE_MAX_STACK_SIZE
+
+
+def _forward_derivative_eval(deriv_shape, deriv_wrt_node, forward_eval,
+                             stack, used_commands_mask=None):
+    # tangents are sparse, {direction: derivative}, so that (like reverse
+    # mode) only the directions a command depends on are propagated through it
+    tangents = [None] * stack.shape[0]
+    for i, (node, param1, param2) in enumerate(stack):
+        if used_commands_mask is not None and not used_commands_mask[i]:
+            continue
+        if node == deriv_wrt_node:
+            tangents[i] = {param1: 1.0}
+        elif not IS_TERMINAL_MAP[node] and (tangents[param1] or
+                                            tangents[param2]):
+            partial1, partial2 = Nodes.partials_function(
+                node, forward_eval[param1], forward_eval[param2],
+                forward_eval[i])
+            tangents[i] = _combine_sparse_tangents(node, param1, param2,
+                                                   partial1, partial2,
+                                                   tangents)
+
+    derivative = np.zeros(deriv_shape)
+    if tangents[-1]:
+        for direction, tangent in tangents[-1].items():
+            derivative[:, direction] = tangent
+    return derivative
+
 
-    return forward_eval[-1].reshape((-1, 1)), derivative
+def _combine_sparse_tangents(node, param1, param2, partial1, partial2,
+                             tangents):
+    combined = {direction: partial1 * tangent
+                for direction, tangent in (tangents[param1] or {}).items()}
+    if IS_ARITY_2_MAP[node]:
+        for direction, tangent in (tangents[param2] or {}).items():
+            if direction in combined:
+                combined[direction] = combined[direction] + partial2 * tangent
+            else:
+                combined[direction] = partial2 * tangent
+    return combined
 
 
-def _reverse_eval(deriv_shape, deriv_wrt_node, forward_eval, stack):
+def _reverse_eval(deriv_shape, deriv_wrt_node, forward_eval, stack,
+                  seed=1.0):
     derivative = np.zeros(deriv_shape)
     reverse_eval = [0] * stack.shape[0]
-    reverse_eval[-1] = 1.0
+    reverse_eval[-1] = seed
     for i in range(stack.shape[0] - 1, -1, -1):
         node, param1, param2 = stack[i]
         if node == deriv_wrt_node:
@@ -283,6 +698,108 @@ def _reverse_eval(deriv_shape, deriv_wrt_node, forward_eval, stack):
     return derivative
 
 
+def _evaluate_with_second_derivative(stack, x, constants, tangents,
+                                     wrt_param_x_or_c):
+    # tangents is an LxT array of T directions in constant space; the values
+    # and partial derivatives of every command are propagated forward along
+    # those directions, which allows the reverse pass to be differentiated
+    forward_eval = _forward_eval(stack, x, constants)
+    partials, forward_tangents = _forward_tangent_eval(stack, forward_eval,
+                                                       tangents, x.shape[0])
+
+    if wrt_param_x_or_c:  # x
+        deriv_shape = x.shape
+        deriv_wrt_node = 0
+    else:  # c
+        deriv_shape = (x.shape[0], len(constants))
+        deriv_wrt_node = 1
+
+    derivative, second_derivative = _reverse_tangent_eval(
+        deriv_shape + (tangents.shape[1], ), deriv_wrt_node, stack, partials,
+        forward_tangents)
+    return _as_result_column(forward_eval[-1], x), derivative, \
+        second_derivative
+
+
+def _forward_tangent_eval(stack, forward_eval, tangents, num_points):
+    num_tangents = tangents.shape[1]
+    partials = [None] * stack.shape[0]
+    forward_tangents = [None] * stack.shape[0]
+    for i, (node, param1, param2) in enumerate(stack):
+        if node == 1:
+            forward_tangents[i] = np.broadcast_to(
+                tangents[param1], (num_points, num_tangents))
+        elif not IS_TERMINAL_MAP[node]:
+            node_partials = \
+                Nodes.partials_function(node, forward_eval[param1],
+                                        forward_eval[param2],
+                                        forward_eval[i]) + \
+                Nodes.second_partials_function(node, forward_eval[param1],
+                                               forward_eval[param2],
+                                               forward_eval[i])
+            partials[i] = [np.broadcast_to(partial, (num_points, ))[:, None]
+                           for partial in node_partials]
+            forward_tangents[i] = _combine_tangents(
+                node, param1, param2, partials[i][0], partials[i][1],
+                forward_tangents)
+    return partials, forward_tangents
+
+
+def _combine_tangents(node, param1, param2, partial1, partial2, tangents):
+    # tangents of None are zero, i.e. the command does not depend on the
+    # direction of differentiation
+    combined_tangent = None
+    if tangents[param1] is not None:
+        combined_tangent = partial1 * tangents[param1]
+    if IS_ARITY_2_MAP[node] and tangents[param2] is not None:
+        if combined_tangent is None:
+            combined_tangent = partial2 * tangents[param2]
+        else:
+            combined_tangent = combined_tangent + partial2 * tangents[param2]
+    return combined_tangent
+
+
+def _reverse_tangent_eval(second_deriv_shape, deriv_wrt_node, stack,
+                          partials, forward_tangents):
+    num_points = second_deriv_shape[0]
+    num_tangents = second_deriv_shape[-1]
+    derivative = np.zeros(second_deriv_shape[:-1])
+    second_derivative = np.zeros(second_deriv_shape)
+    reverse_eval = np.zeros((stack.shape[0], num_points, 1))
+    reverse_tangents = np.zeros((stack.shape[0], num_points, num_tangents))
+    reverse_eval[-1] = 1.0
+    for i in range(stack.shape[0] - 1, -1, -1):
+        node, param1, param2 = stack[i]
+        if node == deriv_wrt_node:
+            derivative[:, param1] += reverse_eval[i, :, 0]
+            second_derivative[:, param1] += reverse_tangents[i]
+        elif not IS_TERMINAL_MAP[node]:
+            partial1, partial2, partial11, partial12, partial22 = partials[i]
+            _reverse_tangent_eval_param(
+                i, param1, partial1,
+                [(param1, partial11), (param2, partial12)]
+                if IS_ARITY_2_MAP[node] else [(param1, partial11)],
+                reverse_eval, reverse_tangents, forward_tangents)
+            if IS_ARITY_2_MAP[node]:
+                _reverse_tangent_eval_param(
+                    i, param2, partial2,
+                    [(param1, partial12), (param2, partial22)],
+                    reverse_eval, reverse_tangents, forward_tangents)
+    return derivative, second_derivative
+
+
+def _reverse_tangent_eval_param(reverse_index, param, partial,
+                                second_partials, reverse_eval,
+                                reverse_tangents, forward_tangents):
+    reverse_eval[param] += reverse_eval[reverse_index] * partial
+    reverse_tangents[param] += reverse_tangents[reverse_index] * partial
+    for tangent_param, second_partial in second_partials:
+        if forward_tangents[tangent_param] is not None:
+            reverse_tangents[param] += reverse_eval[reverse_index] * \
+                                       second_partial * \
+                                       forward_tangents[tangent_param]
+
+
 def _reverse_eval_with_mask(deriv_shape, deriv_wrt_node, forward_eval,
                             stack, used_commands_mask):
     derivative = np.zeros(deriv_shape)
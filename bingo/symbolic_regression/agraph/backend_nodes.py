@@ -8,6 +8,16 @@ FORWARD_EVAL_MAP : dictionary {int: function}
                    A map of node number to evaluation function
 REVERSE_EVAL_MAP : dictionary {int: function}
                    A map of node number to derivative evaluation function
+PARTIALS_MAP : dictionary {int: function}
+               A map of node number to a function calculating the partial
+               derivatives of the node with respect to its parameters
+SECOND_PARTIALS_MAP : dictionary {int: function}
+                      A map of node number to a function calculating the
+                      second partial derivatives of the node with respect to
+                      its parameters
+INTERVAL_MAP : dictionary {int: function}
+               A map of node number to a function calculating bounds on the
+               value of the node given bounds on its parameters
 """
 
 import numpy as np
@@ -45,6 +55,18 @@ def _add_reverse_eval(reverse_index, param1, param2, _forwardeval,
     reverse_eval[param2] += reverse_eval[reverse_index]
 
 
+def _add_partials(_param1_value, _param2_value, _value):
+    return 1., 1.
+
+
+def _add_second_partials(_param1_value, _param2_value, _value):
+    return 0., 0., 0.
+
+
+def _add_interval(lower1, upper1, lower2, upper2):
+    return _interval_hull(lower1 + lower2, upper1 + upper2)
+
+
 # Subtraction
 def _subtract_forward_eval(param1, param2, _x, _constants, forward_eval):
     return forward_eval[param1] - forward_eval[param2]
@@ -56,6 +78,18 @@ def _subtract_reverse_eval(reverse_index, param1, param2, _forwardeval,
     reverse_eval[param2] -= reverse_eval[reverse_index]
 
 
+def _subtract_partials(_param1_value, _param2_value, _value):
+    return 1., -1.
+
+
+def _subtract_second_partials(_param1_value, _param2_value, _value):
+    return 0., 0., 0.
+
+
+def _subtract_interval(lower1, upper1, lower2, upper2):
+    return _interval_hull(lower1 - upper2, upper1 - lower2)
+
+
 # Multiplication
 def _multiply_forward_eval(param1, param2, _x, _constants, forward_eval):
     return forward_eval[param1] * forward_eval[param2]
@@ -67,6 +101,19 @@ def _multiply_reverse_eval(reverse_index, param1, param2, forward_eval,
     reverse_eval[param2] += reverse_eval[reverse_index]*forward_eval[param1]
 
 
+def _multiply_partials(param1_value, param2_value, _value):
+    return param2_value, param1_value
+
+
+def _multiply_second_partials(_param1_value, _param2_value, _value):
+    return 0., 1., 0.
+
+
+def _multiply_interval(lower1, upper1, lower2, upper2):
+    return _interval_hull(lower1 * lower2, lower1 * upper2,
+                          upper1 * lower2, upper1 * upper2)
+
+
 # Division
 def _divide_forward_eval(param1, param2, _x, _constants, forward_eval):
     return forward_eval[param1] / forward_eval[param2]
@@ -79,6 +126,21 @@ def _divide_reverse_eval(reverse_index, param1, param2, forward_eval,
                             forward_eval[reverse_index] / forward_eval[param2]
 
 
+def _divide_partials(_param1_value, param2_value, value):
+    return 1. / param2_value, -value / param2_value
+
+
+def _divide_second_partials(_param1_value, param2_value, value):
+    inverse = 1. / param2_value
+    return 0., -inverse * inverse, 2. * value * inverse * inverse
+
+
+def _divide_interval(lower1, upper1, lower2, upper2):
+    if lower2 <= 0 <= upper2:
+        return -np.inf, np.inf
+    return _multiply_interval(lower1, upper1, 1. / upper2, 1. / lower2)
+
+
 # Sine
 def _sin_forward_eval(param1, _param2, _x, _constants, forward_eval):
     return np.sin(forward_eval[param1])
@@ -90,6 +152,18 @@ def _sin_reverse_eval(reverse_index, param1, _param2, forward_eval,
         reverse_eval[reverse_index] * np.cos(forward_eval[param1])
 
 
+def _sin_partials(param1_value, _param2_value, _value):
+    return np.cos(param1_value), 0.
+
+
+def _sin_second_partials(_param1_value, _param2_value, value):
+    return -value, 0., 0.
+
+
+def _sin_interval(lower1, upper1, _lower2, _upper2):
+    return _periodic_interval(np.sin, lower1, upper1, np.pi / 2, -np.pi / 2)
+
+
 # Cosine
 def _cos_forward_eval(param1, _param2, _x, _constants, forward_eval):
     return np.cos(forward_eval[param1])
@@ -101,6 +175,18 @@ def _cos_reverse_eval(reverse_index, param1, _param2, forward_eval,
         reverse_eval[reverse_index] * np.sin(forward_eval[param1])
 
 
+def _cos_partials(param1_value, _param2_value, _value):
+    return -np.sin(param1_value), 0.
+
+
+def _cos_second_partials(_param1_value, _param2_value, value):
+    return -value, 0., 0.
+
+
+def _cos_interval(lower1, upper1, _lower2, _upper2):
+    return _periodic_interval(np.cos, lower1, upper1, 0., np.pi)
+
+
 # Exponential
 def _exp_forward_eval(param1, _param2, _x, _constants, forward_eval):
     return np.exp(forward_eval[param1])
@@ -112,6 +198,18 @@ def _exp_reverse_eval(reverse_index, param1, _param2, forward_eval,
                             forward_eval[reverse_index]
 
 
+def _exp_partials(_param1_value, _param2_value, value):
+    return value, 0.
+
+
+def _exp_second_partials(_param1_value, _param2_value, value):
+    return value, 0., 0.
+
+
+def _exp_interval(lower1, upper1, _lower2, _upper2):
+    return np.exp(lower1), np.exp(upper1)
+
+
 # Natural logarithm
 def _log_forward_eval(param1, _param2, _x, _constants, forward_eval):
     return np.log(np.abs(forward_eval[param1]))
@@ -123,6 +221,19 @@ def _log_reverse_eval(reverse_index, param1, _param2, forward_eval,
                             forward_eval[param1]
 
 
+def _log_partials(param1_value, _param2_value, _value):
+    return 1. / param1_value, 0.
+
+
+def _log_second_partials(param1_value, _param2_value, _value):
+    return -1. / (param1_value * param1_value), 0., 0.
+
+
+def _log_interval(lower1, upper1, lower2, upper2):
+    abs_lower, abs_upper = _abs_interval(lower1, upper1, lower2, upper2)
+    return np.log(abs_lower), np.log(abs_upper)
+
+
 # Power
 def _pow_forward_eval(param1, param2, _x, _constants, forward_eval):
     return np.power(np.abs(forward_eval[param1]), forward_eval[param2])
@@ -138,6 +249,27 @@ def _pow_reverse_eval(reverse_index, param1, param2, forward_eval,
                             np.log(np.abs(forward_eval[param1]))
 
 
+def _pow_partials(param1_value, param2_value, value):
+    return value * param2_value / param1_value, \
+        value * np.log(np.abs(param1_value))
+
+
+def _pow_second_partials(param1_value, param2_value, value):
+    inverse = 1. / param1_value
+    log_abs = np.log(np.abs(param1_value))
+    return value * param2_value * (param2_value - 1.) * inverse * inverse, \
+        value * (1. + param2_value * log_abs) * inverse, \
+        value * log_abs * log_abs
+
+
+def _pow_interval(lower1, upper1, lower2, upper2):
+    # |p1|^p2 is monotonic in each parameter so its extrema are at the corners
+    abs_lower, abs_upper = _abs_interval(lower1, upper1, lower2, upper2)
+    return _interval_hull(*np.power([abs_lower, abs_lower,
+                                     abs_upper, abs_upper],
+                                    [lower2, upper2, lower2, upper2]))
+
+
 # Absolute value
 def _abs_forward_eval(param1, _param2, _x, _constants, forward_eval):
     return np.abs(forward_eval[param1])
@@ -149,6 +281,22 @@ def _abs_reverse_eval(reverse_index, param1, _param2, forward_eval,
                             np.sign(forward_eval[param1])
 
 
+def _abs_partials(param1_value, _param2_value, _value):
+    return np.sign(param1_value), 0.
+
+
+def _abs_second_partials(_param1_value, _param2_value, _value):
+    return 0., 0., 0.
+
+
+def _abs_interval(lower1, upper1, _lower2, _upper2):
+    if lower1 >= 0:
+        return lower1, upper1
+    if upper1 <= 0:
+        return -upper1, -lower1
+    return 0., max(-lower1, upper1)
+
+
 # Square root
 def _sqrt_forward_eval(param1, _param2, _x, _constants, forward_eval):
     return np.sqrt(np.abs(forward_eval[param1]))
@@ -161,11 +309,116 @@ def _sqrt_reverse_eval(reverse_index, param1, _param2, forward_eval,
                             np.sign(forward_eval[param1])
 
 
+def _sqrt_partials(param1_value, _param2_value, value):
+    return 0.5 * np.sign(param1_value) / value, 0.
+
+
+def _sqrt_second_partials(_param1_value, _param2_value, value):
+    return -0.25 / value**3, 0., 0.
+
+
+def _sqrt_interval(lower1, upper1, lower2, upper2):
+    abs_lower, abs_upper = _abs_interval(lower1, upper1, lower2, upper2)
+    return np.sqrt(abs_lower), np.sqrt(abs_upper)
+
+
+def _interval_hull(*values):
+    # undefined (nan) bounds, e.g. from inf - inf, are widened conservatively
+    if np.any(np.isnan(values)):
+        return -np.inf, np.inf
+    return min(values), max(values)
+
+
+def _periodic_interval(function, lower, upper, max_point, min_point):
+    # bounds of a function with period 2*pi, maximum 1 and minimum -1
+    if not np.isfinite(lower) or not np.isfinite(upper):
+        if lower == upper:
+            return np.nan, np.nan
+        return -1., 1.
+    function_lower, function_upper = _interval_hull(function(lower),
+                                                    function(upper))
+    if _contains_periodic_point(lower, upper, max_point):
+        function_upper = 1.
+    if _contains_periodic_point(lower, upper, min_point):
+        function_lower = -1.
+    return function_lower, function_upper
+
+
+def _contains_periodic_point(lower, upper, point):
+    period = 2 * np.pi
+    return point + period * np.ceil((lower - point) / period) <= upper
+
+
 def forward_eval_function(node, param1, param2, x, constants, forward_eval):
     """Performs calculation of one line of stack"""
     return FORWARD_EVAL_MAP[node](param1, param2, x, constants, forward_eval)
 
 
+def partials_function(node, param1_value, param2_value, value):
+    """Calculates the partial derivatives of one line of stack
+
+    Parameters
+    ----------
+    node : int
+        the node of the command
+    param1_value : array of numeric
+        the value of the first parameter of the command
+    param2_value : array of numeric
+        the value of the second parameter of the command
+    value : array of numeric
+        the value of the command
+
+    Returns
+    -------
+    tuple of 2 numerics or arrays of numeric
+        the derivatives with respect to parameters 1 and 2
+    """
+    return PARTIALS_MAP[node](param1_value, param2_value, value)
+
+
+def second_partials_function(node, param1_value, param2_value, value):
+    """Calculates the second partial derivatives of one line of stack
+
+    Parameters
+    ----------
+    node : int
+        the node of the command
+    param1_value : array of numeric
+        the value of the first parameter of the command
+    param2_value : array of numeric
+        the value of the second parameter of the command
+    value : array of numeric
+        the value of the command
+
+    Returns
+    -------
+    tuple of 3 numerics or arrays of numeric
+        the second derivatives with respect to parameters 1,1; 1,2 and 2,2
+    """
+    return SECOND_PARTIALS_MAP[node](param1_value, param2_value, value)
+
+
+def interval_function(node, interval1, interval2):
+    """Calculates bounds on the value of one line of stack
+
+    Parameters
+    ----------
+    node : int
+        the node of the command
+    interval1 : tuple(numeric, numeric)
+        lower and upper bounds of the first parameter of the command
+    interval2 : tuple(numeric, numeric)
+        lower and upper bounds of the second parameter of the command
+
+    Returns
+    -------
+    tuple(numeric, numeric)
+        lower and upper bounds of the finite and infinite values of the
+        command; (nan, nan) if the command can only be nan
+    """
+    return INTERVAL_MAP[node](*interval1, *interval2)
+
+
 def reverse_eval_function(node, reverse_index, param1, param2, forward_eval,
                           reverse_eval):
     """Performs calculation of one line of stack for derivative calculation"""
@@ -201,3 +454,39 @@ REVERSE_EVAL_MAP = {0: _loadx_reverse_eval,
                     10: _pow_reverse_eval,
                     11: _abs_reverse_eval,
                     12: _sqrt_reverse_eval}
+
+PARTIALS_MAP = {2: _add_partials,
+                3: _subtract_partials,
+                4: _multiply_partials,
+                5: _divide_partials,
+                6: _sin_partials,
+                7: _cos_partials,
+                8: _exp_partials,
+                9: _log_partials,
+                10: _pow_partials,
+                11: _abs_partials,
+                12: _sqrt_partials}
+
+SECOND_PARTIALS_MAP = {2: _add_second_partials,
+                       3: _subtract_second_partials,
+                       4: _multiply_second_partials,
+                       5: _divide_second_partials,
+                       6: _sin_second_partials,
+                       7: _cos_second_partials,
+                       8: _exp_second_partials,
+                       9: _log_second_partials,
+                       10: _pow_second_partials,
+                       11: _abs_second_partials,
+                       12: _sqrt_second_partials}
+
+INTERVAL_MAP = {2: _add_interval,
+                3: _subtract_interval,
+                4: _multiply_interval,
+                5: _divide_interval,
+                6: _sin_interval,
+                7: _cos_interval,
+                8: _exp_interval,
+                9: _log_interval,
+                10: _pow_interval,
+                11: _abs_interval,
+                12: _sqrt_interval}
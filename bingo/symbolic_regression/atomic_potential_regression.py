@@ -12,14 +12,18 @@ data container.
 """
 import warnings
 import logging
+from multiprocessing import Pool
 
 import numpy as np
 
 from ..evaluation.fitness_function import VectorBasedFunction
 from ..evaluation.training_data import TrainingData
+from ..util.argument_validation import argument_validation
 
 LOGGER = logging.getLogger(__name__)
 
+CELL_LIST_MIN_ATOMS = 1000
+
 
 class PairwiseAtomicPotential(VectorBasedFunction):
     """Fitness based on total potential energy of a set of configurations.
@@ -36,21 +40,44 @@ class PairwiseAtomicPotential(VectorBasedFunction):
     training_data : PairwiseAtomicTrainingData
                    data that is used in fitness evaluation.  Must have
                    attributes r, potential_energy and config_lims_r.
+    metric : str
+        String defining the measure of error to use. Available options are:
+        'mean absolute error', 'mean squared error', and
+        'root mean squared error'
     """
+    POINTWISE_FITNESS_VECTOR = True
+    WORKSPACE_FITNESS_VECTOR = True
 
     def evaluate_fitness_vector(self, individual):
+        return np.copy(self.evaluate_fitness_vector_in_workspace(individual))
+
+    def evaluate_fitness_vector_in_workspace(self, individual):
         self.eval_count += 1
         pair_energies = individual.evaluate_equation_at(
-            self.training_data.r).flatten()
-
-        err_vec = []
-        for i, energy_true in enumerate(self.training_data.potential_energy):
-            energy = np.sum(pair_energies[self.training_data.config_lims_r[i]:
-                                          self.training_data.config_lims_r[
-                                              i + 1]])
-            err_vec.append(energy - energy_true)
-
-        return np.array(err_vec).flatten()
+            self.training_data.r).reshape(-1)
+        energies_true = self.training_data.potential_energy
+        config_lims_r = np.asarray(self.training_data.config_lims_r)
+
+        err_vec = self._get_workspace((len(energies_true), ))
+        _sum_configuration_energies(pair_energies, config_lims_r, err_vec)
+        err_vec -= energies_true
+        return err_vec
+
+
+def _sum_configuration_energies(pair_energies, config_lims_r, out):
+    """Segmented sum of the pair energies of each configuration into out"""
+    # reduceat sums the last segment to the end of the array
+    pair_energies = pair_energies[:config_lims_r[-1]]
+    starts = config_lims_r[:-1]
+    non_empty = starts < config_lims_r[1:]
+    if np.all(non_empty):
+        np.add.reduceat(pair_energies, starts, out=out)
+    else:
+        # reduceat does not give zero for empty segments
+        out[:] = 0.
+        if np.any(non_empty):
+            out[non_empty] = np.add.reduceat(pair_energies,
+                                             starts[non_empty])
 
 
 class PairwiseAtomicTrainingData(TrainingData):
@@ -75,14 +102,23 @@ class PairwiseAtomicTrainingData(TrainingData):
      config_lims_r : 1d numpy array
                      (optional) bounds of all of the r_indices corresponding to
                      each configuration
+     num_processes : int
+                     (optional) number of processes used to synthesize the
+                     pairwise distances of the configurations.  Default 1.
 
     Notes
     -----
     Ininilization must be performed with either configurations or a
     combination of r_list and config_lims_r.
+
+    Pairwise distances are calculated with the minimum image convention.
+    Configurations with at least `CELL_LIST_MIN_ATOMS` atoms use a cell list
+    neighbor search if the periodic size is at least 3 times r_cutoff;
+    otherwise all pairs of atoms are considered.
     """
+    @argument_validation(num_processes={">": 0})
     def __init__(self, potential_energy, configurations=None, r_list=None,
-                 config_lims_r=None):
+                 config_lims_r=None, num_processes=1):
 
         potential_energy = self._flatten_energies_if_needed(potential_energy)
 
@@ -90,7 +126,8 @@ class PairwiseAtomicTrainingData(TrainingData):
             self._check_equal_num_of_energies_and_configs(configurations,
                                                           potential_energy)
             config_lims_r, r_list = \
-                self._synthesize_atomic_configurations(configurations)
+                self._synthesize_atomic_configurations(configurations,
+                                                       num_processes)
 
         elif r_list is None or config_lims_r is None:
             raise RuntimeError('Invalid construction of ' +
@@ -114,12 +151,14 @@ class PairwiseAtomicTrainingData(TrainingData):
                                        a subset
         """
 
-        r_inds = []
-        new_config_lims_r = [0]
-        for i in items:
-            r_inds += range(self.config_lims_r[i], self.config_lims_r[i+1])
-            new_config_lims_r.append(len(r_inds))
-        new_config_lims_r = np.array(new_config_lims_r)
+        items = np.asarray(items).reshape(-1)
+        config_lims_r = np.asarray(self.config_lims_r)
+        starts = config_lims_r[items]
+        counts = config_lims_r[items + 1] - starts
+        new_config_lims_r = np.zeros(len(items) + 1, dtype=int)
+        np.cumsum(counts, out=new_config_lims_r[1:])
+        r_inds = np.arange(new_config_lims_r[-1]) \
+            + np.repeat(starts - new_config_lims_r[:-1], counts)
 
         new_potential_energy = self.potential_energy[items]
         temp = PairwiseAtomicTrainingData(
@@ -155,38 +194,67 @@ class PairwiseAtomicTrainingData(TrainingData):
         return potential_energy
 
     @staticmethod
-    def _synthesize_atomic_configurations(configurations):
-        r_list = []
-        config_lims_r = [0]
-        for (structure, periodic_size, r_cutoff) in configurations:
-            # make radius list
-            natoms = structure.shape[0]
-            rcutsq = r_cutoff ** 2
-            for atomi in range(0, natoms):
-                xtmp = structure[atomi, 0]
-                ytmp = structure[atomi, 1]
-                ztmp = structure[atomi, 2]
-                for atomj in range(atomi + 1, natoms):
-                    delx = structure[atomj, 0] - xtmp
-                    while delx > 0.5 * periodic_size:
-                        delx -= periodic_size
-                    while delx < -0.5 * periodic_size:
-                        delx += periodic_size
-                    dely = structure[atomj, 1] - ytmp
-                    while dely > 0.5 * periodic_size:
-                        dely -= periodic_size
-                    while dely < -0.5 * periodic_size:
-                        dely += periodic_size
-                    delz = structure[atomj, 2] - ztmp
-                    while delz > 0.5 * periodic_size:
-                        delz -= periodic_size
-                    while delz < -0.5 * periodic_size:
-                        delz += periodic_size
-
-                    rsq = delx * delx + dely * dely + delz * delz
-                    if rsq <= rcutsq:
-                        r_list.append(np.sqrt(rsq))
-            config_lims_r.append(len(r_list))
-        r_list = np.array(r_list).reshape([-1, 1])
-        config_lims_r = np.array(config_lims_r)
+    def _synthesize_atomic_configurations(configurations, num_processes=1):
+        if num_processes > 1:
+            with Pool(num_processes) as pool:
+                r_lists = pool.starmap(_pairwise_distances, configurations)
+        else:
+            r_lists = [_pairwise_distances(*configuration)
+                       for configuration in configurations]
+        config_lims_r = np.zeros(len(r_lists) + 1, dtype=int)
+        config_lims_r[1:] = np.cumsum([len(r) for r in r_lists])
+        r_list = np.concatenate(r_lists + [np.empty(0)]).reshape([-1, 1])
         return config_lims_r, r_list
+
+
+def _pairwise_distances(structure, periodic_size, r_cutoff):
+    """Distances between the pairs of atoms (i < j) within r_cutoff"""
+    structure = np.asarray(structure, dtype=float)
+    cells_per_side = int(periodic_size // r_cutoff)
+    if structure.shape[0] >= CELL_LIST_MIN_ATOMS and cells_per_side >= 3:
+        atom_i, atom_j = _cell_list_pairs(structure, periodic_size,
+                                          cells_per_side)
+    else:
+        atom_i, atom_j = np.triu_indices(structure.shape[0], 1)
+
+    delta = structure[atom_j] - structure[atom_i]
+    delta -= periodic_size * np.round(delta / periodic_size)
+    rsq = np.sum(delta * delta, axis=1)
+    return np.sqrt(rsq[rsq <= r_cutoff ** 2])
+
+
+def _cell_list_pairs(structure, periodic_size, cells_per_side):
+    """Pairs of atoms (i < j) in the same or neighboring cells
+
+    The periodic box is binned into cells_per_side^3 cells which are at least
+    r_cutoff wide.  The pairs are in the same order as `np.triu_indices`.
+    """
+    cell_size = periodic_size / cells_per_side
+    cell_coords = np.floor(np.mod(structure, periodic_size) / cell_size)
+    cell_coords = np.clip(cell_coords.astype(int), 0, cells_per_side - 1)
+    cells = np.ravel_multi_index(cell_coords.T, (cells_per_side,) * 3)
+
+    atoms_by_cell = np.argsort(cells, kind="stable")
+    cell_counts = np.bincount(cells, minlength=cells_per_side ** 3)
+    cell_starts = np.cumsum(cell_counts) - cell_counts
+
+    atom_i = []
+    atom_j = []
+    for offset in np.ndindex(3, 3, 3):
+        neighbor_cells = np.ravel_multi_index(
+            (cell_coords + np.array(offset) - 1).T, (cells_per_side,) * 3,
+            mode="wrap")
+        counts = cell_counts[neighbor_cells]
+        first_candidates = np.cumsum(counts) - counts
+        candidates = np.arange(np.sum(counts)) \
+            - np.repeat(first_candidates - cell_starts[neighbor_cells],
+                        counts)
+        i = np.repeat(np.arange(structure.shape[0]), counts)
+        j = atoms_by_cell[candidates]
+        atom_i.append(i[i < j])
+        atom_j.append(j[i < j])
+
+    atom_i = np.concatenate(atom_i)
+    atom_j = np.concatenate(atom_j)
+    order = np.lexsort((atom_j, atom_i))
+    return atom_i[order], atom_j[order]
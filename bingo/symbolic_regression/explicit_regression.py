@@ -10,14 +10,20 @@ appropriate fitness evaluator and a corresponding training data container.
 
 import warnings
 import logging
+from collections import OrderedDict
 
+import numpy as np
+
+from ..util.argument_validation import argument_validation
 from ..evaluation.fitness_function import VectorBasedFunction
-from ..evaluation.training_data import TrainingData
+from ..evaluation.gradient_mixin import VectorHessianMixin
+from ..evaluation.training_data import TrainingData, as_contiguous_slice, \
+    save_npy, load_npy
 
 LOGGER = logging.getLogger(__name__)
 
 
-class ExplicitRegression(VectorBasedFunction):
+class ExplicitRegression(VectorHessianMixin, VectorBasedFunction):
     """ExplicitRegression
 
     Parameters
@@ -28,10 +34,30 @@ class ExplicitRegression(VectorBasedFunction):
         String defining the measure of error to use. Available options are:
         'mean absolute error', 'mean squared error', and
         'root mean squared error'
+
+    Notes
+    -----
+    With weighted training data (e.g., from `ExplicitTrainingData.compress`)
+    the fitness vector and its derivatives are scaled by the square roots of
+    the weights.
     """
+    POINTWISE_FITNESS_VECTOR = True
+    WORKSPACE_FITNESS_VECTOR = True
+
     def __init__(self, training_data, metric="mae"):
         super().__init__(training_data, metric)
 
+    def evaluate_fitness_vector_in_workspace(self, individual):
+        self.eval_count += 1
+        f_of_x = individual.evaluate_equation_at(self.training_data.x)
+        residual = self._get_workspace(
+            np.broadcast(f_of_x, self.training_data.y).shape)
+        np.subtract(f_of_x, self.training_data.y, out=residual)
+        weights = getattr(self.training_data, "weights", None)
+        if weights is not None:
+            residual *= np.sqrt(weights)[:, None]
+        return residual.reshape(-1)
+
     def evaluate_fitness_vector(self, individual):
         """ Traditional fitness evaluation for symbolic regression
 
@@ -46,14 +72,364 @@ class ExplicitRegression(VectorBasedFunction):
         """
         self.eval_count += 1
         f_of_x = individual.evaluate_equation_at(self.training_data.x)
-        return (f_of_x - self.training_data.y).flatten()
+        return self._weight_rows(f_of_x - self.training_data.y).reshape(-1)
+
+    def get_fitness_vector_and_jacobian(self, individual):
+        """Fitness vector and its jacobian for symbolic regression
+
+        The jacobian of the fitness vector, f(x) - y, with respect to the
+        constants of the individual is df(x)/dc.
+
+        Parameters
+        ----------
+        individual : agraph
+            individual whose fitness is evaluated on `training_data`
+
+        Returns
+        -------
+        tuple(array of numeric of length M, MxL array of numeric)
+            the fitness vector and its derivatives with respect to the L
+            constants of the individual
+        """
+        self.eval_count += 1
+        f_of_x, df_dc = \
+            individual.evaluate_equation_with_local_opt_gradient_at(
+                self.training_data.x)
+        return self._weight_rows(f_of_x - self.training_data.y).flatten(), \
+            self._weight_rows(df_dc)
+
+    def get_fitness_vector_jacobian_and_hessian(self, individual):
+        """Fitness vector and its first and second derivatives for symbolic
+        regression
+
+        The derivatives of the fitness vector, f(x) - y, with respect to the
+        constants of the individual are those of f(x).
+
+        Parameters
+        ----------
+        individual : agraph
+            individual whose fitness is evaluated on `training_data`
+
+        Returns
+        -------
+        tuple(array of numeric of length M, MxL array of numeric,
+              MxLxL array of numeric)
+            the fitness vector and its first and second derivatives with
+            respect to the L constants of the individual
+        """
+        self.eval_count += 1
+        f_of_x, df_dc, d2f_dc2 = \
+            individual.evaluate_equation_with_local_opt_hessian_at(
+                self.training_data.x)
+        return self._weight_rows(f_of_x - self.training_data.y).flatten(), \
+            self._weight_rows(df_dc), self._weight_rows(d2f_dc2)
+
+    def get_fitness_vector_jacobian_and_hessian_vector_product(self,
+                                                               individual,
+                                                               vector):
+        """Fitness vector, its jacobian and its hessian vector product for
+        symbolic regression
+
+        Parameters
+        ----------
+        individual : agraph
+            individual whose fitness is evaluated on `training_data`
+        vector : array of numeric of length L
+            vector by which the second derivatives are multiplied
+
+        Returns
+        -------
+        tuple(array of numeric of length M, MxL array of numeric,
+              MxL array of numeric)
+            the fitness vector, its jacobian and the product of its second
+            derivatives with `vector`
+        """
+        self.eval_count += 1
+        f_of_x, df_dc, d2f_dc2_v = individual.\
+            evaluate_equation_with_local_opt_hessian_vector_product_at(
+                self.training_data.x, vector)
+        return self._weight_rows(f_of_x - self.training_data.y).flatten(), \
+            self._weight_rows(df_dc), self._weight_rows(d2f_dc2_v)
+
+    def _weight_rows(self, array):
+        # rows are scaled by the square roots of the sample weights so that
+        # sums of squares (and least squares local optimization) are weighted
+        weights = getattr(self.training_data, "weights", None)
+        if weights is None:
+            return array
+        return array * np.sqrt(weights).reshape((-1, ) +
+                                                (1, ) * (array.ndim - 1))
+
+
+class MultiTargetExplicitRegression(ExplicitRegression):
+    """Explicit regression of several targets at once
+
+    Each column of y in the training data is a separate target.  The
+    constants of an individual are optimized for each target separately, with
+    Levenberg-Marquardt iterations of all targets in lockstep.  All targets
+    are evaluated in a single pass through the equation, so the rows of the
+    equation that depend only on x are shared.  The fitness for each target is
+    normalized by `target_scales`, the fitness of predicting the (weighted)
+    mean of the target, so that targets of different magnitudes are
+    comparable.  The fitness of an individual is its normalized fitness for
+    the target it fits best, and its constants are set to those for that
+    target.  Since the local optimization is performed by the fitness function
+    itself it should not be wrapped in a `ContinuousLocalOptimization`.
+
+    The constants and fitness of each target are cached for the most recently
+    evaluated individuals, such that `get_target_individuals` (e.g., in a
+    `MultiTargetHallOfFame`) does not repeat their optimization.
+
+    Parameters
+    ----------
+    training_data : ExplicitTrainingData
+        data that is used in fitness evaluation.  Each column of y is a target.
+    metric : str
+        String defining the measure of error to use. Available options are:
+        'mean absolute error', 'mean squared error', and
+        'root mean squared error'
+    max_iterations : int
+        The maximum number of Levenberg-Marquardt iterations. Default 100.
+    tol : float
+        Relative tolerance on the change in the sum of squares of the fitness
+        vector and on the step size used to determine convergence.
+        Default 1e-6.
+
+    Notes
+    -----
+    The fitness vector and its derivatives (inherited from
+    `ExplicitRegression`) measure the error with respect to all targets
+    jointly.
+    """
+    POINTWISE_FITNESS_VECTOR = False
+    TARGET_CACHE_SIZE = 1024
+    INITIAL_DAMPING = 1e-3
+    MAX_DAMPING = 1e16
+    DAMPING_FACTOR = 10.
+
+    @argument_validation(max_iterations={">": 0},
+                         tol={">": 0})
+    def __init__(self, training_data, metric="mae", max_iterations=100,
+                 tol=1e-6):
+        super().__init__(training_data, metric)
+        self._max_iterations = max_iterations
+        self._tol = tol
+        self._target_cache = OrderedDict()
+
+    @property
+    def num_targets(self):
+        """int : the number of targets, i.e., columns of y"""
+        return self.training_data.y.shape[1]
+
+    @property
+    def target_scales(self):
+        """array of numeric : the (unnormalized) fitness of predicting the
+        weighted mean of each target, which normalizes the target fitness.
+        Constant targets have a scale of 1."""
+        y = self.training_data.y
+        weights = getattr(self.training_data, "weights", None)
+        deviations = self._weight_rows(y - np.average(y, axis=0,
+                                                      weights=weights))
+        scales = np.array([self._metric(deviation)
+                           for deviation in deviations.T])
+        scales[scales == 0] = 1.
+        return scales
+
+    def __call__(self, individual):
+        """Fitness of the individual for the target it fits best
+
+        Constants are optimized for each target if the individual needs local
+        optimization.
+
+        Parameters
+        ----------
+        individual : agraph
+            individual whose fitness is evaluated on `training_data`
+
+        Returns
+        -------
+         :
+           fitness of the individual
+        """
+        if individual.needs_local_optimization():
+            constant_sets = self.optimize_target_constants(individual)
+        else:
+            constant_sets = self._get_current_constant_sets(individual)
+        target_fitness = self.evaluate_target_fitness(individual,
+                                                      constant_sets)
+        best_target = 0 if np.all(np.isnan(target_fitness)) \
+            else np.nanargmin(target_fitness)
+        if constant_sets.shape[1] > 0:
+            individual.set_local_optimization_params(
+                np.copy(constant_sets[best_target]))
+        self._cache_targets(individual, constant_sets, target_fitness)
+        return target_fitness[best_target]
+
+    def evaluate_target_fitness(self, individual, constant_sets):
+        """Fitness of the individual for each target
+
+        Parameters
+        ----------
+        individual : agraph
+            individual whose fitness is evaluated on `training_data`
+        constant_sets : KxL array of numeric
+            the L constants of the individual for each of the K targets
+
+        Returns
+        -------
+        array of numeric of length K
+            the normalized fitness for each target
+        """
+        self.eval_count += 1
+        f_of_x = individual.evaluate_equation_at_constant_sets(
+            self.training_data.x, constant_sets)
+        residuals = self._weight_rows(f_of_x - self.training_data.y)
+        return np.array([self._metric(residual) for residual in residuals.T]) \
+            / self.target_scales
+
+    def optimize_target_constants(self, individual):
+        """Optimizes the constants of the individual for each target
+
+        Optimization starts from the current constants of the individual, or
+        from random constants if it needs local optimization.  The individual
+        itself is not changed.
+
+        Parameters
+        ----------
+        individual : agraph
+            individual whose constants are optimized
+
+        Returns
+        -------
+        KxL array of numeric
+            the optimized L constants of the individual for each of the K
+            targets
+        """
+        if individual.needs_local_optimization():
+            num_params = individual.get_number_local_optimization_params()
+            params = np.random.uniform(-10000, 10000,
+                                       (self.num_targets, num_params))
+        else:
+            params = self._get_current_constant_sets(individual)
+        if params.shape[1] == 0:
+            return params
+
+        cost, residuals, jacobians = self._evaluate_targets(individual, params)
+        damping = np.full(self.num_targets, self.INITIAL_DAMPING)
+        active = np.isfinite(cost)
+        for _ in range(self._max_iterations):
+            if not np.any(active):
+                break
+            steps = _solve_damped_normal_equations(residuals, jacobians,
+                                                   damping)
+            steps[~active] = 0.
+            trial_cost, trial_residuals, trial_jacobians = \
+                self._evaluate_targets(individual, params + steps)
+
+            improved = active & (trial_cost < cost)
+            converged = improved & (
+                (cost - trial_cost <= self._tol * cost) |
+                (np.linalg.norm(steps, axis=1) <=
+                 self._tol * (np.linalg.norm(params, axis=1) + self._tol)))
+            params[improved] += steps[improved]
+            cost[improved] = trial_cost[improved]
+            residuals[:, improved] = trial_residuals[:, improved]
+            jacobians[:, :, improved] = trial_jacobians[:, :, improved]
+            damping[improved] = np.maximum(
+                damping[improved] / self.DAMPING_FACTOR, 1e-16)
+            damping[active & ~improved] *= self.DAMPING_FACTOR
+            active &= ~converged & (damping <= self.MAX_DAMPING)
+        return params
+
+    def get_target_individuals(self, individual):
+        """Copies of the individual with optimized constants for each target
+
+        Parameters
+        ----------
+        individual : agraph
+            individual whose constants are optimized for each target
+
+        Returns
+        -------
+        list of agraph
+            a copy of the individual for each target with constants optimized
+            for, and fitness evaluated on, that target
+        """
+        key = _get_target_cache_key(individual)
+        if key in self._target_cache:
+            self._target_cache.move_to_end(key)
+            constant_sets, target_fitness = self._target_cache[key]
+        else:
+            constant_sets = self.optimize_target_constants(individual)
+            target_fitness = self.evaluate_target_fitness(individual,
+                                                          constant_sets)
+            self._cache_targets(individual, constant_sets, target_fitness)
+        target_individuals = []
+        for constants, fitness in zip(constant_sets, target_fitness):
+            target_individual = individual.copy()
+            if constant_sets.shape[1] > 0:
+                target_individual.set_local_optimization_params(
+                    np.copy(constants))
+            target_individual.fitness = fitness
+            target_individuals.append(target_individual)
+        return target_individuals
+
+    def _cache_targets(self, individual, constant_sets, target_fitness):
+        key = _get_target_cache_key(individual)
+        self._target_cache[key] = (np.copy(constant_sets), target_fitness)
+        self._target_cache.move_to_end(key)
+        if len(self._target_cache) > self.TARGET_CACHE_SIZE:
+            self._target_cache.popitem(last=False)
+
+    def _get_current_constant_sets(self, individual):
+        num_params = individual.get_number_local_optimization_params()
+        constants = np.asarray(individual.constants, dtype=float)[:num_params]
+        return np.tile(constants, (self.num_targets, 1))
+
+    def _evaluate_targets(self, individual, params):
+        self.eval_count += 1
+        f_of_x, df_dc = individual.\
+            evaluate_equation_with_local_opt_gradient_at_constant_sets(
+                self.training_data.x, params)
+        residuals = self._weight_rows(f_of_x - self.training_data.y)
+        jacobians = self._weight_rows(df_dc)
+        cost = np.sum(np.square(residuals), axis=0)
+        invalid = ~np.isfinite(cost) | \
+            ~np.all(np.isfinite(jacobians), axis=(0, 1))
+        cost[invalid] = np.inf
+        return cost, residuals, jacobians
+
+
+def _get_target_cache_key(individual):
+    return (np.asarray(individual.command_array).tobytes(),
+            np.asarray(individual.constants, dtype=float).tobytes())
+
+
+def _solve_damped_normal_equations(residuals, jacobians, damping):
+    # residuals are MxK, jacobians are MxLxK and the steps are KxL
+    normal_matrices = np.einsum("mik,mjk->kij", jacobians, jacobians)
+    gradients = np.einsum("mik,mk->ki", jacobians, residuals)
+    diagonals = np.diagonal(normal_matrices, axis1=1, axis2=2)
+    diag_inds = np.arange(normal_matrices.shape[1])
+    normal_matrices[:, diag_inds, diag_inds] = \
+        diagonals + damping[:, None] * np.maximum(diagonals,
+                                                  np.finfo(float).eps)
+    normal_matrices[~np.isfinite(normal_matrices)] = 0.
+    gradients[~np.isfinite(gradients)] = 0.
+    try:
+        return np.linalg.solve(normal_matrices, -gradients[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        return np.stack([np.linalg.lstsq(matrix, -gradient, rcond=None)[0]
+                         for matrix, gradient in zip(normal_matrices,
+                                                     gradients)])
 
 
 class ExplicitTrainingData(TrainingData):
     """
     ExplicitTrainingData: Training data of this type contains an input array of
     data (x)  and an output array of data (y).  Both must be 2 dimensional
-    numpy arrays
+    numpy arrays.  They may also be memory maps of .npy files (see `from_npy`),
+    in which case contiguous subsets of the data are views rather than copies.
 
     Parameters
     ----------
@@ -61,8 +437,20 @@ class ExplicitTrainingData(TrainingData):
         independent variable
     y : 2D numpy array
         dependent variable
+    weights : 1D numpy array
+        (Optional) the number of samples each row represents. Default None,
+        i.e., one sample per row.
+    aggregated_squared_error : 1D numpy array
+        (Optional) the sum of squared deviations from y of the samples that
+        each row represents, i.e., the squared error lost by aggregation.
+        Default None.
+
+    Attributes
+    ----------
+    x_bounds : 2xD numpy array
+        bounds of each dimension of x
     """
-    def __init__(self, x, y):
+    def __init__(self, x, y, weights=None, aggregated_squared_error=None):
         if x.ndim == 1:
             warnings.warn("Explicit training x should be 2 dim array, " +
                           "reshaping array")
@@ -79,10 +467,53 @@ class ExplicitTrainingData(TrainingData):
 
         self.x = x
         self.y = y
+        self.weights = weights
+        self.aggregated_squared_error = aggregated_squared_error
+
+    @classmethod
+    def from_npy(cls, x_filename, y_filename, mmap_mode="r"):
+        """Creates ExplicitTrainingData backed by .npy files
+
+        Parameters
+        ----------
+        x_filename : str
+            .npy file containing the independent variable
+        y_filename : str
+            .npy file containing the dependent variable
+        mmap_mode : {None, 'r', 'r+', 'c'}
+            the mode in which the files are memory-mapped; None loads the data
+            into memory.  Default 'r'.
+
+        Returns
+        -------
+        ExplicitTrainingData :
+            training data with (memory-mapped) x and y
+        """
+        return cls(load_npy(x_filename, mmap_mode),
+                   load_npy(y_filename, mmap_mode))
+
+    def save_npy(self, x_filename, y_filename, column_major=False):
+        """Saves x and y to .npy files that can be memory-mapped
+
+        Parameters
+        ----------
+        x_filename : str
+            .npy file for the independent variable
+        y_filename : str
+            .npy file for the dependent variable
+        column_major : bool
+            Whether to store the data in column major order, which makes the
+            loading of the individual columns of x contiguous.  Default False.
+        """
+        save_npy(x_filename, self.x, column_major)
+        save_npy(y_filename, self.y, column_major)
 
     def __getitem__(self, items):
         """gets a subset of the ExplicitTrainingData
 
+        Contiguous, ascending indices result in views of the data rather than
+        copies.
+
         Parameters
         ----------
         items : list or int
@@ -93,9 +524,50 @@ class ExplicitTrainingData(TrainingData):
         ExplicitTrainingData :
                                 a Subset
         """
-        temp = ExplicitTrainingData(self.x[items, :], self.y[items, :])
+        items = as_contiguous_slice(items)
+        temp = ExplicitTrainingData(
+            self.x[items, :], self.y[items, :],
+            _subset_or_none(self.weights, items),
+            _subset_or_none(self.aggregated_squared_error, items))
         return temp
 
+    def compress(self, aggregate_y=True):
+        """Compresses duplicate rows into weighted unique rows
+
+        Parameters
+        ----------
+        aggregate_y : bool
+            Whether rows with identical x (but possibly different y) are
+            compressed into a single row with the mean of their y.  The
+            squared error metrics of the compressed data are identical to
+            those of the original data; the mean absolute error is measured
+            from the mean of y.  Otherwise only rows with identical x and y
+            are compressed, and all metrics are identical.  Default True.
+
+        Returns
+        -------
+        ExplicitTrainingData :
+            the unique rows (sorted) with their weights
+        """
+        weights = np.ones(len(self)) if self.weights is None \
+            else self.weights
+        keys = self.x if aggregate_y else np.hstack((self.x, self.y))
+        _, first_rows, inverse = np.unique(keys, axis=0, return_index=True,
+                                           return_inverse=True)
+        inverse = inverse.reshape(-1)
+        unique_weights = np.bincount(inverse, weights)
+        y_mean = np.zeros((len(first_rows), self.y.shape[1]))
+        np.add.at(y_mean, inverse, weights[:, None] * self.y)
+        y_mean /= unique_weights[:, None]
+
+        squared_deviations = weights * np.sum(
+            np.square(self.y - y_mean[inverse]), axis=1)
+        if self.aggregated_squared_error is not None:
+            squared_deviations += self.aggregated_squared_error
+        return ExplicitTrainingData(
+            self.x[first_rows], y_mean, unique_weights,
+            np.bincount(inverse, squared_deviations, len(first_rows)))
+
     def __len__(self):
         """ gets the length of the first dimension of the data
 
@@ -105,3 +577,9 @@ class ExplicitTrainingData(TrainingData):
               index-able size
         """
         return self.x.shape[0]
+
+
+def _subset_or_none(array, items):
+    if array is None:
+        return None
+    return np.atleast_1d(array[items])
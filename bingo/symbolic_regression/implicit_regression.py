@@ -11,16 +11,20 @@ two helper functions.
 """
 import warnings
 import logging
+from functools import lru_cache
 
 import numpy as np
+from scipy import ndimage
 
 from ..evaluation.fitness_function import VectorBasedFunction
-from ..evaluation.training_data import TrainingData
+from ..evaluation.gradient_mixin import VectorGradientMixin
+from ..evaluation.training_data import TrainingData, as_contiguous_slice, \
+    save_npy, load_npy
 
 LOGGER = logging.getLogger(__name__)
 
 
-class ImplicitRegression(VectorBasedFunction):
+class ImplicitRegression(VectorGradientMixin, VectorBasedFunction):
     """ Implicit Regression, version 2
 
     Fitness of this metric is related to the cos of angle between between
@@ -61,6 +65,54 @@ class ImplicitRegression(VectorBasedFunction):
         normalized_fitness[~np.isfinite(denominator)] = np.inf
         return normalized_fitness
 
+    def has_jacobian_for(self, individual):
+        return hasattr(individual,
+                       "evaluate_equation_with_mixed_derivative_at")
+
+    def get_fitness_vector_and_jacobian(self, individual):
+        """Fitness vector and its jacobian for implicit regression
+
+        The jacobian of the fitness vector with respect to the constants of
+        the individual follows from the mixed derivatives
+        :math:`d^2f(x)/dx_i dc_j`, which are calculated along with df_dx(x).
+
+        Parameters
+        ----------
+        individual : agraph
+            individual whose fitness is evaluated on `training_data`
+
+        Returns
+        -------
+        tuple(array of numeric of length M, MxL array of numeric)
+            the fitness vector and its derivatives with respect to the L
+            constants of the individual
+        """
+        self.eval_count += 1
+        _, df_dx, d2f_dxdc = \
+            individual.evaluate_equation_with_mixed_derivative_at(
+                x=self.training_data.x)
+        num_points = self.training_data.x.shape[0]
+
+        dot_product = self._do_dfdx_dot_dxdt(df_dx)
+
+        if self._required_params is not None:
+            if not self._enough_parameters_used(dot_product):
+                return np.full((num_points,), np.inf), \
+                       np.full((num_points, d2f_dxdc.shape[2]), np.nan)
+
+        dot_product_jacobian = self._do_dfdx_dot_dxdt_jacobian(df_dx,
+                                                               d2f_dxdc)
+        denominator = np.sum(np.abs(dot_product), axis=1)
+        normalized_fitness = np.sum(dot_product, axis=1) / denominator
+        denominator_jacobian = np.sum(
+            np.sign(dot_product)[:, :, None] * dot_product_jacobian, axis=1)
+        jacobian = (np.sum(dot_product_jacobian, axis=1) -
+                    normalized_fitness[:, None] * denominator_jacobian) / \
+            denominator[:, None]
+        normalized_fitness[~np.isfinite(denominator)] = np.inf
+        jacobian[~np.isfinite(denominator)] = np.nan
+        return normalized_fitness, jacobian
+
     def _enough_parameters_used(self, dot_product):
         n_params_used = (abs(dot_product) > 1e-16).sum(1)
         enough_params_used = np.any(n_params_used >= self._required_params)
@@ -74,6 +126,18 @@ class ImplicitRegression(VectorBasedFunction):
             right_dot = self._normalize_by_row(right_dot)
         return left_dot * right_dot
 
+    def _do_dfdx_dot_dxdt_jacobian(self, df_dx, d2f_dxdc):
+        left_dot_jacobian = d2f_dxdc
+        right_dot = self.training_data.dx_dt
+        if self._normalize_dot:
+            norm = np.linalg.norm(df_dx, axis=1).reshape((-1, 1, 1))
+            unit_df_dx = df_dx[:, :, None] / norm
+            left_dot_jacobian = \
+                (d2f_dxdc - unit_df_dx * np.sum(unit_df_dx * d2f_dxdc,
+                                                axis=1, keepdims=True)) / norm
+            right_dot = self._normalize_by_row(right_dot)
+        return left_dot_jacobian * right_dot[:, :, None]
+
     @staticmethod
     def _normalize_by_row(array):
         return array / np.linalg.norm(array, axis=1).reshape((-1, 1))
@@ -95,41 +159,57 @@ class ImplicitRegressionSchmidt(VectorBasedFunction):
     -----
     This may not be a correct implementation of this algorithm.  Importantly,
     it couldn't reproduce the  results in the papers.
+
+    The pairs of dimensions of x are evaluated for chunks of data points at a
+    time, such that at most about `CHUNK_SIZE` values (points x pairs) are
+    held in memory at once.
     """
+    CHUNK_SIZE = 2**20
+
     def evaluate_fitness_vector(self, individual):
         _, df_dx = individual.evaluate_equation_with_x_gradient_at(
             x=self.training_data.x)
+        dx_dt = self.training_data.dx_dt
+
+        num_points, num_parameters = self.training_data.x.shape
+        all_columns = np.arange(num_parameters)
+        chunk_size = max(1, self.CHUNK_SIZE // num_parameters**2)
+        fit = np.zeros((num_parameters, num_parameters))
+        for start in range(0, num_points, chunk_size):
+            rows = slice(start, start + chunk_size)
+            fit += np.sum(self._get_pair_differences(df_dx[rows], dx_dt[rows],
+                                                     all_columns), axis=0)
+        fit /= num_points
+
+        fit[all_columns, all_columns] = np.nan
+        fit[~(np.isfinite(fit) & (fit > 0))] = -np.inf
+        worst_pair = np.argmax(fit)
+        if not np.isfinite(fit.flat[worst_pair]):
+            return np.full((num_parameters, ), np.inf)
+        i, j = np.unravel_index(worst_pair, fit.shape)
+        return self._get_pair_differences(df_dx, dx_dt, [j])[:, i, 0]
 
-        num_parameters = self.training_data.x.shape[1]
-        worst_fitness = 0
-        diff_worst = np.full((num_parameters, ), np.inf)
-        for i in range(num_parameters):
-            for j in range(num_parameters):
-                if i != j:
-                    df_dxi = np.copy(df_dx[:, i])
-                    df_dxj = np.copy(df_dx[:, j])
-                    dxi_dxj_2 = (self.training_data.dx_dt[:, i] /
-                                 self.training_data.dx_dt[:, j])
-                    for k in range(num_parameters):
-                        if k not in (i, j):
-                            df_dxj += df_dx[:, k] * \
-                                      self.training_data.dx_dt[:, k] / \
-                                      self.training_data.dx_dt[:, j]
-
-                    dxi_dxj_1 = df_dxj / df_dxi
-                    diff = np.log(1. + np.abs(dxi_dxj_1 + dxi_dxj_2))
-                    fit = np.mean(diff)
-                    if np.isfinite(fit) and fit > worst_fitness:
-                        diff_worst = np.copy(diff)
-                        worst_fitness = fit
-        return diff_worst
+    @staticmethod
+    def _get_pair_differences(df_dx, dx_dt, columns):
+        # for each pair (i, j) with j in columns: df/dx_j plus the terms of
+        # all other k != i chained through dx_k/dx_j, divided by df/dx_i
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dx_dt_ratios = dx_dt[:, :, None] / dx_dt[:, None, columns]
+        dx_dt_ratios[:, columns, np.arange(len(columns))] = 0.
+        chained_df_dx = np.einsum("mk,mkj->mj", df_dx, dx_dt_ratios)
+        df_dxj = df_dx[:, None, columns] + chained_df_dx[:, None, :] \
+            - df_dx[:, :, None] * dx_dt_ratios
+        dxi_dxj_1 = df_dxj / df_dx[:, :, None]
+        return np.log(1. + np.abs(dxi_dxj_1 + dx_dt_ratios))
 
 
 class ImplicitTrainingData(TrainingData):
     """
     ImplicitTrainingData: Training data of this type contains an input array of
     data (x)  and its time derivative (dx_dt).  Both must be 2 dimensional
-    numpy arrays
+    numpy arrays.  They may also be memory maps of .npy files (see
+    `from_npy`), in which case contiguous subsets of the data are views rather
+    than copies.
 
     Parameters
     ----------
@@ -138,6 +218,11 @@ class ImplicitTrainingData(TrainingData):
      dx_dt : 2D numpy array
              (optional) time derivative of x.  If not is provided dx_dt is
              calculated from x.
+
+    Attributes
+    ----------
+     x_bounds : 2xD numpy array
+                bounds of each dimension of x
     """
     def __init__(self, x, dx_dt=None):
         if x.ndim == 1:
@@ -156,8 +241,50 @@ class ImplicitTrainingData(TrainingData):
         self.x = x
         self.dx_dt = dx_dt
 
+    @classmethod
+    def from_npy(cls, x_filename, dx_dt_filename, mmap_mode="r"):
+        """Creates ImplicitTrainingData backed by .npy files
+
+        Parameters
+        ----------
+         x_filename : str
+                      .npy file containing the independent variable
+         dx_dt_filename : str
+                          .npy file containing the time derivative of x
+         mmap_mode : {None, 'r', 'r+', 'c'}
+                     the mode in which the files are memory-mapped; None
+                     loads the data into memory.  Default 'r'.
+
+        Returns
+        -------
+         ImplicitTrainingData :
+                                training data with (memory-mapped) x and dx_dt
+        """
+        return cls(load_npy(x_filename, mmap_mode),
+                   load_npy(dx_dt_filename, mmap_mode))
+
+    def save_npy(self, x_filename, dx_dt_filename, column_major=False):
+        """Saves x and dx_dt to .npy files that can be memory-mapped
+
+        Parameters
+        ----------
+         x_filename : str
+                      .npy file for the independent variable
+         dx_dt_filename : str
+                          .npy file for the time derivative of x
+         column_major : bool
+                        Whether to store the data in column major order, which
+                        makes the loading of the individual columns of x
+                        contiguous.  Default False.
+        """
+        save_npy(x_filename, self.x, column_major)
+        save_npy(dx_dt_filename, self.dx_dt, column_major)
+
     def __getitem__(self, items):
-        """gets a subset of the ExplicitTrainingData
+        """gets a subset of the ImplicitTrainingData
+
+        Contiguous, ascending indices result in views of the data rather than
+        copies.
 
         Parameters
         ----------
@@ -166,9 +293,10 @@ class ImplicitTrainingData(TrainingData):
 
         Returns
         -------
-         ExplicitTrainingData :
+         ImplicitTrainingData :
                                 a subset
         """
+        items = as_contiguous_slice(items)
         temp = ImplicitTrainingData(self.x[items, :], self.dx_dt[items, :])
         return temp
 
@@ -198,33 +326,31 @@ def calculate_partials(X):
     2d numpy array :
         updated X array and corresponding time derivatives
     """
-    # find splits
-    break_points = np.where(np.any(np.isnan(X), 1))[0].tolist()
-    break_points.append(X.shape[0])
-
-    start = 0
-    for end in break_points:
-        x_seg = np.copy(X[start:end, :])
-        # calculate time derivs using filter
-        time_deriv = np.empty(x_seg.shape)
-        for i in range(x_seg.shape[1]):
-            time_deriv[:, i] = savitzky_golay_gram(x_seg[:, i], 7, 3, 1)
-        # remove edge effects
-        time_deriv = time_deriv[3:-4, :]
-        x_seg = x_seg[3:-4, :]
-
-        if start == 0:
-            x_all = np.copy(x_seg)
-            time_deriv_all = np.copy(time_deriv)
-            inds_all = np.arange(start + 3, end - 4)
-        else:
-            x_all = np.vstack((x_all, np.copy(x_seg)))
-            time_deriv_all = np.vstack((time_deriv_all,
-                                        np.copy(time_deriv)))
+    window_size = 7
+    edge_size = window_size // 2
 
-            inds_all = np.hstack((inds_all,
-                                  np.arange(start + 3, end - 4)))
-        start = end + 1
+    # find splits
+    break_points = np.where(np.any(np.isnan(X), 1))[0]
+    starts = np.r_[0, break_points + 1]
+    ends = np.r_[break_points, X.shape[0]]
+    keep = ends - starts >= window_size
+    starts, ends = starts[keep], ends[keep]
+
+    # remove edge effects (the first 3 and last 4 points of each segment)
+    inds_all = np.concatenate(
+        [np.arange(start + edge_size, end - edge_size - 1)
+         for start, end in zip(starts, ends)] + [np.empty(0, dtype=int)])
+    x_all = X[inds_all]
+    time_deriv_all = np.empty(x_all.shape)
+
+    # calculate time derivs using filter
+    row = 0
+    for start, end in zip(starts, ends):
+        num_rows = end - start - window_size
+        time_deriv = savitzky_golay_gram(X[start:end], window_size, 3, 1)
+        time_deriv_all[row:row + num_rows] = \
+            time_deriv[edge_size:-edge_size - 1]
+        row += num_rows
 
     return x_all, time_deriv_all, inds_all
 
@@ -248,8 +374,8 @@ def savitzky_golay_gram(y, window_size, order, deriv=0):
 
     Parameters
     ----------
-     y : array_like, shape (N,)
-         the values of the time history of the signal.
+     y : array_like, shape (N,) or (N, C)
+         the values of the time history of the signal (or of C signals).
      window_size : int
                    the length of the window. Must be an odd integer number.
      order : int
@@ -261,84 +387,89 @@ def savitzky_golay_gram(y, window_size, order, deriv=0):
 
     Returns
     -------
-     ys : ndarray, shape (N)
+     ys : ndarray, shape (N) or (N, C)
           the smoothed signal (or it's n-th derivative).
 
+    Notes
+    -----
+    The filter weights are calculated once for each combination of
+    `window_size`, `order` and `deriv`.
+
     References
     ----------
     .. [3] P.A. Gorry, General Least-Squares Smoothing and Differentiation by
        the Convolution (Savitzky-Golay) Method. Analytical Chemistry, 1990, 62,
        pp 570-573
     """
-    n_order = order
-    m_half_filter_size = np.int((window_size - 1) / 2)  # 2m + 1 = filter size
-    s_derivative_order = deriv
-
-    def generalized_factorial(a, b):
-        """Generalized factorial"""
-        g_f = 1
-        for j in range(a - b + 1, a + 1):
-            g_f *= j
-        return g_f
-
-    def gram_polynomial(gp_i, gp_m, gp_k, gp_s):
-        """
-        Calculates the Gram Polynomial (gp_s=0) or its gp_s'th derivative
-        evaluated at gp_i, order gp_k, over 2gp_m+1 points
-        """
-        if gp_k > 0:
-            gram_poly = (4. * gp_k - 2.) / (gp_k * (2. * gp_m - gp_k + 1.)) * \
-                        (gp_i * gram_polynomial(gp_i, gp_m, gp_k - 1, gp_s) +
-                         gp_s * gram_polynomial(gp_i, gp_m, gp_k - 1,
-                                                gp_s - 1)) - \
-                        ((gp_k - 1.) * (2. * gp_m + gp_k)) / \
-                        (gp_k * (2. * gp_m - gp_k + 1.)) * \
-                        gram_polynomial(gp_i, gp_m, gp_k - 2, gp_s)
+    m_half_filter_size = (window_size - 1) // 2  # 2m + 1 = filter size
+    weights = _savitzky_golay_weights(m_half_filter_size, order, deriv)
+    y = np.asarray(y, dtype=float)
+    filter_size = 2 * m_half_filter_size + 1
+
+    # windows centered at the interior points use the central weights; the
+    # first and last m points use the first and last windows with shifted
+    # weights
+    f = ndimage.correlate1d(y, weights[:, m_half_filter_size], axis=0)
+    f[:m_half_filter_size] = \
+        weights[:, :m_half_filter_size].T.dot(y[:filter_size])
+    f[len(y) - m_half_filter_size:] = \
+        weights[:, m_half_filter_size + 1:].T.dot(y[-filter_size:])
+    return f
 
-        else:
-            if gp_k == 0 and gp_s == 0:
-                gram_poly = 1.
-            else:
-                gram_poly = 0.
-        return gram_poly
 
-    def gram_weight(gw_i, gw_t, gw_m, gw_n, gw_s):
-        """
-        Calculate the weight og the gw_i'th data point for the gw_t'th
-        Least-Square point of the gw_s'th derivative over 2gw_m+1 points,
-        order gw_n
-        """
-        weight = 0
-        for k in range(gw_n + 1):
-            weight += (2. * k + 1.) * generalized_factorial(2 * gw_m, k) / \
-                      generalized_factorial(2 * gw_m + k + 1, k + 1) * \
-                      gram_polynomial(gw_i, gw_m, k, 0) * \
-                      gram_polynomial(gw_t, gw_m, k, gw_s)
-        return weight
-
-    # fill weights
-    weights = np.empty((2 * m_half_filter_size + 1, 2 * m_half_filter_size + 1))
+@lru_cache(maxsize=None)
+def _savitzky_golay_weights(m_half_filter_size, order, deriv):
+    weights = np.empty((2 * m_half_filter_size + 1,
+                        2 * m_half_filter_size + 1))
     for i in range(-m_half_filter_size, m_half_filter_size + 1):
         for t in range(-m_half_filter_size, m_half_filter_size + 1):
             weights[i + m_half_filter_size, t + m_half_filter_size] = \
-                gram_weight(i, t, m_half_filter_size, n_order,
-                            s_derivative_order)
-
-    # do convolution
-    y_len = len(y)
-    f = np.empty(y_len)
-    for i in range(y_len):
-        if i < m_half_filter_size:
-            y_center = m_half_filter_size
-            w_ind = i
-        elif y_len - i <= m_half_filter_size:
-            y_center = y_len - m_half_filter_size - 1
-            w_ind = 2 * m_half_filter_size + 1 - (y_len - i)
+                _gram_weight(i, t, m_half_filter_size, order, deriv)
+    weights.flags.writeable = False
+    return weights
+
+
+def _generalized_factorial(a, b):
+    """Generalized factorial"""
+    g_f = 1
+    for j in range(a - b + 1, a + 1):
+        g_f *= j
+    return g_f
+
+
+@lru_cache(maxsize=None)
+def _gram_polynomial(gp_i, gp_m, gp_k, gp_s):
+    """
+    Calculates the Gram Polynomial (gp_s=0) or its gp_s'th derivative
+    evaluated at gp_i, order gp_k, over 2gp_m+1 points
+    """
+    if gp_k > 0:
+        gram_poly = (4. * gp_k - 2.) / (gp_k * (2. * gp_m - gp_k + 1.)) * \
+                    (gp_i * _gram_polynomial(gp_i, gp_m, gp_k - 1, gp_s) +
+                     gp_s * _gram_polynomial(gp_i, gp_m, gp_k - 1,
+                                             gp_s - 1)) - \
+                    ((gp_k - 1.) * (2. * gp_m + gp_k)) / \
+                    (gp_k * (2. * gp_m - gp_k + 1.)) * \
+                    _gram_polynomial(gp_i, gp_m, gp_k - 2, gp_s)
+
+    else:
+        if gp_k == 0 and gp_s == 0:
+            gram_poly = 1.
         else:
-            y_center = i
-            w_ind = m_half_filter_size
-        f[i] = 0
-        for k in range(-m_half_filter_size, m_half_filter_size + 1):
-            f[i] += y[y_center + k] * weights[k + m_half_filter_size, w_ind]
+            gram_poly = 0.
+    return gram_poly
 
-    return f
+
+def _gram_weight(gw_i, gw_t, gw_m, gw_n, gw_s):
+    """
+    Calculate the weight og the gw_i'th data point for the gw_t'th
+    Least-Square point of the gw_s'th derivative over 2gw_m+1 points,
+    order gw_n
+    """
+    weight = 0
+    for k in range(gw_n + 1):
+        weight += (2. * k + 1.) * _generalized_factorial(2 * gw_m, k) / \
+                  _generalized_factorial(2 * gw_m + k + 1, k + 1) * \
+                  _gram_polynomial(gw_i, gw_m, k, 0) * \
+                  _gram_polynomial(gw_t, gw_m, k, gw_s)
+    return weight
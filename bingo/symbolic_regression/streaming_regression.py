@@ -0,0 +1,268 @@
+"""Streaming Explicit Symbolic Regression
+
+Streaming explicit symbolic regression is explicit symbolic regression on data
+that changes over time: new data points are appended to the training data
+and old data points are evicted from it, e.g., to keep a sliding window of
+the most recent data.
+
+The classes in this module are a training data container that supports these
+updates and a fitness function that keeps incremental error accumulators for
+the individuals it evaluates.  After an update of the training data, the
+fitness of a previously evaluated individual is updated by evaluating it only
+at the new data points rather than at all the data points in the window.
+"""
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from ..util.argument_validation import argument_validation
+from .explicit_regression import ExplicitRegression, ExplicitTrainingData
+
+_METRIC_NAMES = {"mean absolute error": "mae", "mae": "mae",
+                 "mean squared error": "mse", "mse": "mse",
+                 "root mean squared error": "rmse", "rmse": "rmse"}
+
+
+class StreamingExplicitTrainingData(ExplicitTrainingData):
+    """
+    StreamingExplicitTrainingData: Explicit training data to which data can be
+    appended and from which data can be evicted.
+
+    Parameters
+    ----------
+    x : 2D numpy array
+        independent variable
+    y : 2D numpy array
+        dependent variable
+    window_size : int
+        (Optional) The maximum number of data points.  When more points are
+        appended, the oldest points are evicted.  Default None, i.e.,
+        unlimited.
+
+    Attributes
+    ----------
+    x_bounds : 2xD numpy array
+        bounds of each dimension of x
+    num_evicted : int
+        The number of data points that have been evicted, i.e., the position
+        of the first current data point in the stream
+
+    Notes
+    -----
+    The data points are kept in buffers whose capacity grows geometrically,
+    and `x` and `y` are views of the current data points in the buffers, so
+    appending and evicting data points takes amortized O(new points) time.
+    Views obtained before an update are not changed by it.
+    """
+    GROWTH_FACTOR = 2
+
+    def __init__(self, x, y, window_size=None):
+        super().__init__(x, y)
+        self._window_size = window_size
+        self.num_evicted = 0
+        self._x_buffer = self.x
+        self._y_buffer = self.y
+        self._start = 0
+        self._evict_beyond_window()
+
+    def append(self, x, y):
+        """Appends data points, evicting the oldest beyond the window size
+
+        Parameters
+        ----------
+        x : 2D numpy array
+            independent variable of the new data points
+        y : 2D numpy array
+            dependent variable of the new data points
+        """
+        x = x.reshape((-1, self.x.shape[1]))
+        y = y.reshape((-1, self.y.shape[1]))
+        end = self._start + len(self)
+        if end + len(x) > len(self._x_buffer):
+            self._reallocate_buffers(len(self) + len(x))
+            end = len(self)
+        self._x_buffer[end:end + len(x)] = x
+        self._y_buffer[end:end + len(y)] = y
+        self._set_window(self._start, end + len(x))
+        self._evict_beyond_window()
+
+    @argument_validation(num_points={">=": 0})
+    def evict(self, num_points):
+        """Evicts the oldest data points
+
+        Parameters
+        ----------
+        num_points : int
+            The number of data points to evict
+        """
+        num_points = min(num_points, len(self))
+        self._set_window(self._start + num_points, self._start + len(self))
+        self.num_evicted += num_points
+
+    def _reallocate_buffers(self, num_points):
+        # new buffers (rather than moving the data within the old ones) keep
+        # previously obtained views of the data unchanged
+        capacity = self.GROWTH_FACTOR * num_points
+        if self._window_size is not None:
+            capacity = max(num_points,
+                           min(capacity, self.GROWTH_FACTOR *
+                               self._window_size))
+        x_buffer = np.empty((capacity, ) + self.x.shape[1:],
+                            dtype=np.result_type(self.x, float))
+        y_buffer = np.empty((capacity, ) + self.y.shape[1:],
+                            dtype=np.result_type(self.y, float))
+        x_buffer[:len(self)] = self.x
+        y_buffer[:len(self)] = self.y
+        self._x_buffer = x_buffer
+        self._y_buffer = y_buffer
+        self._start = 0
+
+    def _set_window(self, start, end):
+        self._start = start
+        self.x = self._x_buffer[start:end]
+        self.y = self._y_buffer[start:end]
+
+    def _evict_beyond_window(self):
+        if self._window_size is not None and len(self) > self._window_size:
+            self.evict(len(self) - self._window_size)
+
+
+class StreamingExplicitRegression(ExplicitRegression):
+    """Explicit regression with incremental evaluation of streaming data
+
+    The absolute and squared errors of the individuals that have been
+    evaluated are kept per data point in accumulators.  When the training data
+    is a `StreamingExplicitTrainingData`, an individual with an accumulator is
+    only evaluated at the data points that have been appended since its last
+    evaluation, and the errors of evicted points are dropped.  The fitness of
+    such an individual is updated in O(new points) rather than O(window).
+
+    Parameters
+    ----------
+    training_data : StreamingExplicitTrainingData
+        data that is used in fitness evaluation.
+    metric : str
+        String defining the measure of error to use. Available options are:
+        'mean absolute error', 'mean squared error', and
+        'root mean squared error'
+    cache_size : int
+        (Optional) The maximum number of equation structures (command arrays)
+        for which accumulators are kept.  The least recently evaluated are
+        discarded first.  Each accumulator stores two numbers per data point.
+        Default 256.
+
+    Notes
+    -----
+    Individuals are identified by their command arrays and constants.  Only
+    the accumulator of the most recently evaluated constants of each command
+    array is kept, so the intermediate constants of a local optimization
+    replace each other rather than displacing other individuals.  The
+    accumulators are discarded when the training data is replaced by another
+    `StreamingExplicitTrainingData`.  Other training data (e.g., subsets) are
+    evaluated without accumulators.
+    """
+    @argument_validation(cache_size={">": 0})
+    def __init__(self, training_data, metric="mae", cache_size=256):
+        super().__init__(training_data, metric)
+        self._metric_name = _METRIC_NAMES[metric]
+        self._cache_size = cache_size
+        self._accumulators = OrderedDict()
+        self._accumulated_data = None
+
+    def __call__(self, individual):
+        """Incremental fitness evaluation
+
+        Parameters
+        ----------
+        individual : agraph
+            individual whose fitness is evaluated on `training_data`
+
+        Returns
+        -------
+         :
+           fitness of the individual
+        """
+        if not isinstance(self.training_data, StreamingExplicitTrainingData):
+            return super().__call__(individual)
+        if self.training_data is not self._accumulated_data:
+            self._accumulators.clear()
+            self._accumulated_data = self.training_data
+
+        structure_key, constants_key = _individual_key(individual)
+        cached_constants_key, accumulator = \
+            self._accumulators.pop(structure_key, (None, None))
+        if accumulator is None or cached_constants_key != constants_key or \
+                accumulator.end < self.training_data.num_evicted:
+            accumulator = _ErrorAccumulator(self.training_data.num_evicted)
+        accumulator.evict_until(self.training_data.num_evicted)
+        self._evaluate_new_points(individual, accumulator)
+
+        self._accumulators[structure_key] = (constants_key, accumulator)
+        if len(self._accumulators) > self._cache_size:
+            self._accumulators.popitem(last=False)
+        return self._accumulated_metric(accumulator)
+
+    def _evaluate_new_points(self, individual, accumulator):
+        first_new_point = accumulator.end - self.training_data.num_evicted
+        if first_new_point >= len(self.training_data):
+            return
+        self.eval_count += 1
+        new_x = self.training_data.x[first_new_point:]
+        new_y = self.training_data.y[first_new_point:]
+        residual = individual.evaluate_equation_at(new_x) - new_y
+        accumulator.append(np.sum(np.abs(residual), axis=1),
+                           np.sum(np.square(residual), axis=1))
+
+    def _accumulated_metric(self, accumulator):
+        num_samples = accumulator.num_points * self.training_data.y.shape[1]
+        if self._metric_name == "mae":
+            return accumulator.absolute_error / num_samples
+        mse = accumulator.squared_error / num_samples
+        if self._metric_name == "mse":
+            return mse
+        return np.sqrt(mse)
+
+
+class _ErrorAccumulator:
+    """Per-point errors of an individual in chunks with their sums"""
+    def __init__(self, start):
+        self.start = start
+        self.end = start
+        self._chunks = deque()
+
+    @property
+    def num_points(self):
+        return self.end - self.start
+
+    @property
+    def absolute_error(self):
+        return sum(chunk[2] for chunk in self._chunks)
+
+    @property
+    def squared_error(self):
+        return sum(chunk[3] for chunk in self._chunks)
+
+    def append(self, absolute_errors, squared_errors):
+        self._chunks.append((absolute_errors, squared_errors,
+                             np.sum(absolute_errors),
+                             np.sum(squared_errors)))
+        self.end += len(absolute_errors)
+
+    def evict_until(self, start):
+        while self._chunks and self.start < start:
+            absolute_errors, squared_errors, _, _ = self._chunks.popleft()
+            num_evicted = min(start - self.start, len(absolute_errors))
+            self.start += num_evicted
+            if num_evicted < len(absolute_errors):
+                absolute_errors = absolute_errors[num_evicted:]
+                squared_errors = squared_errors[num_evicted:]
+                self._chunks.appendleft((absolute_errors, squared_errors,
+                                         np.sum(absolute_errors),
+                                         np.sum(squared_errors)))
+        self.start = max(self.start, start)
+        self.end = max(self.end, self.start)
+
+
+def _individual_key(individual):
+    return (np.asarray(individual.command_array).tobytes(),
+            np.asarray(individual.constants, dtype=float).tobytes())
@@ -6,6 +6,8 @@ import pytest
 import numpy as np
 
 from bingo.symbolic_regression.agraph import agraph, backend as py_backend
+from bingo.symbolic_regression.explicit_regression import \
+    ExplicitRegression, ExplicitTrainingData
 try:
     from bingocpp.build import bingocpp as bingocpp
     cpp_agraph = bingocpp.AGraph()
@@ -20,6 +22,9 @@ agraph.Backend = py_backend
 EVALUATE = "bingo.symbolic_regression.agraph.agraph.Backend.evaluate"
 EVALUATE_WTIH_DERIV = ("bingo.symbolic_regression.agraph.agraph.Backend."
                        "evaluate_with_derivative")
+EVALUATE_WTIH_DERIV_AT_CONSTANT_SETS = (
+    "bingo.symbolic_regression.agraph.agraph.PythonBackend."
+    "evaluate_with_derivative_at_constant_sets")
 
 
 @pytest.fixture
@@ -383,9 +388,12 @@ def test_evaluate_gradient_overflow_exception(mocker,
     mocker.patch(EVALUATE_WTIH_DERIV)
     agraph.Backend.evaluate_with_derivative.side_effect = OverflowError
 
-    values = sample_agraph_1.evaluate_equation_with_x_gradient_at(
+    f_of_x, df_dx = sample_agraph_1.evaluate_equation_with_x_gradient_at(
         sample_agraph_1_values.x)
-    assert np.isnan(values).all()
+    assert f_of_x.shape == (sample_agraph_1_values.x.shape[0], 1)
+    assert df_dx.shape == sample_agraph_1_values.x.shape
+    assert np.isnan(f_of_x).all()
+    assert np.isnan(df_dx).all()
 
 
 def test_evaluate_local_opt_gradient_overflow_exception(mocker,
@@ -399,6 +407,96 @@ def test_evaluate_local_opt_gradient_overflow_exception(mocker,
     assert np.isnan(values).all()
 
 
+@pytest.mark.parametrize("early_abort", [True, False])
+def test_nan_evaluation_shapes_do_not_depend_on_early_abort(mocker, caplog,
+                                                            early_abort):
+    mocker.patch.object(py_backend, "EARLY_ABORT_ON_NAN", early_abort)
+    nan_graph = agraph.AGraph()
+    nan_graph.command_array = np.array([[0, 0, 0],
+                                        [8, 0, 0],
+                                        [8, 1, 1],
+                                        [8, 2, 2],
+                                        [6, 3, 3]])
+    x = np.full((5, 2), 10.0)
+    with caplog.at_level("DEBUG", logger=agraph.LOGGER.name):
+        f_of_x = nan_graph.evaluate_equation_at(x)
+        f_of_x_2, df_dx = nan_graph.evaluate_equation_with_x_gradient_at(x)
+    assert f_of_x.shape == (5, 1)
+    assert f_of_x_2.shape == (5, 1)
+    assert df_dx.shape == (5, 2)
+    assert np.isnan(f_of_x).all()
+    regression = ExplicitRegression(ExplicitTrainingData(x, np.ones((5, 1))))
+    assert regression.evaluate_fitness_vector(nan_graph).shape == (5,)
+    assert not [record for record in caplog.records
+                if record.levelname == "WARNING"]
+
+
+def test_evaluate_agraph_c_hessian(sample_agraph_1, sample_agraph_1_values):
+    f_of_x, df_dc, d2f_dc2 = \
+        sample_agraph_1.evaluate_equation_with_local_opt_hessian_at(
+            sample_agraph_1_values.x)
+    np.testing.assert_allclose(f_of_x, sample_agraph_1_values.f_of_x)
+    np.testing.assert_allclose(df_dc, sample_agraph_1_values.grad_c)
+    x_0 = sample_agraph_1_values.x[:, 0]
+    np.testing.assert_allclose(d2f_dc2[:, 0, 0], -np.sin(x_0 + 1.0))
+
+    _, _, d2f_dc2_v = sample_agraph_1.\
+        evaluate_equation_with_local_opt_hessian_vector_product_at(
+            sample_agraph_1_values.x, np.array([2.0]))
+    np.testing.assert_allclose(d2f_dc2_v, 2.0 * d2f_dc2[:, :, 0])
+
+
+def test_evaluate_agraph_at_constant_sets(sample_agraph_1,
+                                          sample_agraph_1_values):
+    constant_sets = np.array([[1.0], [2.0], [-0.5]])
+    f_of_x, df_dc = \
+        sample_agraph_1.evaluate_equation_with_local_opt_gradient_at_constant_sets(
+            sample_agraph_1_values.x, constant_sets)
+    np.testing.assert_allclose(
+        f_of_x, sample_agraph_1.evaluate_equation_at_constant_sets(
+            sample_agraph_1_values.x, constant_sets))
+    assert df_dc.shape == (sample_agraph_1_values.x.shape[0], 1, 3)
+    np.testing.assert_allclose(f_of_x[:, [0]], sample_agraph_1_values.f_of_x)
+    np.testing.assert_allclose(df_dc[:, :, 0], sample_agraph_1_values.grad_c)
+    for k, constants in enumerate(constant_sets):
+        sample_agraph_1.set_local_optimization_params(constants)
+        expected_f, expected_df_dc = \
+            sample_agraph_1.evaluate_equation_with_local_opt_gradient_at(
+                sample_agraph_1_values.x)
+        np.testing.assert_allclose(f_of_x[:, [k]], expected_f)
+        np.testing.assert_allclose(df_dc[:, :, k], expected_df_dc)
+
+
+def test_evaluate_at_constant_sets_overflow_exception(mocker,
+                                                      sample_agraph_1,
+                                                      sample_agraph_1_values):
+    mocker.patch(EVALUATE_WTIH_DERIV_AT_CONSTANT_SETS,
+                 side_effect=OverflowError)
+    f_of_x, df_dc = \
+        sample_agraph_1.evaluate_equation_with_local_opt_gradient_at_constant_sets(
+            sample_agraph_1_values.x, np.ones((4, 1)))
+    assert f_of_x.shape == (sample_agraph_1_values.x.shape[0], 4)
+    assert df_dc.shape == (sample_agraph_1_values.x.shape[0], 1, 4)
+    assert np.isnan(f_of_x).all()
+    assert np.isnan(df_dc).all()
+
+
+def test_evaluate_agraph_interval(sample_agraph_1):
+    x_bounds = np.array([[-1.0, 0.0], [-1.0, 1.0]])
+    np.testing.assert_allclose(
+        sample_agraph_1.evaluate_equation_interval(x_bounds), (1.0, 1.0))
+    np.testing.assert_allclose(
+        sample_agraph_1.evaluate_equation_interval(x_bounds, (-1.0, 0.0)),
+        (-2.0, np.sin(-1.0)))
+
+
+def test_evaluate_interval_of_agraph_needing_optimization(invalid_agraph):
+    x_bounds = np.array([[0.0], [1.0]])
+    np.testing.assert_allclose(
+        invalid_agraph.evaluate_equation_interval(x_bounds),
+        (-np.inf, np.inf))
+
+
 def test_distance_between_graphs(sample_agraph_1_list):
     assert sample_agraph_1_list.distance(sample_agraph_1_list) == 0
     other_agraph = sample_agraph_1_list.copy()
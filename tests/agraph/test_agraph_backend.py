@@ -197,3 +197,299 @@ def test_agraph_get_utilized_commands(backend, expected_stack_util):
 ])
 def test_agraph_backend_identifiers(the_backend, expected):
     assert the_backend.is_cpp() == expected
+
+
+@pytest.mark.parametrize("stack, expected_linear_constants", [
+    ([[1, 0, 0]], [0]),
+    ([[0, 0, 0], [1, 0, 0], [1, 1, 1], [6, 0, 0],   # c_0 + c_1 sin(X_0)
+      [4, 2, 3], [2, 1, 4]], [0, 1]),
+    ([[0, 0, 0], [1, 0, 0], [1, 1, 1], [2, 0, 2],   # c_0 / (X_0 + c_1) X_0
+      [5, 1, 3], [4, 4, 0]], [0]),
+    ([[0, 0, 0], [1, 0, 0], [1, 1, 1], [4, 1, 2],   # c_0 c_1 X_0
+      [4, 3, 0]], [0]),
+    ([[0, 0, 0], [1, 0, 0], [4, 1, 1]], []),        # c_0 c_0
+    ([[0, 0, 0], [1, 0, 0], [2, 0, 1], [2, 2, 2]],  # (X_0 + c_0)*2
+     []),
+    ([[0, 0, 0], [1, 0, 0], [4, 0, 1], [8, 2, 2],   # c_0 X_0 + exp(c_0 X_0)
+      [2, 2, 3]], []),
+])
+def test_get_linear_constants(stack, expected_linear_constants):
+    linear_constants = PythonBackend.get_linear_constants(np.array(stack))
+    assert linear_constants == expected_linear_constants
+
+
+@pytest.mark.parametrize("operator", range(13))
+def test_evaluate_at_constant_sets_matches_individual_evaluation(
+        sample_agraph_values, operator):
+    stack = np.array([[0, 0, 0],
+                      [1, 1, 1],
+                      [operator, 1, 0],
+                      [operator, 0, 1],
+                      [2, 2, 3]])
+    constant_sets = np.array([[10, 3.14], [0.5, -2.0], [1.0, 0.25]])
+    f_of_x, df_dc = PythonBackend.evaluate_with_derivative_at_constant_sets(
+        stack, sample_agraph_values.x, constant_sets, False)
+
+    assert f_of_x.shape == (11, 3)
+    assert df_dc.shape == (11, 2, 3)
+    np.testing.assert_array_equal(
+        f_of_x, PythonBackend.evaluate_at_constant_sets(
+            stack, sample_agraph_values.x, constant_sets))
+    for k, constants in enumerate(constant_sets):
+        expected_f, expected_df_dc = PythonBackend.evaluate_with_derivative(
+            stack, sample_agraph_values.x, constants, False)
+        np.testing.assert_allclose(f_of_x[:, k], expected_f[:, 0])
+        np.testing.assert_allclose(df_dc[:, :, k], expected_df_dc)
+
+
+def test_evaluate_with_x_derivative_at_constant_sets(sample_agraph_values):
+    stack = np.array([[0, 1, 1],
+                      [1, 0, 0],
+                      [4, 0, 1]])
+    constant_sets = np.array([[2.0], [3.0]])
+    f_of_x, df_dx = PythonBackend.evaluate_with_derivative_at_constant_sets(
+        stack, sample_agraph_values.x, constant_sets, True)
+    x_1 = sample_agraph_values.x[:, 1]
+    np.testing.assert_allclose(f_of_x, np.outer(x_1, [2.0, 3.0]))
+    assert df_dx.shape == (11, 2, 2)
+    np.testing.assert_allclose(df_dx[:, 0], 0.)
+    np.testing.assert_allclose(df_dx[:, 1], np.tile([2.0, 3.0], (11, 1)))
+
+
+@pytest.mark.parametrize("operator", range(2, 13))
+@pytest.mark.parametrize("x_bounds", [[[-1.0, 0.5], [0.0, 2.0]],
+                                      [[0.5, -3.0], [8.0, -1.0]],
+                                      [[-20.0, 0.0], [-5.0, 0.0]]])
+def test_evaluate_interval_contains_evaluations(operator, x_bounds):
+    stack = np.array([[0, 0, 0],
+                      [1, 0, 0],
+                      [0, 1, 1],
+                      [operator, 0, 1],
+                      [operator, 3, 2],
+                      [operator, 2, 4]])
+    x_bounds = np.array(x_bounds)
+    constant_bounds = np.array([[-0.5], [1.5]])
+    lower, upper = PythonBackend.evaluate_interval(stack, x_bounds,
+                                                   constant_bounds)
+
+    np.random.seed(0)
+    x = np.random.uniform(x_bounds[0], x_bounds[1], (200, 2))
+    x[:4] = [x_bounds[0], x_bounds[1], x_bounds[[0, 1], [0, 1]],
+             x_bounds[[1, 0], [0, 1]]]
+    for constant in [-0.5, 0.0, 1.5, 0.3]:
+        f_of_x = PythonBackend.evaluate(stack, x, [constant])
+        f_of_x = f_of_x[~np.isnan(f_of_x)]
+        assert np.all(f_of_x >= lower)
+        assert np.all(f_of_x <= upper)
+
+
+@pytest.mark.parametrize("stack, expected_interval", [
+    ([[0, 0, 0], [8, 0, 0], [8, 1, 1], [8, 2, 2]], (np.inf, np.inf)),
+    ([[0, 0, 0], [8, 0, 0], [8, 1, 1], [8, 2, 2], [6, 3, 3]],
+     (np.nan, np.nan)),
+    ([[0, 0, 0], [8, 0, 0], [8, 1, 1], [8, 2, 2], [6, 3, 3], [10, 0, 4]],
+     (0., np.inf)),
+    ([[0, 0, 0], [8, 0, 0], [5, 0, 1]], (7 / np.exp(10), 10 / np.exp(7))),
+    ([[0, 0, 0], [1, 0, 0], [4, 0, 1]], (-np.inf, np.inf)),
+])
+def test_evaluate_interval_of_doomed_stacks(stack, expected_interval):
+    x_bounds = np.array([[7.0], [10.0]])
+    constant_bounds = np.array([[-np.inf], [np.inf]])
+    interval = PythonBackend.evaluate_interval(np.array(stack), x_bounds,
+                                               constant_bounds)
+    np.testing.assert_allclose(interval, expected_interval)
+
+
+def test_constant_only_commands_are_not_broadcast(sample_agraph_values):
+    stack = np.array([[1, 0, 0],  # c_0 * exp(c_1 + c_0) * x_0
+                      [1, 1, 1],
+                      [2, 1, 0],
+                      [8, 2, 2],
+                      [4, 0, 3],
+                      [0, 0, 0],
+                      [4, 4, 5]])
+    constants = [0.5, -1.0]
+    forward_eval = PythonBackend._forward_eval(stack, sample_agraph_values.x,
+                                               constants)
+    assert all(np.ndim(value) == 0 for value in forward_eval[:5])
+    assert np.shape(forward_eval[-1]) == (11, )
+
+    f_of_x, df_dc = PythonBackend.evaluate_with_derivative(
+        stack, sample_agraph_values.x, constants, False)
+    x_0 = sample_agraph_values.x[:, [0]]
+    np.testing.assert_allclose(f_of_x, 0.5 * np.exp(-0.5) * x_0)
+    np.testing.assert_allclose(df_dc, np.hstack([1.5 * np.exp(-0.5) * x_0,
+                                                 0.5 * np.exp(-0.5) * x_0]))
+
+
+def test_evaluate_constant_only_stack(sample_agraph_values):
+    stack = np.array([[1, 0, 0],
+                      [8, 0, 0]])
+    f_of_x, df_dc = PythonBackend.evaluate_with_derivative(
+        stack, sample_agraph_values.x, [1.0], False)
+    np.testing.assert_allclose(f_of_x, np.full((11, 1), np.e))
+    np.testing.assert_allclose(df_dc, np.full((11, 1), np.e))
+
+
+@pytest.mark.parametrize("evaluation", [
+    lambda stack, x: PythonBackend.evaluate(stack, x, [1.0]),
+    lambda stack, x: PythonBackend.simplify_and_evaluate(stack, x, [1.0]),
+    lambda stack, x: PythonBackend.evaluate_with_derivative(stack, x, [1.0],
+                                                            True),
+    lambda stack, x: PythonBackend.evaluate_with_hessian(stack, x, [1.0]),
+])
+def test_evaluation_aborts_on_nan_commands(mocker, evaluation):
+    stack = np.array([[0, 0, 0],
+                      [8, 0, 0],
+                      [8, 1, 1],
+                      [8, 2, 2],
+                      [6, 3, 3],
+                      [1, 0, 0],
+                      [4, 4, 5],
+                      [2, 6, 0]])
+    x = np.full((5, 1), 10.0)
+    forward_eval_spy = mocker.spy(PythonBackend.Nodes,
+                                  "forward_eval_function")
+    with pytest.raises(PythonBackend.NonFiniteEvaluationError):
+        evaluation(stack, x)
+    assert forward_eval_spy.call_count == 5
+
+
+@pytest.mark.parametrize("stack", [
+    [[0, 0, 0], [8, 0, 0], [8, 1, 1], [8, 2, 2], [6, 3, 3], [3, 0, 0],
+     [10, 4, 5]],
+    [[0, 0, 0], [8, 0, 0], [8, 1, 1], [8, 2, 2], [6, 3, 3], [1, 0, 0],
+     [4, 5, 0]],
+])
+def test_evaluation_does_not_abort_if_nan_may_not_reach_result(stack):
+    x = np.full((5, 1), 10.0)
+    f_of_x = PythonBackend.evaluate(np.array(stack), x, [1.0])
+    assert np.all(np.isfinite(f_of_x))
+
+
+def test_early_abort_on_nan_can_be_disabled(mocker):
+    mocker.patch.object(PythonBackend, "EARLY_ABORT_ON_NAN", False)
+    stack = np.array([[0, 0, 0],
+                      [8, 0, 0],
+                      [8, 1, 1],
+                      [6, 2, 2]])
+    f_of_x = PythonBackend.evaluate(stack, np.full((5, 1), 10.0), [])
+    assert np.all(np.isnan(f_of_x))
+
+
+@pytest.mark.parametrize("operator", range(2, 13))
+@pytest.mark.parametrize("wrt_param_x_or_c", [True, False])
+def test_forward_and_reverse_mode_derivatives_match(
+        mocker, sample_agraph_values, operator, wrt_param_x_or_c):
+    stack = np.array([[0, 0, 0],
+                      [1, 0, 0],
+                      [1, 1, 1],
+                      [0, 1, 1],
+                      [operator, 1, 2],
+                      [operator, 3, 0],
+                      [4, 4, 5],
+                      [operator, 6, 1],
+                      [2, 7, 4]])
+    x = sample_agraph_values.x
+    constants = np.array([1.3, 0.7])
+    forward_spy = mocker.spy(PythonBackend, "_forward_derivative_eval")
+
+    mocker.patch.object(PythonBackend, "FORWARD_MODE_MAX_DIRECTIONS", 2)
+    forward_f, forward_deriv = PythonBackend.evaluate_with_derivative(
+        stack, x, constants, wrt_param_x_or_c)
+    assert forward_spy.call_count == 1
+
+    mocker.patch.object(PythonBackend, "FORWARD_MODE_MAX_DIRECTIONS", 0)
+    reverse_f, reverse_deriv = PythonBackend.evaluate_with_derivative(
+        stack, x, constants, wrt_param_x_or_c)
+    assert forward_spy.call_count == 1
+
+    np.testing.assert_array_equal(forward_f, reverse_f)
+    np.testing.assert_allclose(forward_deriv, reverse_deriv)
+
+
+@pytest.mark.parametrize("num_directions, stack_size, expected_forward",
+                         [(1, 10, True), (4, 32, True), (5, 10, False),
+                          (2, 33, False)])
+def test_derivative_mode_depends_on_directions_and_stack_size(
+        mocker, num_directions, stack_size, expected_forward):
+    mocker.patch.object(PythonBackend, "FORWARD_MODE_MAX_DIRECTIONS", 4)
+    mocker.patch.object(PythonBackend, "FORWARD_MODE_MAX_STACK_SIZE", 32)
+    stack = np.array([[0, 0, 0]] + [[2, 0, 0]] * (stack_size - 1))
+    x = np.ones((5, num_directions))
+    forward_spy = mocker.spy(PythonBackend, "_forward_derivative_eval")
+    _ = PythonBackend.evaluate_with_derivative(stack, x, np.array([]), True)
+    assert (forward_spy.call_count == 1) == expected_forward
+
+
+@pytest.mark.parametrize("operator", range(2, 13))
+def test_evaluate_with_hessian(sample_agraph_values, operator):
+    stack = np.array([[0, 0, 0],
+                      [1, 0, 0],
+                      [1, 1, 1],
+                      [0, 1, 1],
+                      [operator, 1, 2],
+                      [operator, 2, 3],
+                      [4, 4, 5],
+                      [operator, 6, 1],
+                      [2, 7, 4]])
+    x = sample_agraph_values.x + 0.05
+    constants = np.array([1.3, 0.7])
+    f_of_x, df_dc, d2f_dc2 = PythonBackend.evaluate_with_hessian(
+        stack, x, constants)
+
+    expected_f, expected_df_dc = PythonBackend.evaluate_with_derivative(
+        stack, x, constants, False)
+    np.testing.assert_allclose(f_of_x, expected_f)
+    np.testing.assert_allclose(df_dc, expected_df_dc)
+    assert d2f_dc2.shape == (11, 2, 2)
+    np.testing.assert_allclose(d2f_dc2, np.transpose(d2f_dc2, (0, 2, 1)),
+                               atol=1e-12)
+    for i in range(2):
+        delta = np.zeros(2)
+        delta[i] = 1e-6
+        _, df_dc_plus = PythonBackend.evaluate_with_derivative(
+            stack, x, constants + delta, False)
+        _, df_dc_minus = PythonBackend.evaluate_with_derivative(
+            stack, x, constants - delta, False)
+        np.testing.assert_allclose(d2f_dc2[:, :, i],
+                                   (df_dc_plus - df_dc_minus) / 2e-6,
+                                   rtol=1e-4, atol=1e-5)
+
+    vector = np.array([0.3, -1.2])
+    _, _, hessian_vector_product = \
+        PythonBackend.evaluate_with_hessian_vector_product(stack, x,
+                                                           constants, vector)
+    np.testing.assert_allclose(hessian_vector_product, d2f_dc2.dot(vector))
+
+
+def test_evaluate_with_mixed_derivative(sample_agraph_values):
+    stack = np.array([[0, 0, 0],  # c_0 sin(c_1 X_0 X_1) / X_1
+                      [0, 1, 1],
+                      [1, 0, 0],
+                      [1, 1, 1],
+                      [4, 0, 1],
+                      [4, 3, 4],
+                      [6, 5, 5],
+                      [4, 2, 6],
+                      [5, 7, 1]])
+    x = sample_agraph_values.x + 0.05
+    constants = np.array([1.3, 0.7])
+    f_of_x, df_dx, d2f_dxdc = PythonBackend.evaluate_with_mixed_derivative(
+        stack, x, constants)
+
+    expected_f, expected_df_dx = PythonBackend.evaluate_with_derivative(
+        stack, x, constants, True)
+    np.testing.assert_allclose(f_of_x, expected_f)
+    np.testing.assert_allclose(df_dx, expected_df_dx)
+    assert d2f_dxdc.shape == (11, 2, 2)
+    for i in range(2):
+        delta = np.zeros(2)
+        delta[i] = 1e-6
+        _, df_dx_plus = PythonBackend.evaluate_with_derivative(
+            stack, x, constants + delta, True)
+        _, df_dx_minus = PythonBackend.evaluate_with_derivative(
+            stack, x, constants - delta, True)
+        np.testing.assert_allclose(d2f_dxdc[:, :, i],
+                                   (df_dx_plus - df_dx_minus) / 2e-6,
+                                   rtol=1e-4, atol=1e-6)
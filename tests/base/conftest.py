@@ -9,6 +9,7 @@ from bingo.variation.variation import Variation
 from bingo.evaluation.evaluation import Evaluation
 from bingo.selection.selection import Selection
 from bingo.evaluation.fitness_function import FitnessFunction
+from bingo.symbolic_regression.agraph.agraph import AGraph
 
 
 @pytest.fixture
@@ -80,3 +81,17 @@ def onemax_fitness():
 @pytest.fixture
 def onemax_evaluator(onemax_fitness):
     return Evaluation(onemax_fitness)
+
+
+@pytest.fixture
+def unit_interval_x():
+    return np.linspace(-1, 1, 20).reshape((-1, 1))
+
+
+@pytest.fixture
+def make_agraph():
+    def _make_agraph(command_array):
+        agraph = AGraph()
+        agraph.command_array = np.array(command_array, dtype=int)
+        return agraph
+    return _make_agraph
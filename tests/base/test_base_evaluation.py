@@ -2,8 +2,12 @@
 # pylint: disable=redefined-outer-name
 # pylint: disable=missing-docstring
 import pytest
+import numpy as np
 
 from bingo.evaluation.evaluation import Evaluation
+from bingo.symbolic_regression.agraph.agraph import AGraph
+from bingo.symbolic_regression.explicit_regression \
+    import ExplicitRegression, ExplicitTrainingData
 from SingleValue import SingleValueFitnessFunction
 
 
@@ -39,3 +43,43 @@ def test_setting_eval_count(single_value_population_of_4, fitness_function):
     assert evaluation.eval_count == -4
     evaluation(single_value_population_of_4)
     assert evaluation.eval_count == 0
+
+
+class DuckTypedFitnessFunction(SingleValueFitnessFunction):
+    def optimize_population(self, population):
+        raise AssertionError("not a PopulationOptimizationMixin")
+
+
+def test_evaluation_optimizes_only_population_optimization_mixins(
+        single_value_population_of_4):
+    evaluation = Evaluation(DuckTypedFitnessFunction())
+    evaluation(single_value_population_of_4)
+    assert evaluation.eval_count == 4
+
+
+@pytest.fixture
+def agraph_population():
+    overflowing = AGraph()
+    overflowing.command_array = np.array([[0, 0, 0],
+                                          [8, 0, 0],
+                                          [8, 1, 1],
+                                          [8, 2, 2]])
+    valid = AGraph()
+    valid.command_array = np.array([[0, 0, 0],
+                                    [1, 0, 0],
+                                    [4, 0, 1]])
+    valid.set_local_optimization_params([2.0])
+    return [overflowing, valid]
+
+
+@pytest.mark.parametrize("interval_prescreening", [True, False])
+def test_evaluation_interval_prescreening(agraph_population,
+                                          interval_prescreening):
+    x = np.linspace(7, 10, 10).reshape((-1, 1))
+    fitness_function = ExplicitRegression(ExplicitTrainingData(x, 2 * x))
+    evaluation = Evaluation(fitness_function, interval_prescreening)
+    evaluation(agraph_population)
+
+    assert evaluation.eval_count == 1 if interval_prescreening else 2
+    assert not np.isfinite(agraph_population[0].fitness)
+    assert agraph_population[1].fitness == pytest.approx(0.)
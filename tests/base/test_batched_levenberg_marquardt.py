@@ -0,0 +1,96 @@
+# Ignoring some linting rules in tests
+# pylint: disable=redefined-outer-name
+# pylint: disable=missing-docstring
+import pytest
+import numpy as np
+
+from bingo.evaluation.evaluation import Evaluation
+from bingo.local_optimizers.batched_levenberg_marquardt \
+    import BatchedLevenbergMarquardt
+from bingo.symbolic_regression.explicit_regression \
+    import ExplicitRegression, ExplicitTrainingData
+
+
+@pytest.fixture
+def quadratic_regression(unit_interval_x):
+    x = unit_interval_x
+    y = 1.5 + 2.0 * x + 2.0 * x ** 2
+    return ExplicitRegression(ExplicitTrainingData(x, y), metric="mse")
+
+
+@pytest.fixture
+def population(make_agraph):
+    full_quadratic = make_agraph([[1, 0, 0],
+                                  [0, 0, 0],
+                                  [1, 1, 1],
+                                  [4, 1, 2],
+                                  [4, 1, 3],
+                                  [1, 2, 2],
+                                  [4, 5, 1],
+                                  [2, 0, 6],
+                                  [2, 7, 4]])
+    scaled_square = make_agraph([[0, 0, 0],
+                                 [4, 0, 0],
+                                 [1, 0, 0],
+                                 [4, 2, 1]])
+    no_constants = make_agraph([[0, 0, 0],
+                                [4, 0, 0]])
+    return [full_quadratic, scaled_square, no_constants]
+
+
+def test_requires_vector_gradient_fitness_function(mocker):
+    with pytest.raises(TypeError):
+        _ = BatchedLevenbergMarquardt(mocker.Mock())
+
+
+@pytest.mark.parametrize("param, illegal_value", [
+    ("max_iterations", 0),
+    ("tol", 0.)
+])
+def test_raises_error_on_invalid_parameters(quadratic_regression, param,
+                                            illegal_value):
+    kwargs = {param: illegal_value}
+    with pytest.raises(ValueError):
+        _ = BatchedLevenbergMarquardt(quadratic_regression, **kwargs)
+
+
+def test_optimize_population(quadratic_regression, population):
+    np.random.seed(0)
+    batched_lm = BatchedLevenbergMarquardt(quadratic_regression)
+    batched_lm.optimize_population(population)
+
+    full_quadratic, scaled_square, _ = population
+    assert not full_quadratic.needs_local_optimization()
+    assert not scaled_square.needs_local_optimization()
+    np.testing.assert_allclose(full_quadratic.constants, [1.5, 2.0, 2.0],
+                               rtol=1e-4)
+    assert batched_lm(full_quadratic) == pytest.approx(0., abs=1e-8)
+    assert batched_lm(scaled_square) < batched_lm(population[2])
+
+
+def test_evaluation_uses_population_optimization(mocker,
+                                                 quadratic_regression,
+                                                 population):
+    np.random.seed(0)
+    batched_lm = BatchedLevenbergMarquardt(quadratic_regression)
+    spy = mocker.spy(batched_lm, "optimize_population")
+    evaluation = Evaluation(batched_lm)
+    evaluation(population)
+
+    spy.assert_called_once_with(population)
+    assert population[0].fitness == pytest.approx(0., abs=1e-8)
+    for indv in population:
+        assert indv.fit_set
+
+
+def test_individual_call_optimizes(quadratic_regression, population):
+    np.random.seed(0)
+    batched_lm = BatchedLevenbergMarquardt(quadratic_regression)
+    assert batched_lm(population[0]) == pytest.approx(0., abs=1e-8)
+
+
+def test_pass_through_properties(quadratic_regression):
+    batched_lm = BatchedLevenbergMarquardt(quadratic_regression)
+    batched_lm.eval_count = 7
+    assert quadratic_regression.eval_count == 7
+    assert batched_lm.training_data is quadratic_regression.training_data
@@ -9,6 +9,11 @@ from bingo.evaluation.fitness_function \
 from bingo.local_optimizers.continuous_local_opt \
     import ContinuousLocalOptimization
 from bingo.chromosomes.multiple_floats import MultipleFloatChromosome
+from bingo.symbolic_regression.agraph.agraph import AGraph
+from bingo.symbolic_regression.implicit_regression \
+    import ImplicitRegression, ImplicitTrainingData
+from bingo.symbolic_regression.explicit_regression \
+    import ExplicitRegression, ExplicitTrainingData
 
 NUM_VALS = 10
 NUM_OPT = 3
@@ -96,6 +101,352 @@ def test_valid_fitness_function():
         ContinuousLocalOptimization(fitness_function, algorithm='lm')
 
 
+@pytest.fixture
+def linear_constants_regression(unit_interval_x):
+    x = unit_interval_x
+    y = 1.5 + 2.0 * (x + 0.5) * (x + 0.5)
+    return ExplicitRegression(ExplicitTrainingData(x, y), metric="mse")
+
+
+def test_lm_uses_fitness_vector_workspace(mocker, linear_constants_regression):
+    test_graph = AGraph()
+    test_graph.command_array = np.array([[0, 0, 0],  # c_0 + c_1 X_0
+                                         [1, 0, 0],
+                                         [1, 1, 1],
+                                         [4, 2, 0],
+                                         [2, 1, 3]])
+    workspace_spy = mocker.spy(linear_constants_regression,
+                               "evaluate_fitness_vector_in_workspace")
+    vector_spy = mocker.spy(linear_constants_regression,
+                            "evaluate_fitness_vector")
+    np.random.seed(0)
+    local_opt_fitness_function = ContinuousLocalOptimization(
+        linear_constants_regression, "lm")
+    fitness = local_opt_fitness_function(test_graph)
+    assert fitness < 1.
+    assert workspace_spy.call_count > 1
+    assert vector_spy.call_count == 0
+
+
+def test_optimize_with_variable_projection(linear_constants_regression):
+    test_graph = AGraph()
+    test_graph.command_array = np.array([[0, 0, 0],  # c_0 + c_1 (X_0 + c_2)^2
+                                         [1, 0, 0],
+                                         [1, 1, 1],
+                                         [1, 2, 2],
+                                         [2, 0, 3],
+                                         [4, 4, 4],
+                                         [4, 2, 5],
+                                         [2, 1, 6]])
+    np.random.seed(0)
+    local_opt_fitness_function = ContinuousLocalOptimization(
+        linear_constants_regression, "lm", variable_projection=True)
+    fitness = local_opt_fitness_function(test_graph)
+    assert fitness == pytest.approx(0., abs=1e-10)
+    np.testing.assert_allclose(test_graph.constants, [1.5, 2.0, 0.5])
+
+
+def test_variable_projection_solves_all_linear_constants(
+        linear_constants_regression):
+    test_graph = AGraph()
+    test_graph.command_array = np.array([[0, 0, 0],  # c_0 + c_1 X_0 X_0
+                                         [1, 0, 0],
+                                         [1, 1, 1],
+                                         [4, 0, 0],
+                                         [4, 2, 3],
+                                         [2, 1, 4]])
+    local_opt_fitness_function = ContinuousLocalOptimization(
+        linear_constants_regression, "lm", variable_projection=True)
+    fitness = local_opt_fitness_function(test_graph)
+    assert fitness > 0.
+    np.testing.assert_allclose(test_graph.constants, [2.0, 2.0])
+    assert linear_constants_regression.eval_count == 2
+
+
+def test_variable_projection_requires_jacobian():
+    fitness_function = FloatVectorFitnessFunction()
+    with pytest.raises(TypeError):
+        ContinuousLocalOptimization(fitness_function, algorithm='lm',
+                                    variable_projection=True)
+
+
+@pytest.mark.parametrize("algorithm", ["lm", "Nelder-Mead"])
+def test_max_evals_truncates_optimization(algorithm):
+    fitness_function = FloatVectorFitnessFunction()
+    local_opt_fitness_function = ContinuousLocalOptimization(
+        fitness_function, algorithm, max_evals=3)
+    for _ in range(2):
+        individual = MultipleFloatChromosome([1. for _ in range(NUM_VALS)],
+                                             [1, 3, 4])
+        _ = local_opt_fitness_function(individual)
+    assert local_opt_fitness_function.local_opt_eval_count == 6
+    assert local_opt_fitness_function.truncated_count == 2
+    assert local_opt_fitness_function.abandoned_count == 0
+
+
+def test_max_time_truncates_optimization(mocker):
+    mocker.patch("bingo.local_optimizers.continuous_local_opt."
+                 "time.perf_counter", side_effect=range(100))
+    fitness_function = MultipleFloatValueFitnessFunction()
+    local_opt_fitness_function = ContinuousLocalOptimization(
+        fitness_function, "Nelder-Mead", max_time=4.5)
+    individual = MultipleFloatChromosome([1. for _ in range(NUM_VALS)],
+                                         [1, 3, 4])
+    _ = local_opt_fitness_function(individual)
+    assert local_opt_fitness_function.truncated_count == 1
+    assert local_opt_fitness_function.local_opt_eval_count == 5
+
+
+def test_early_abandonment_of_poor_optimizations():
+    fitness_function = MultipleFloatValueFitnessFunction()
+    local_opt_fitness_function = ContinuousLocalOptimization(
+        fitness_function, "Nelder-Mead", abandon_after_evals=5,
+        abandon_quantile=0.5)
+    for _ in range(ContinuousLocalOptimization.MIN_HISTORY_FOR_ABANDONMENT):
+        individual = MultipleFloatChromosome([1. for _ in range(NUM_VALS)],
+                                             [1, 3, 4])
+        _ = local_opt_fitness_function(individual)
+    assert local_opt_fitness_function.abandoned_count == 0
+
+    poor_individual = MultipleFloatChromosome(
+        [100. for _ in range(NUM_VALS)], [1, 3, 4])
+    fitness = local_opt_fitness_function(poor_individual)
+    assert local_opt_fitness_function.abandoned_count == 1
+    assert fitness > np.sqrt(NUM_VALS - NUM_OPT) * 100
+
+
+@pytest.mark.parametrize("algorithm", ["lm", "BFGS", "Nelder-Mead"])
+def test_skips_optimization_of_non_finite_start(algorithm):
+    x = np.linspace(5, 6, 20).reshape((-1, 1))
+    regression = ExplicitRegression(ExplicitTrainingData(x, x), metric="mse")
+    test_graph = AGraph()
+    test_graph.command_array = np.array([[0, 0, 0],  # c_0 sin(exp(exp(X_0)))
+                                         [8, 0, 0],
+                                         [8, 1, 1],
+                                         [8, 2, 2],
+                                         [6, 3, 3],
+                                         [1, 0, 0],
+                                         [4, 4, 5]])
+    local_opt_fitness_function = ContinuousLocalOptimization(regression,
+                                                             algorithm)
+    fitness = local_opt_fitness_function(test_graph)
+    assert np.isnan(fitness)
+    assert local_opt_fitness_function.non_finite_start_count == 1
+    assert regression.eval_count == 2
+
+
+class PartiallyNanFitnessFunction(VectorBasedFunction):
+    def evaluate_fitness_vector(self, individual):
+        return np.append(individual.values, np.nan)
+
+
+@pytest.mark.parametrize("algorithm", ["lm", "Nelder-Mead"])
+def test_optimizes_partially_non_finite_start(mocker, opt_individual,
+                                              algorithm):
+    fitness_function = PartiallyNanFitnessFunction()
+    vector_spy = mocker.spy(fitness_function, "evaluate_fitness_vector")
+    local_opt_fitness_function = ContinuousLocalOptimization(fitness_function,
+                                                             algorithm)
+    local_opt_fitness_function(opt_individual)
+    assert local_opt_fitness_function.non_finite_start_count == 0
+    assert vector_spy.call_count > 3
+
+
+def test_multi_start_prunes_starts_by_successive_halving(mocker):
+    fitness_function = FloatVectorFitnessFunction()
+    local_opt_fitness_function = ContinuousLocalOptimization(
+        fitness_function, "lm", num_starts=4, start_pruning_evals=2)
+    spy = mocker.spy(local_opt_fitness_function, "_call_optimizer")
+    individual = MultipleFloatChromosome([1. for _ in range(NUM_VALS)],
+                                         [1, 3, 4])
+    fitness = local_opt_fitness_function(individual)
+    assert spy.call_count == 4 + 2 + 1
+    assert fitness == pytest.approx((NUM_VALS - NUM_OPT) / NUM_VALS)
+
+
+def test_multi_start_respects_max_evals(mocker):
+    fitness_function = FloatVectorFitnessFunction()
+    local_opt_fitness_function = ContinuousLocalOptimization(
+        fitness_function, "Nelder-Mead", max_evals=15, num_starts=4,
+        start_pruning_evals=5)
+    spy = mocker.spy(local_opt_fitness_function, "_call_optimizer")
+    individual = MultipleFloatChromosome([1. for _ in range(NUM_VALS)],
+                                         [1, 3, 4])
+    _ = local_opt_fitness_function(individual)
+    assert spy.call_count == 4
+    assert local_opt_fitness_function.local_opt_eval_count == 15
+    assert local_opt_fitness_function.truncated_count == 1
+
+
+def test_multi_start_respects_max_time(mocker):
+    mocker.patch("bingo.local_optimizers.continuous_local_opt."
+                 "time.perf_counter", side_effect=range(100))
+    fitness_function = MultipleFloatValueFitnessFunction()
+    local_opt_fitness_function = ContinuousLocalOptimization(
+        fitness_function, "Nelder-Mead", max_time=6.5, num_starts=4,
+        start_pruning_evals=5)
+    individual = MultipleFloatChromosome([1. for _ in range(NUM_VALS)],
+                                         [1, 3, 4])
+    _ = local_opt_fitness_function(individual)
+    assert local_opt_fitness_function.truncated_count == 1
+    assert local_opt_fitness_function.local_opt_eval_count < 4 * 5
+    assert np.all(np.isfinite(individual.get_local_optimization_params()))
+
+
+def test_multi_start_uses_inherited_and_cached_starts(mocker):
+    fitness_function = FloatVectorFitnessFunction()
+    local_opt_fitness_function = ContinuousLocalOptimization(
+        fitness_function, "lm", num_starts=6)
+    spy = mocker.spy(local_opt_fitness_function, "_call_optimizer")
+    first_individual = MultipleFloatChromosome([1., 2., 3., 4., 5.],
+                                               [1, 3, 4])
+    _ = local_opt_fitness_function(first_individual)
+    first_starts = [call[0][2] for call in spy.call_args_list[:6]]
+    np.testing.assert_array_equal(first_starts[0], [2., 4., 5.])
+
+    spy.reset_mock()
+    second_individual = MultipleFloatChromosome([1., 2., 3., 4., 5.],
+                                                [0, 1, 2])
+    _ = local_opt_fitness_function(second_individual)
+    second_starts = [call[0][2] for call in spy.call_args_list[:6]]
+    np.testing.assert_array_equal(second_starts[0], [1., 2., 3.])
+    np.testing.assert_allclose(second_starts[1], [0., 0., 0.], atol=1e-6)
+
+
+class ChromosomeWithoutParamsGetter(MultipleFloatChromosome):
+    def __getattribute__(self, name):
+        if name == "get_local_optimization_params":
+            raise AttributeError(name)
+        return super().__getattribute__(name)
+
+
+def test_multi_start_without_inherited_params(mocker):
+    fitness_function = FloatVectorFitnessFunction()
+    local_opt_fitness_function = ContinuousLocalOptimization(
+        fitness_function, "lm", num_starts=4)
+    spy = mocker.spy(local_opt_fitness_function, "_call_optimizer")
+    individual = ChromosomeWithoutParamsGetter([1., 2., 3., 4., 5.],
+                                               [1, 3, 4])
+    _ = local_opt_fitness_function(individual)
+    assert spy.call_count == 4 + 2 + 1
+    assert not np.array_equal(spy.call_args_list[0][0][2], [2., 4., 5.])
+
+
+def _count_successful_optimizations(fitness_function, num_starts):
+    np.random.seed(0)
+    local_opt_fitness_function = ContinuousLocalOptimization(
+        fitness_function, "BFGS", num_starts=num_starts)
+    num_successes = 0
+    for _ in range(20):
+        test_graph = AGraph()
+        test_graph.command_array = np.array([[0, 0, 0],  # c_0+c_1(X_0+c_2)^2
+                                             [1, 0, 0],
+                                             [1, 1, 1],
+                                             [1, 2, 2],
+                                             [2, 0, 3],
+                                             [4, 4, 4],
+                                             [4, 2, 5],
+                                             [2, 1, 6]])
+        if local_opt_fitness_function(test_graph) < 1e-8:
+            num_successes += 1
+    return num_successes
+
+
+def test_multi_start_finds_better_constants(linear_constants_regression):
+    assert _count_successful_optimizations(linear_constants_regression, 4) > \
+        _count_successful_optimizations(linear_constants_regression, 1)
+
+
+@pytest.mark.parametrize("param, illegal_value", [
+    ("num_starts", 0),
+    ("start_pruning_evals", 0),
+])
+def test_raises_error_on_invalid_multi_start_parameters(param,
+                                                        illegal_value):
+    fitness_function = FloatVectorFitnessFunction()
+    with pytest.raises(ValueError):
+        ContinuousLocalOptimization(fitness_function, "lm",
+                                    **{param: illegal_value})
+
+
+def test_lm_uses_analytic_jacobian(mocker, linear_constants_regression):
+    test_graph = AGraph()
+    test_graph.command_array = np.array([[0, 0, 0],  # c_0 + c_1 X_0 X_0
+                                         [1, 0, 0],
+                                         [1, 1, 1],
+                                         [4, 0, 0],
+                                         [4, 2, 3],
+                                         [2, 1, 4]])
+    local_opt_fitness_function = ContinuousLocalOptimization(
+        linear_constants_regression, "lm")
+    spy = mocker.spy(linear_constants_regression,
+                     "get_fitness_vector_and_jacobian")
+    _ = local_opt_fitness_function(test_graph)
+    assert spy.call_count > 0
+    np.testing.assert_allclose(test_graph.constants, [2.0, 2.0])
+
+
+class AGraphWithoutMixedDerivative(AGraph):
+    def __getattribute__(self, name):
+        if name == "evaluate_equation_with_mixed_derivative_at":
+            raise AttributeError(name)
+        return super().__getattribute__(name)
+
+
+def test_lm_uses_finite_differences_without_jacobian_for_individual(mocker):
+    t = np.linspace(0, 2 * np.pi, 30)
+    training_data = ImplicitTrainingData(np.c_[np.cos(t), 2 * np.sin(t)],
+                                         np.c_[-np.sin(t), 2 * np.cos(t)])
+    fitness_function = ImplicitRegression(training_data)
+    test_graph = AGraphWithoutMixedDerivative()
+    test_graph.command_array = np.array([[0, 0, 0],  # c_0 X_0^2 + X_1^2
+                                         [0, 1, 1],
+                                         [1, 0, 0],
+                                         [4, 0, 0],
+                                         [4, 3, 2],
+                                         [4, 1, 1],
+                                         [2, 4, 5]])
+    local_opt_fitness_function = ContinuousLocalOptimization(
+        fitness_function, "lm")
+    spy = mocker.spy(fitness_function, "get_fitness_vector_and_jacobian")
+    _ = local_opt_fitness_function(test_graph)
+    assert spy.call_count == 0
+    assert not test_graph.needs_local_optimization()
+
+
+@pytest.mark.parametrize("algorithm", ["Newton-CG", "trust-ncg",
+                                       "trust-exact", "trust-krylov"])
+def test_optimize_with_hessian_algorithms(linear_constants_regression,
+                                          algorithm):
+    test_graph = AGraph()
+    test_graph.command_array = np.array([[0, 0, 0],  # c_0 + c_1 X_0 X_0
+                                         [1, 0, 0],
+                                         [1, 1, 1],
+                                         [4, 0, 0],
+                                         [4, 2, 3],
+                                         [2, 1, 4]])
+    np.random.seed(0)
+    local_opt_fitness_function = ContinuousLocalOptimization(
+        linear_constants_regression, algorithm)
+    _ = local_opt_fitness_function(test_graph)
+    np.testing.assert_allclose(test_graph.constants, [2.0, 2.0], rtol=1e-4)
+
+
+@pytest.mark.parametrize("algorithm", ["Newton-CG", "trust-exact"])
+def test_hessian_algorithms_require_hessian(algorithm):
+    fitness_function = FloatVectorFitnessFunction()
+    with pytest.raises(TypeError):
+        ContinuousLocalOptimization(fitness_function, algorithm=algorithm)
+
+
+def test_hessian_algorithms_without_variable_projection(
+        linear_constants_regression):
+    with pytest.raises(ValueError):
+        ContinuousLocalOptimization(linear_constants_regression,
+                                    algorithm="trust-ncg",
+                                    variable_projection=True)
+
+
 def test_not_valid_algorithm():
     fitness_function = MultipleFloatValueFitnessFunction()
     with pytest.raises(KeyError):
@@ -51,6 +51,20 @@ def test_cannot_pass_odd_population_size(unfit_generator, selection):
         _ = selection(population, 10)
 
 
+def test_parents_are_paired_with_closest_offspring(mixed_fit_generator,
+                                                  selection):
+    population = [mixed_fit_generator() for _ in range(8)]
+    pairs = selection.get_parent_offspring_pairs(population)
+    assert len(pairs) == 4
+    for i, (parent, child) in enumerate(pairs):
+        assert parent is population[i]
+        assert any(child is indv for indv in population[4:])
+    for i in [0, 2]:
+        (parent_1, child_1), (parent_2, child_2) = pairs[i:i+2]
+        assert parent_1.distance(child_1) + parent_2.distance(child_2) <= \
+            parent_1.distance(child_2) + parent_2.distance(child_1)
+
+
 def test_target_pop_size_not_greater_than_pop_length(fit_pop, selection):
     with pytest.raises(ValueError):
         _ = selection(fit_pop, 12)
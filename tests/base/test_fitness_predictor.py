@@ -7,6 +7,10 @@ from bingo.evaluation.fitness_function import FitnessFunction
 from bingo.evolutionary_optimizers.fitness_predictor\
     import FitnessPredictorFitnessFunction, FitnessPredictorIndexGenerator
 from bingo.chromosomes.multiple_values import MultipleValueChromosome
+from bingo.local_optimizers.continuous_local_opt \
+    import ContinuousLocalOptimization
+from bingo.symbolic_regression.explicit_regression \
+    import ExplicitRegression, ExplicitTrainingData
 
 
 class MinPlusMean(FitnessFunction):
@@ -80,6 +84,103 @@ def test_predicted_fitness_for_trainer(predictor_fitness_function,
         np.testing.assert_almost_equal(prediction, expected_prediction)
 
 
+@pytest.fixture
+def explicit_training_data(unit_interval_x):
+    return ExplicitTrainingData(unit_interval_x, unit_interval_x**2)
+
+
+@pytest.fixture
+def agraph_population(make_agraph):
+    population = []
+    for node in [2, 3, 4, 5, 10, 8]:
+        agraph = make_agraph([[0, 0, 0], [1, 0, 0], [node, 0, 1]])
+        agraph.set_local_optimization_params([1.5])
+        population.append(agraph)
+    return population
+
+
+@pytest.mark.parametrize("local_optimization", [False, True])
+def test_predicted_fitness_from_cached_fitness_vectors(
+        mocker, explicit_training_data, agraph_population,
+        local_optimization):
+    fitness_function = ExplicitRegression(explicit_training_data, "mse")
+    full_fitness_function = ContinuousLocalOptimization(fitness_function,
+                                                        algorithm="lm") \
+        if local_optimization else fitness_function
+    predictor_fitness_function = FitnessPredictorFitnessFunction(
+        explicit_training_data, full_fitness_function, agraph_population, 4)
+    predictors = [MultipleValueChromosome([0, 5, 5, 19]),
+                  MultipleValueChromosome([3, 1, 12])]
+
+    spy = mocker.spy(ExplicitRegression, "evaluate_fitness_vector")
+    for predictor in predictors:
+        expected_errors = []
+        for trainer in agraph_population[:4]:
+            subset = explicit_training_data[np.sort(predictor.values)]
+            expected_errors.append(abs(
+                ExplicitRegression(explicit_training_data, "mse")(trainer)
+                - ExplicitRegression(subset, "mse")(trainer)))
+        np.testing.assert_almost_equal(predictor_fitness_function(predictor),
+                                       np.mean(expected_errors))
+    assert spy.call_count == 0
+
+    trainer = agraph_population[5]
+    predictions = predictor_fitness_function.predict_fitnesses_for_trainer(
+        predictors, trainer)
+    assert spy.call_count == 1
+    for predictor, prediction in zip(predictors, predictions):
+        subset = explicit_training_data[np.sort(predictor.values)]
+        np.testing.assert_almost_equal(
+            prediction, ExplicitRegression(subset, "mse")(trainer))
+
+
+def test_cached_fitness_vector_is_refreshed_when_trainer_is_replaced(
+        explicit_training_data, agraph_population):
+    fitness_function = ExplicitRegression(explicit_training_data)
+    predictor_fitness_function = FitnessPredictorFitnessFunction(
+        explicit_training_data, fitness_function, agraph_population, 1)
+    predictor = MultipleValueChromosome([2, 7, 11])
+    subset = explicit_training_data[np.sort(predictor.values)]
+    new_trainer = agraph_population[4]
+    expected_fitness = abs(ExplicitRegression(explicit_training_data)(
+        new_trainer) - ExplicitRegression(subset)(new_trainer))
+
+    predictor_fitness_function.add_trainer(new_trainer)
+    np.testing.assert_almost_equal(predictor_fitness_function(predictor),
+                                   expected_fitness)
+
+
+def test_point_eval_count_with_cached_fitness_vectors(
+        mocker, explicit_training_data, agraph_population):
+    fitness_function = ExplicitRegression(explicit_training_data, "mse")
+    spy = mocker.spy(ExplicitRegression, "evaluate_fitness_vector")
+    predictor_fitness_function = FitnessPredictorFitnessFunction(
+        explicit_training_data, fitness_function, agraph_population, 4)
+    num_points = len(explicit_training_data)
+    assert spy.call_count == 4
+    assert predictor_fitness_function.point_eval_count == 4 * num_points
+
+    predictor = MultipleValueChromosome([0, 5, 5, 19])
+    predictor_fitness_function(predictor)
+    predictor_fitness_function.predict_fitnesses_for_trainer(
+        [predictor], agraph_population[0].copy())
+    predictor_fitness_function.predict_fitness_for_trainer(
+        predictor, agraph_population[1].copy())
+    assert spy.call_count == 4
+    assert predictor_fitness_function.point_eval_count == 4 * num_points
+
+    predictor_fitness_function.predict_fitnesses_for_trainer(
+        [predictor, predictor], agraph_population[4])
+    assert predictor_fitness_function.point_eval_count == 5 * num_points
+
+    predictor_fitness_function.add_trainer(agraph_population[5])
+    assert spy.call_count == 6
+    assert predictor_fitness_function.point_eval_count == 6 * num_points
+    np.testing.assert_almost_equal(
+        predictor_fitness_function._true_fitness_for_trainers[0],
+        fitness_function(agraph_population[5]))
+
+
 @pytest.mark.parametrize("maximum", [2, 20])
 def test_index_generator(maximum):
     generator = FitnessPredictorIndexGenerator(maximum)
@@ -13,7 +13,8 @@ from bingo.evolutionary_optimizers \
 from bingo.evolutionary_algorithms.mu_plus_lambda import MuPlusLambda
 from bingo.selection.tournament import Tournament
 from bingo.evaluation.evaluation import Evaluation
-from bingo.evaluation.fitness_function import FitnessFunction
+from bingo.evaluation.fitness_function import FitnessFunction, \
+    VectorBasedFunction
 from bingo.stats.hall_of_fame import HallOfFame
 
 
@@ -148,6 +149,49 @@ def test_predictor_compute_ratios(fitness_predictor_island):
                                   point_evals_main, point_evals_predictor)
 
 
+class PointwiseDistanceToAverage(VectorBasedFunction):
+    POINTWISE_FITNESS_VECTOR = True
+
+    def evaluate_fitness_vector(self, individual):
+        self.eval_count += 1
+        return np.mean(individual.values) - self.training_data
+
+
+def test_predictor_compute_ratios_with_cached_fitness_vectors(
+        full_training_data, generator):
+    crossover = SinglePointCrossover()
+    mutation = SinglePointMutation(np.random.random)
+    evaluator = Evaluation(PointwiseDistanceToAverage(full_training_data,
+                                                      "mse"))
+    ev_alg = MuPlusLambda(evaluator, Tournament(2), crossover, mutation,
+                          0., 1.0, MAIN_POPULATION_SIZE)
+    island = FPI(ev_alg, generator, MAIN_POPULATION_SIZE,
+                 predictor_population_size=PREDICTOR_POPULATION_SIZE,
+                 trainer_population_size=TRAINER_POPULATION_SIZE,
+                 predictor_size_ratio=SUBSET_TRAINING_DATA_SIZE
+                 / FULL_TRAINING_DATA_SIZE,
+                 predictor_computation_ratio=0.4,
+                 trainer_update_frequency=100,
+                 predictor_update_frequency=100)
+    # trainers are evaluated once; predictions only use their fitness vectors
+    point_evals_predictor = FULL_TRAINING_DATA_SIZE * TRAINER_POPULATION_SIZE
+    point_evals_main = 0
+    assert_expected_compute_ratio(island, point_evals_main,
+                                  point_evals_predictor)
+
+    island.evolve(1, suppress_logging=True)
+    point_evals_main += 2 * point_evals_per_main_step()
+    for _ in range(3):
+        # ratio is below target, but predictor steps cost no point
+        # evaluations, so only one is taken per generation
+        predictor_age = island._predictor_island.generational_age
+        island.evolve(1, suppress_logging=True)
+        point_evals_main += point_evals_per_main_step()
+        assert island._predictor_island.generational_age == predictor_age + 1
+        assert_expected_compute_ratio(island, point_evals_main,
+                                      point_evals_predictor)
+
+
 def test_fitness_predictor_island_ages(fitness_predictor_island):
     predictor_age = 1
     main_age = 0
@@ -219,6 +263,104 @@ def test_temp_hof_is_cleared_with_predictor_update(fp_island_and_hof, mocker):
     assert fp_island._hof_w_predicted_fitness.clear.call_count == 1
 
 
+def test_true_fitness_of_best_individual_is_cached(fitness_predictor_island,
+                                                  mocker):
+    spy = mocker.spy(fitness_predictor_island._predictor_fitness_function,
+                     "get_true_fitness_for_trainer")
+    best_fitness = fitness_predictor_island.get_best_fitness()
+    for _ in range(3):
+        assert fitness_predictor_island.get_best_fitness() == best_fitness
+    assert spy.call_count == 1
+
+
+def test_true_fitness_cache_is_cleared_with_new_training_data(
+        fitness_predictor_island, full_training_data):
+    _ = fitness_predictor_island.get_best_fitness()
+    new_training_data = full_training_data * 2
+    fitness_predictor_island._predictor_fitness_function.training_data = \
+        new_training_data
+    best_individual = fitness_predictor_island.get_best_individual()
+    expected_fitness = DistanceToAverage(new_training_data)(best_individual)
+    assert best_individual.fitness == expected_fitness
+
+
+def test_hof_update_uses_cached_true_fitness(fp_island_and_hof, mocker):
+    fp_island, hof = fp_island_and_hof
+    fp_island.evolve(1)
+    spy = mocker.spy(fp_island._predictor_fitness_function,
+                     "get_true_fitness_for_trainer")
+    fp_island.update_hall_of_fame()
+    assert spy.call_count == 0
+    for indv, indv_w_pred_fitness in zip(hof,
+                                         fp_island._hof_w_predicted_fitness):
+        assert indv is not indv_w_pred_fitness
+
+
+@pytest.fixture
+def concurrent_fp_island_and_hof(ev_alg, generator):
+    hof = HallOfFame(5)
+    fp_island = FPI(ev_alg, generator, MAIN_POPULATION_SIZE,
+        predictor_population_size=PREDICTOR_POPULATION_SIZE,
+        trainer_population_size=TRAINER_POPULATION_SIZE,
+        predictor_size_ratio=SUBSET_TRAINING_DATA_SIZE/FULL_TRAINING_DATA_SIZE,
+        predictor_computation_ratio=0.4,
+        trainer_update_frequency=4,
+        predictor_update_frequency=5,
+        hall_of_fame=hof,
+        concurrent_predictor_evolution=True)
+    return fp_island, hof
+
+
+def test_concurrent_predictor_evolution(concurrent_fp_island_and_hof,
+                                        full_training_data):
+    fp_island, hof = concurrent_fp_island_and_hof
+    fp_island.evolve(20)
+    assert fp_island._predictor_worker is None
+    assert fp_island.generational_age == 20
+    assert fp_island._predictor_island.generational_age > 1
+    assert fp_island._fitness_function.training_data.shape \
+        == (SUBSET_TRAINING_DATA_SIZE,)
+    true_fitness_function = DistanceToAverage(full_training_data)
+    for indv in hof:
+        assert indv.fitness == pytest.approx(true_fitness_function(indv))
+
+
+def test_concurrent_predictors_use_separate_fitness_function(
+        concurrent_fp_island_and_hof, mocker):
+    fp_island, _ = concurrent_fp_island_and_hof
+    main_training_data = fp_island._fitness_function.training_data
+    spy = mocker.spy(DistanceToAverage, "__call__")
+    fp_island._reset_fitness(fp_island._predictor_island.population)
+    fp_island._predictor_island.evaluate_population()
+    assert spy.call_count > 0
+    for call in spy.call_args_list:
+        assert call[0][0] is not fp_island._fitness_function
+    assert fp_island._fitness_function.training_data is main_training_data
+
+
+def test_concurrent_true_fitness_evaluation_holds_worker_lock(
+        concurrent_fp_island_and_hof, mocker):
+    fp_island, _ = concurrent_fp_island_and_hof
+    fp_island._predictor_worker = mocker.Mock()
+    lock = fp_island._predictor_worker.lock
+    lock.__enter__ = mocker.Mock()
+    lock.__exit__ = mocker.Mock(return_value=False)
+    fp_island._get_true_fitness(fp_island.population[0])
+    lock.__enter__.assert_called_once()
+    lock.__exit__.assert_called_once()
+    fp_island._predictor_worker = None
+
+
+def test_concurrent_predictor_errors_are_raised(concurrent_fp_island_and_hof,
+                                                mocker):
+    fp_island, _ = concurrent_fp_island_and_hof
+    mocker.patch.object(fp_island, "_predictor_step_is_needed",
+                        side_effect=ArithmeticError)
+    with pytest.raises(ArithmeticError):
+        fp_island.evolve(1)
+    assert fp_island._predictor_worker is None
+
+
 def assert_expected_compute_ratio(fitness_predictor_island, point_evals_main,
                                   point_evals_predictor):
     # print("Expected:\n", point_evals_main, point_evals_predictor, "\nActual:")
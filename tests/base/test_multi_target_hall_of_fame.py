@@ -0,0 +1,55 @@
+# Ignoring some linting rules in tests
+# pylint: disable=redefined-outer-name
+# pylint: disable=missing-docstring
+import pytest
+import numpy as np
+
+from bingo.stats.multi_target_hall_of_fame import MultiTargetHallOfFame
+from bingo.symbolic_regression.explicit_regression \
+    import MultiTargetExplicitRegression, ExplicitTrainingData
+
+
+@pytest.fixture
+def multi_target_regression(unit_interval_x):
+    x = unit_interval_x
+    y = np.hstack((2.0 * x, 3.0 * x * x))
+    return MultiTargetExplicitRegression(ExplicitTrainingData(x, y), "mse")
+
+
+@pytest.fixture
+def population(make_agraph):
+    linear = make_agraph([[0, 0, 0],  # c_0 X_0
+                          [1, 0, 0],
+                          [4, 0, 1]])
+    quadratic = make_agraph([[0, 0, 0],  # c_0 X_0 X_0
+                             [1, 0, 0],
+                             [4, 0, 0],
+                             [4, 2, 1]])
+    cubic = make_agraph([[0, 0, 0],  # X_0 X_0 X_0
+                         [4, 0, 0],
+                         [4, 1, 0]])
+    return [linear, quadratic, cubic]
+
+
+def test_best_individual_per_target(multi_target_regression, population):
+    np.random.seed(0)
+    hof = MultiTargetHallOfFame(2, multi_target_regression)
+    hof.update(population)
+
+    linear_hof, quadratic_hof = hof.target_halls_of_fame
+    assert len(hof) == 4
+    assert linear_hof[0].fitness == pytest.approx(0., abs=1e-10)
+    np.testing.assert_allclose(linear_hof[0].constants, [2.0])
+    assert quadratic_hof[0].fitness == pytest.approx(0., abs=1e-10)
+    np.testing.assert_allclose(quadratic_hof[0].constants, [3.0])
+    assert list(hof) == list(linear_hof) + list(quadratic_hof)
+    assert hof[2] is quadratic_hof[0]
+
+
+def test_clear(multi_target_regression, population):
+    np.random.seed(0)
+    hof = MultiTargetHallOfFame(2, multi_target_regression)
+    hof.update(population)
+    hof.clear()
+    assert len(hof) == 0
+    assert "Target 1" in str(hof)
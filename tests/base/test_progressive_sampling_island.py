@@ -0,0 +1,127 @@
+# Ignoring some linting rules in tests
+# pylint: disable=redefined-outer-name
+# pylint: disable=missing-docstring
+import pytest
+import numpy as np
+
+from bingo.chromosomes.multiple_values import SinglePointCrossover, \
+    SinglePointMutation, MultipleValueChromosomeGenerator
+from bingo.evolutionary_optimizers.progressive_sampling_island \
+    import ProgressiveSamplingIsland as PSI
+from bingo.evolutionary_algorithms.mu_plus_lambda import MuPlusLambda
+from bingo.selection.tournament import Tournament
+from bingo.evaluation.evaluation import Evaluation
+from bingo.evaluation.fitness_function import FitnessFunction
+from bingo.stats.hall_of_fame import HallOfFame
+
+
+POPULATION_SIZE = 20
+FULL_TRAINING_DATA_SIZE = 40
+
+
+class DistanceToAverage(FitnessFunction):
+    def __call__(self, individual):
+        self.eval_count += 1
+        avg_data = np.mean(self.training_data)
+        return np.linalg.norm(individual.values - avg_data)
+
+
+@pytest.fixture
+def full_training_data():
+    return np.linspace(0.1, 1, FULL_TRAINING_DATA_SIZE)
+
+
+@pytest.fixture
+def ev_alg(full_training_data):
+    crossover = SinglePointCrossover()
+    mutation = SinglePointMutation(np.random.random)
+    selection = Tournament(2)
+    fitness = DistanceToAverage(full_training_data)
+    evaluator = Evaluation(fitness)
+    return MuPlusLambda(evaluator, selection, crossover, mutation,
+                        0., 1.0, POPULATION_SIZE)
+
+
+@pytest.fixture
+def generator():
+    return MultipleValueChromosomeGenerator(np.random.random, 10)
+
+
+@pytest.mark.parametrize("param, illegal_value", [
+    ("initial_sample_ratio", 0.),
+    ("initial_sample_ratio", 1.1),
+    ("sample_growth_factor", 0.5),
+    ("sample_growth_frequency", 0)
+])
+def test_raises_error_on_invalid_parameters(ev_alg, generator, param,
+                                            illegal_value):
+    kwargs = {param: illegal_value}
+    with pytest.raises(ValueError):
+        _ = PSI(ev_alg, generator, POPULATION_SIZE, **kwargs)
+
+
+def test_sample_grows_to_full_data(ev_alg, generator):
+    np.random.seed(0)
+    island = PSI(ev_alg, generator, POPULATION_SIZE,
+                 initial_sample_ratio=0.1, sample_growth_factor=2.,
+                 sample_growth_frequency=2)
+    fitness_function = ev_alg.evaluation.fitness_function
+    sample_sizes = []
+    for _ in range(8):
+        island.evolve(1, hall_of_fame_update=False)
+        sample_sizes.append(len(fitness_function.training_data))
+    assert sample_sizes == [4, 4, 8, 8, 16, 16, 32, 32]
+    island.evolve(1, hall_of_fame_update=False)
+    assert fitness_function.training_data is island._full_training_data
+
+
+def test_new_sample_every_generation(ev_alg, generator):
+    np.random.seed(0)
+    island = PSI(ev_alg, generator, POPULATION_SIZE,
+                 initial_sample_ratio=0.25)
+    fitness_function = ev_alg.evaluation.fitness_function
+    island.evolve(1, hall_of_fame_update=False)
+    first_sample = fitness_function.training_data
+    island.evolve(1, hall_of_fame_update=False)
+    assert len(fitness_function.training_data) == len(first_sample)
+    assert not np.array_equal(fitness_function.training_data, first_sample)
+
+
+def test_best_individual_has_full_data_fitness(ev_alg, generator,
+                                               full_training_data):
+    np.random.seed(0)
+    island = PSI(ev_alg, generator, POPULATION_SIZE,
+                 initial_sample_ratio=0.1)
+    island.evolve(3)
+    fitness_function = ev_alg.evaluation.fitness_function
+    sample = fitness_function.training_data
+    best = island.get_best_individual()
+    expected_fitness = np.linalg.norm(best.values
+                                      - np.mean(full_training_data))
+    assert best.fitness == pytest.approx(expected_fitness)
+    assert fitness_function.training_data is sample
+
+
+def test_hall_of_fame_uses_full_data_fitness(ev_alg, generator,
+                                             full_training_data):
+    np.random.seed(0)
+    hof = HallOfFame(5)
+    island = PSI(ev_alg, generator, POPULATION_SIZE,
+                 initial_sample_ratio=0.1, hall_of_fame=hof)
+    island.evolve(5)
+    assert island.hall_of_fame is hof
+    assert len(hof) == 5
+    for indv in hof:
+        expected_fitness = np.linalg.norm(indv.values
+                                          - np.mean(full_training_data))
+        assert indv.fitness == pytest.approx(expected_fitness)
+
+
+def test_evolve_until_convergence_on_full_data(ev_alg, generator):
+    np.random.seed(0)
+    island = PSI(ev_alg, generator, POPULATION_SIZE,
+                 initial_sample_ratio=0.1, sample_growth_frequency=5)
+    result = island.evolve_until_convergence(max_generations=20,
+                                             fitness_threshold=-1.)
+    best = island.get_best_individual()
+    assert result.fitness == pytest.approx(best.fitness)
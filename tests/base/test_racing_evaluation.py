@@ -0,0 +1,138 @@
+# Ignoring some linting rules in tests
+# pylint: disable=redefined-outer-name
+# pylint: disable=missing-docstring
+import pytest
+import numpy as np
+
+from bingo.evaluation.racing_evaluation import RacingEvaluation
+from bingo.evaluation.fitness_function import FitnessFunction
+from bingo.selection.deterministic_crowding import DeterministicCrowding
+from bingo.symbolic_regression.agraph.agraph import AGraph
+from bingo.symbolic_regression.explicit_regression \
+    import ExplicitRegression, ExplicitTrainingData
+from SingleValue import SingleValueChromosome
+
+FULL_TRAINING_DATA_SIZE = 64
+
+
+class ValueTimesSampleSize(FitnessFunction):
+    def __init__(self, training_data=None):
+        super().__init__(training_data)
+        self.sample_sizes = []
+
+    def __call__(self, individual):
+        self.eval_count += 1
+        self.sample_sizes.append(len(self.training_data))
+        return individual.value * np.mean(self.training_data)
+
+
+@pytest.fixture
+def fitness_function():
+    return ValueTimesSampleSize(np.ones(FULL_TRAINING_DATA_SIZE))
+
+
+@pytest.fixture
+def population():
+    return [SingleValueChromosome(float(i)) for i in [5, 3, 7, 0, 6, 1, 4, 2]]
+
+
+@pytest.mark.parametrize("param, illegal_value", [
+    ("initial_sample_size", 0),
+    ("survival_fraction", 0.),
+    ("survival_fraction", 1.),
+    ("min_survivors", 0)
+])
+def test_raises_error_on_invalid_parameters(fitness_function, param,
+                                            illegal_value):
+    kwargs = {param: illegal_value}
+    with pytest.raises(ValueError):
+        _ = RacingEvaluation(fitness_function, **kwargs)
+
+
+def test_race_halves_population_while_doubling_samples(fitness_function,
+                                                       population):
+    evaluation = RacingEvaluation(fitness_function, initial_sample_size=8)
+    evaluation(population)
+    assert fitness_function.sample_sizes == [8]*8 + [16]*4 + [32]*2 + [64]
+    assert fitness_function.training_data.shape == (FULL_TRAINING_DATA_SIZE,)
+    for indv in population:
+        assert indv.fit_set
+        expected_fitness = 0. if indv.value == 0. else np.inf
+        assert indv.fitness == expected_fitness
+
+
+@pytest.mark.parametrize("min_survivors, expected_full_evals",
+                         [(3, 3), (8, 8)])
+def test_min_survivors_are_evaluated_on_full_data(fitness_function,
+                                                  population, min_survivors,
+                                                  expected_full_evals):
+    evaluation = RacingEvaluation(fitness_function, initial_sample_size=8,
+                                  min_survivors=min_survivors)
+    evaluation(population)
+    num_full_evals = fitness_function.sample_sizes.count(
+        FULL_TRAINING_DATA_SIZE)
+    assert num_full_evals == expected_full_evals
+    best = sorted(population, key=lambda indv: indv.value)
+    for indv in best[:expected_full_evals]:
+        assert indv.fitness == indv.value
+    for indv in best[expected_full_evals:]:
+        assert indv.fitness == np.inf
+
+
+def test_discarded_fitness(fitness_function, population):
+    evaluation = RacingEvaluation(fitness_function, initial_sample_size=8,
+                                  discarded_fitness=1e10)
+    evaluation(population)
+    assert sorted(indv.fitness for indv in population) == [0.] + [1e10]*7
+
+
+def test_skips_already_calculated_fitnesses(fitness_function, population):
+    evaluation = RacingEvaluation(fitness_function, initial_sample_size=8)
+    population[3].fitness = 100.
+    evaluation(population)
+    assert population[3].fitness == 100.
+    assert fitness_function.sample_sizes[:7] == [8]*7
+
+
+def test_small_training_data_is_not_raced(fitness_function, population):
+    evaluation = RacingEvaluation(fitness_function,
+                                  initial_sample_size=FULL_TRAINING_DATA_SIZE)
+    evaluation(population)
+    assert fitness_function.sample_sizes == [FULL_TRAINING_DATA_SIZE]*8
+    for indv in population:
+        assert indv.fitness == indv.value
+
+
+def test_races_within_comparison_groups(fitness_function):
+    parents = [SingleValueChromosome(float(i)) for i in [1, 5, 2, 6]]
+    for parent in parents:
+        parent.fitness = parent.value
+    offspring = [SingleValueChromosome(i) for i in [0., 6.1, 3., 5.9]]
+    evaluation = RacingEvaluation(
+        fitness_function, initial_sample_size=8,
+        comparison_groups=DeterministicCrowding.get_parent_offspring_pairs)
+    evaluation(parents + offspring)
+    assert fitness_function.sample_sizes == [8]*8 + [64]*2
+    assert [parent.fitness for parent in parents] == [1., 5., 2., 6.]
+    assert [child.fitness for child in offspring] == [0., np.inf, np.inf,
+                                                       5.9]
+    next_generation = DeterministicCrowding()(parents + offspring, 4)
+    assert [indv.value for indv in next_generation] == [0., 5., 2., 5.9]
+
+
+def test_race_of_agraphs_on_explicit_training_data():
+    np.random.seed(0)
+    x = np.linspace(0, 1, 100).reshape((-1, 1))
+    training_data = ExplicitTrainingData(x, 2 * x)
+    fitness_function = ExplicitRegression(training_data)
+    population = []
+    for node in [2, 3, 4]:
+        agraph = AGraph()
+        agraph.command_array = np.array([[0, 0, 0], [node, 0, 0]])
+        population.append(agraph)
+    evaluation = RacingEvaluation(fitness_function, initial_sample_size=10)
+    evaluation(population)
+    assert fitness_function.training_data is training_data
+    assert population[0].fitness == pytest.approx(0.)
+    assert population[1].fitness == np.inf
+    assert population[2].fitness == np.inf
@@ -0,0 +1,85 @@
+# Ignoring some linting rules in tests
+# pylint: disable=redefined-outer-name
+# pylint: disable=missing-docstring
+import pytest
+import numpy as np
+
+from bingo.chromosomes.multiple_values import SinglePointCrossover, \
+    SinglePointMutation, MultipleValueChromosomeGenerator
+from bingo.evolutionary_optimizers.streaming_island import StreamingIsland
+from bingo.evolutionary_algorithms.mu_plus_lambda import MuPlusLambda
+from bingo.selection.tournament import Tournament
+from bingo.evaluation.evaluation import Evaluation
+from bingo.evaluation.fitness_function import FitnessFunction
+from bingo.stats.hall_of_fame import HallOfFame
+
+
+class StreamingData:
+    def __init__(self, values):
+        self.values = list(values)
+
+    def append(self, values):
+        self.values.extend(values)
+
+    def evict(self, num_points):
+        self.values = self.values[num_points:]
+
+    def __len__(self):
+        return len(self.values)
+
+
+class DistanceToAverage(FitnessFunction):
+    def __call__(self, individual):
+        self.eval_count += 1
+        avg_data = np.mean(self.training_data.values)
+        return np.linalg.norm(individual.values - avg_data)
+
+
+@pytest.fixture
+def island_and_hof():
+    np.random.seed(0)
+    crossover = SinglePointCrossover()
+    mutation = SinglePointMutation(np.random.random)
+    selection = Tournament(2)
+    fitness = DistanceToAverage(StreamingData([0.2, 0.3]))
+    evaluator = Evaluation(fitness)
+    ev_alg = MuPlusLambda(evaluator, selection, crossover, mutation,
+                          0., 1.0, 10)
+    generator = MultipleValueChromosomeGenerator(np.random.random, 5)
+    hof = HallOfFame(3)
+    return StreamingIsland(ev_alg, generator, 10, hall_of_fame=hof), hof
+
+
+def _fitness_for_data(indv, values):
+    return np.linalg.norm(indv.values - np.mean(values))
+
+
+@pytest.mark.parametrize("update, expected_values", [
+    (lambda island: island.append_training_data([0.9, 1.0]),
+     [0.2, 0.3, 0.9, 1.0]),
+    (lambda island: island.evict_training_data(1), [0.3])
+])
+def test_population_is_reevaluated_after_data_update(island_and_hof, update,
+                                                     expected_values):
+    island, _ = island_and_hof
+    island.evolve(2)
+    update(island)
+    assert list(island.training_data.values) == expected_values
+    assert not any(indv.fit_set for indv in island.population)
+    island.evaluate_population()
+    for indv in island.population:
+        assert indv.fitness == pytest.approx(
+            _fitness_for_data(indv, expected_values))
+
+
+def test_hall_of_fame_is_rescored_lazily(mocker, island_and_hof):
+    island, hof = island_and_hof
+    island.evolve(2)
+    island.append_training_data([0.9, 1.0])
+    spy = mocker.spy(island, "_rescore_hall_of_fame")
+    island.update_hall_of_fame()
+    island.update_hall_of_fame()
+    assert spy.call_count == 1
+    for indv in hof:
+        assert indv.fitness == pytest.approx(
+            _fitness_for_data(indv, [0.2, 0.3, 0.9, 1.0]))
@@ -30,6 +30,13 @@ TEST_EXPLICIT_REGRESSION_OPTIMIZATION_CPP \
     = ContinuousLocalOptimization(TEST_EXPLICIT_REGRESSION_CPP)
 TEST_IMPLICIT_REGRESSION_OPTIMIZATION_CPP \
     = ContinuousLocalOptimization(TEST_IMPLICIT_REGRESSION_CPP)
+NUM_STARTS = 4
+TEST_EXPLICIT_REGRESSION_MULTI_START_OPTIMIZATION \
+    = ContinuousLocalOptimization(TEST_EXPLICIT_REGRESSION,
+                                  num_starts=NUM_STARTS)
+TEST_EXPLICIT_REGRESSION_MULTI_START_OPTIMIZATION_CPP \
+    = ContinuousLocalOptimization(TEST_EXPLICIT_REGRESSION_CPP,
+                                  num_starts=NUM_STARTS)
 
 
 TEST_ITERATION = 0
@@ -56,6 +63,22 @@ def benchmark_explicit_regression_cpp_with_optimization():
             _ = TEST_EXPLICIT_REGRESSION_OPTIMIZATION_CPP.__call__(indv)
 
 
+def benchmark_explicit_regression_with_multi_start_optimization():
+    np.random.seed(0)
+    for i, test_run in enumerate(BENCHMARK_LISTS):
+        for indv in test_run:
+            _ = TEST_EXPLICIT_REGRESSION_MULTI_START_OPTIMIZATION.__call__(
+                indv)
+
+
+def benchmark_explicit_regression_cpp_with_multi_start_optimization():
+    np.random.seed(0)
+    for i, test_run in enumerate(BENCHMARK_LISTS_CPP):
+        for indv in test_run:
+            _ = TEST_EXPLICIT_REGRESSION_MULTI_START_OPTIMIZATION_CPP.__call__(
+                indv)
+
+
 def benchmark_implicit_regression_with_optimization():
     np.random.seed(0)
     for i, test_run in enumerate(BENCHMARK_LISTS):
@@ -104,6 +127,9 @@ def do_benchmarking(debug = False):
         [benchmark_explicit_regression_with_optimization,
          benchmark_explicit_regression_cpp_with_optimization,
          "LOCAL OPTIMIZATION (EXPLICIT REGRESSION) BENCHMARKS"],
+        [benchmark_explicit_regression_with_multi_start_optimization,
+         benchmark_explicit_regression_cpp_with_multi_start_optimization,
+         "LOCAL OPTIMIZATION (EXPLICIT REGRESSION, MULTI-START) BENCHMARKS"],
         [benchmark_implicit_regression_with_optimization, 
          benchmark_implicit_regression_cpp_with_optimization,
          "LOCAL OPTIMIZATION (IMPLICIT REGRESSION) BENCHMARKS"]]
@@ -157,10 +183,27 @@ def _reset_iteration_count():
     TEST_ITERATION = 0
 
 
+def print_fitness_comparison():
+    """Median fitness of single and multi-start local optimization
+
+    Multi-start local optimization is more expensive per individual, this
+    puts the timings of the benchmarks in context of the constants found.
+    """
+    for name, local_opt in [
+            ["single start", TEST_EXPLICIT_REGRESSION_OPTIMIZATION],
+            ["{} starts".format(NUM_STARTS),
+             TEST_EXPLICIT_REGRESSION_MULTI_START_OPTIMIZATION]]:
+        np.random.seed(0)
+        fitnesses = [local_opt(agraph.copy()) for agraph in TEST_AGRAPHS]
+        print("{:<26}   median fitness: {:.6g}".format(
+            name, np.nanmedian(fitnesses)))
+
+
 def _print_stats(printer_list):
     for printer in printer_list:
         printer.print()
 
 
 if __name__ == '__main__':
-    do_benchmarking(False)
\ No newline at end of file
+    do_benchmarking(False)
+    print_fitness_comparison()
\ No newline at end of file
@@ -5,6 +5,7 @@ import warnings
 import pytest
 import numpy as np
 
+from bingo.symbolic_regression import atomic_potential_regression
 from bingo.symbolic_regression.atomic_potential_regression import PairwiseAtomicPotential, \
                                             PairwiseAtomicTrainingData
 
@@ -70,6 +71,36 @@ def test_pairwise_potential_regression(dummy_sum_equation,
     np.testing.assert_almost_equal(fitness, 0)
 
 
+def test_pairwise_potential_regression_with_empty_configurations(
+        dummy_sum_equation):
+    training_data = SampleTrainingData(np.ones((3, 1)), np.array([0, 1, 0, 2]),
+                                       [0, 0, 1, 1, 3])
+    regressor = PairwiseAtomicPotential(training_data)
+    np.testing.assert_array_almost_equal(
+        regressor.evaluate_fitness_vector(dummy_sum_equation), np.zeros(4))
+
+
+def test_pairwise_potential_ignores_distances_beyond_configurations(
+        dummy_sum_equation):
+    training_data = SampleTrainingData(np.ones((5, 1)), np.array([1, 2]),
+                                       [0, 1, 3])
+    regressor = PairwiseAtomicPotential(training_data)
+    np.testing.assert_array_almost_equal(
+        regressor.evaluate_fitness_vector(dummy_sum_equation), np.zeros(2))
+
+
+def test_pairwise_potential_fitness_vector_workspace(dummy_sum_equation,
+                                                     dummy_training_data):
+    regressor = PairwiseAtomicPotential(dummy_training_data)
+    fitness_vector = regressor.evaluate_fitness_vector(dummy_sum_equation)
+    workspace = regressor.evaluate_fitness_vector_in_workspace(
+        dummy_sum_equation)
+    np.testing.assert_array_almost_equal(workspace, fitness_vector)
+    assert workspace is not fitness_vector
+    assert regressor.evaluate_fitness_vector_in_workspace(
+        dummy_sum_equation) is workspace
+
+
 def test_reshaping_of_training_data_energies():
     energies = np.ones((1, 1, 3))
     r_list = np.ones((3, 1))
@@ -112,6 +143,43 @@ def test_training_data_synthesis_of_configurations(configuration_set):
                                          expected_config_lims)
 
 
+def test_training_data_synthesis_with_multiple_processes(configuration_set):
+    energies = np.ones(3)
+    serial = PairwiseAtomicTrainingData(potential_energy=energies,
+                                        configurations=configuration_set)
+    parallel = PairwiseAtomicTrainingData(potential_energy=energies,
+                                          configurations=configuration_set,
+                                          num_processes=2)
+    np.testing.assert_array_equal(parallel.r, serial.r)
+    np.testing.assert_array_equal(parallel.config_lims_r,
+                                  serial.config_lims_r)
+
+
+def test_error_training_data_invalid_num_processes(configuration_set):
+    with pytest.raises(ValueError):
+        _ = PairwiseAtomicTrainingData(potential_energy=np.ones(3),
+                                       configurations=configuration_set,
+                                       num_processes=0)
+
+
+@pytest.mark.parametrize("r_cutoff", [1.0, 1.5, 2.5])
+def test_cell_list_synthesis_matches_all_pairs(mocker, r_cutoff):
+    np.random.seed(0)
+    structure = np.random.uniform(-2, 10, (200, 3))
+    configurations = [(structure, 7.5, r_cutoff)]
+    mocker.patch.object(atomic_potential_regression, "CELL_LIST_MIN_ATOMS",
+                        np.inf)
+    all_pairs = PairwiseAtomicTrainingData(potential_energy=np.ones(1),
+                                           configurations=configurations)
+    mocker.patch.object(atomic_potential_regression, "CELL_LIST_MIN_ATOMS",
+                        0)
+    cell_list = PairwiseAtomicTrainingData(potential_energy=np.ones(1),
+                                           configurations=configurations)
+    np.testing.assert_array_almost_equal(cell_list.r, all_pairs.r)
+    np.testing.assert_array_equal(cell_list.config_lims_r,
+                                  all_pairs.config_lims_r)
+
+
 def test_training_data_subset():
     energies = np.ones(3)
     r_list = np.ones((3, 1))
@@ -128,6 +196,20 @@ def test_training_data_subset():
                                          np.arange(3))
 
 
+def test_training_data_subset_of_configurations():
+    energies = np.arange(4.)
+    r_list = np.arange(10.).reshape((-1, 1))
+    config_lims = np.array([0, 1, 3, 6, 10])
+    training_data = PairwiseAtomicTrainingData(potential_energy=energies,
+                                               r_list=r_list,
+                                               config_lims_r=config_lims)
+    subset = training_data[[3, 0, 2]]
+    np.testing.assert_array_almost_equal(subset.potential_energy, [3, 0, 2])
+    np.testing.assert_array_almost_equal(subset.r.flatten(),
+                                         [6, 7, 8, 9, 0, 3, 4, 5])
+    np.testing.assert_array_equal(subset.config_lims_r, [0, 4, 5, 8])
+
+
 @pytest.mark.parametrize("data_size", [2, 10, 50])
 def test_training_data_length(data_size):
     energies = np.ones(data_size)
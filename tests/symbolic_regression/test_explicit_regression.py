@@ -5,7 +5,9 @@ import warnings
 import pytest
 import numpy as np
 
-from bingo.symbolic_regression.explicit_regression import ExplicitRegression, ExplicitTrainingData
+from bingo.symbolic_regression.agraph.agraph import AGraph
+from bingo.symbolic_regression.explicit_regression import ExplicitRegression, ExplicitTrainingData, \
+    MultiTargetExplicitRegression
 try:
     from bingocpp.build import bingocpp as bingocpp
 except ImportError:
@@ -88,6 +90,22 @@ def test_reshaping_of_training_data():
     assert training_data.y.ndim == 2
 
 
+def test_training_data_x_bounds():
+    x = np.array([[1.0, -2.0], [np.nan, 4.0], [-3.0, 0.5]])
+    training_data = ExplicitTrainingData(x, np.zeros((3, 1)))
+    np.testing.assert_array_equal(training_data.x_bounds,
+                                  [[-3.0, -2.0], [1.0, 4.0]])
+    assert training_data.x_bounds is training_data.x_bounds
+
+
+def test_training_data_x_bounds_are_updated_when_x_is_reassigned():
+    training_data = ExplicitTrainingData(np.array([[1.0], [2.0]]),
+                                         np.zeros((2, 1)))
+    np.testing.assert_array_equal(training_data.x_bounds, [[1.0], [2.0]])
+    training_data.x = np.array([[-5.0], [5.0]])
+    np.testing.assert_array_equal(training_data.x_bounds, [[-5.0], [5.0]])
+
+
 def test_poorly_shaped_input_x_of_training_data():
     x = np.zeros((5, 3, 3))
     y = x.flatten()
@@ -121,6 +139,32 @@ def test_getting_subset_of_training_data(python):
                                   expected_subset)
 
 
+def test_contiguous_subset_of_training_data_is_view():
+    data_input = np.arange(10).reshape((-1, 1))
+    training_data = ExplicitTrainingData(data_input, data_input)
+    subset_training_data = training_data[np.arange(2, 6)]
+    np.testing.assert_array_equal(subset_training_data.x, data_input[2:6])
+    assert np.shares_memory(subset_training_data.x, data_input)
+    assert not np.shares_memory(training_data[[2, 4]].x, data_input)
+
+
+@pytest.mark.parametrize("column_major", [True, False])
+def test_memory_mapped_training_data(tmp_path, column_major):
+    x = np.arange(20.).reshape((-1, 2))
+    y = x[:, :1] ** 2
+    x_file = str(tmp_path / "x.npy")
+    y_file = str(tmp_path / "y.npy")
+    ExplicitTrainingData(x, y).save_npy(x_file, y_file, column_major)
+
+    training_data = ExplicitTrainingData.from_npy(x_file, y_file)
+    assert isinstance(training_data.x, np.memmap)
+    assert training_data.x.flags.f_contiguous == column_major
+    np.testing.assert_array_equal(training_data.x, x)
+    np.testing.assert_array_equal(training_data.y, y)
+    np.testing.assert_array_equal(training_data[3:7].x, x[3:7])
+    assert isinstance(training_data[3:7].x, np.memmap)
+
+
 @pytest.mark.parametrize("python", 
     [True, pytest.param(False, marks = pytest.mark.skipif(not bingocpp,
                                reason = 'BingoCpp import failure'))])
@@ -129,3 +173,245 @@ def test_correct_training_data_length(python, input_size):
     data_input = np.arange(input_size).reshape((-1, 1))
     training_data = ExplicitTrainingData(data_input, data_input)
     assert len(training_data) == input_size
+
+
+@pytest.fixture
+def nonlinear_agraph():
+    test_graph = AGraph()
+    test_graph.command_array = np.array([[0, 0, 0],  # c_0 sin(c_1 X_0)
+                                         [1, 0, 0],
+                                         [1, 1, 1],
+                                         [4, 2, 0],
+                                         [6, 3, 3],
+                                         [4, 1, 4]])
+    test_graph.set_local_optimization_params(np.array([1.2, 0.8]))
+    return test_graph
+
+
+@pytest.mark.parametrize("metric", ["mae", "mse", "rmse"])
+def test_fitness_derivatives(nonlinear_agraph, metric):
+    x = np.linspace(-1, 1, 15).reshape((-1, 1))
+    regressor = ExplicitRegression(ExplicitTrainingData(x, 2 * x), metric)
+
+    def fitness_at(constants):
+        nonlinear_agraph.set_local_optimization_params(constants)
+        return regressor(nonlinear_agraph)
+
+    def gradient_at(constants):
+        nonlinear_agraph.set_local_optimization_params(constants)
+        return regressor.get_fitness_gradient(nonlinear_agraph)
+
+    constants = np.array([1.2, 0.8])
+    delta = 1e-6 * np.eye(2)
+    gradient = gradient_at(constants)
+    np.testing.assert_allclose(
+        gradient, [(fitness_at(constants + d) - fitness_at(constants - d))
+                   / 2e-6 for d in delta], rtol=1e-5)
+
+    nonlinear_agraph.set_local_optimization_params(constants)
+    hessian = regressor.get_fitness_hessian(nonlinear_agraph)
+    np.testing.assert_allclose(
+        hessian, [(gradient_at(constants + d) - gradient_at(constants - d))
+                  / 2e-6 for d in delta], rtol=1e-4, atol=1e-6)
+
+    vector = np.array([0.5, -2.0])
+    nonlinear_agraph.set_local_optimization_params(constants)
+    np.testing.assert_allclose(
+        regressor.get_fitness_hessian_vector_product(nonlinear_agraph,
+                                                     vector),
+        hessian.dot(vector))
+
+
+@pytest.fixture
+def repeated_training_data():
+    np.random.seed(0)
+    x = np.repeat(np.linspace(-1, 1, 5), [1, 4, 2, 3, 2]).reshape((-1, 1))
+    y = 2 * x + np.random.normal(0, 0.1, x.shape)
+    y[4] = y[3]
+    return ExplicitTrainingData(x, y)
+
+
+def test_compress_training_data(repeated_training_data):
+    compressed = repeated_training_data.compress()
+    assert len(compressed) == 5
+    np.testing.assert_array_equal(compressed.x.flatten(),
+                                  np.linspace(-1, 1, 5))
+    np.testing.assert_array_equal(compressed.weights, [1, 4, 2, 3, 2])
+    np.testing.assert_allclose(compressed.y[1, 0],
+                               np.mean(repeated_training_data.y[1:5]))
+    np.testing.assert_allclose(compressed.aggregated_squared_error[1],
+                               4 * np.var(repeated_training_data.y[1:5]))
+
+    exact_compressed = repeated_training_data.compress(aggregate_y=False)
+    assert len(exact_compressed) == 11
+    assert np.sum(exact_compressed.weights) == 12
+    np.testing.assert_allclose(exact_compressed.aggregated_squared_error, 0.)
+
+
+def test_compressed_training_data_subset(repeated_training_data):
+    subset = repeated_training_data.compress()[[1, 3]]
+    np.testing.assert_array_equal(subset.weights, [4, 3])
+    assert len(subset.aggregated_squared_error) == 2
+
+
+@pytest.mark.parametrize("metric, aggregate_y", [("mae", False),
+                                                 ("mse", False),
+                                                 ("mse", True),
+                                                 ("rmse", True)])
+def test_compressed_training_data_gives_same_fitness(
+        nonlinear_agraph, repeated_training_data, metric, aggregate_y):
+    regressor = ExplicitRegression(repeated_training_data, metric)
+    compressed_regressor = ExplicitRegression(
+        repeated_training_data.compress(aggregate_y), metric)
+
+    assert compressed_regressor(nonlinear_agraph) == \
+        pytest.approx(regressor(nonlinear_agraph))
+    np.testing.assert_allclose(
+        compressed_regressor.get_fitness_gradient(nonlinear_agraph),
+        regressor.get_fitness_gradient(nonlinear_agraph))
+    np.testing.assert_allclose(
+        compressed_regressor.get_fitness_hessian(nonlinear_agraph),
+        regressor.get_fitness_hessian(nonlinear_agraph))
+
+    vector, jacobian = regressor.get_fitness_vector_and_jacobian(
+        nonlinear_agraph)
+    compressed_vector, compressed_jacobian = \
+        compressed_regressor.get_fitness_vector_and_jacobian(
+            nonlinear_agraph)
+    if not aggregate_y:
+        assert np.sum(np.square(compressed_vector)) == \
+            pytest.approx(np.sum(np.square(vector)))
+    np.testing.assert_allclose(compressed_jacobian.T.dot(compressed_jacobian),
+                               jacobian.T.dot(jacobian))
+
+
+@pytest.mark.parametrize("metric", ["mae", "mse", "rmse"])
+@pytest.mark.parametrize("compressed", [True, False])
+def test_workspace_fitness_matches_fitness_vector(
+        nonlinear_agraph, repeated_training_data, metric, compressed):
+    training_data = repeated_training_data.compress() if compressed \
+        else repeated_training_data
+    regressor = ExplicitRegression(training_data, metric)
+    vector = regressor.evaluate_fitness_vector(nonlinear_agraph)
+    expected_fitness = regressor._metric(vector)
+
+    assert regressor(nonlinear_agraph) == pytest.approx(expected_fitness)
+    workspace_vector = regressor.evaluate_fitness_vector_in_workspace(
+        nonlinear_agraph)
+    np.testing.assert_array_equal(workspace_vector, vector)
+    second_workspace_vector = regressor.evaluate_fitness_vector_in_workspace(
+        nonlinear_agraph)
+    assert np.shares_memory(workspace_vector, second_workspace_vector)
+
+
+@pytest.fixture
+def multi_target_data():
+    x = np.linspace(-1, 1, 30).reshape((-1, 1))
+    y = np.hstack((1.5 * np.sin(0.5 * x), -2.0 * np.sin(1.5 * x),
+                   0.5 * np.sin(-1.0 * x)))
+    return ExplicitTrainingData(x, y)
+
+
+@pytest.mark.parametrize("metric", ["mae", "mse"])
+def test_multi_target_constants_fit_each_target(nonlinear_agraph,
+                                                multi_target_data, metric):
+    regressor = MultiTargetExplicitRegression(multi_target_data, metric)
+    assert regressor.num_targets == 3
+    start = nonlinear_agraph.constants
+    constant_sets = regressor.optimize_target_constants(nonlinear_agraph)
+    np.testing.assert_array_equal(nonlinear_agraph.constants, start)
+    np.testing.assert_allclose(np.abs(constant_sets),
+                               [[1.5, 0.5], [2.0, 1.5], [0.5, 1.0]],
+                               rtol=1e-4)
+    np.testing.assert_allclose(
+        regressor.evaluate_target_fitness(nonlinear_agraph, constant_sets),
+        0., atol=1e-6)
+
+
+def test_multi_target_evaluation_is_single_pass(mocker, nonlinear_agraph,
+                                                multi_target_data):
+    regressor = MultiTargetExplicitRegression(multi_target_data)
+    spy = mocker.spy(nonlinear_agraph, "evaluate_equation_at_constant_sets")
+    constant_sets = np.array([[1.5, 0.5], [-2.0, 1.5], [1.0, 1.0]])
+    target_fitness = regressor.evaluate_target_fitness(nonlinear_agraph,
+                                                       constant_sets)
+    assert spy.call_count == 1
+    target_scales = regressor.target_scales
+    for target, constants in enumerate(constant_sets):
+        nonlinear_agraph.set_local_optimization_params(constants)
+        single_regressor = ExplicitRegression(multi_target_data[:])
+        single_regressor.training_data.y = \
+            multi_target_data.y[:, [target]]
+        assert target_fitness[target] * target_scales[target] == \
+            pytest.approx(single_regressor(nonlinear_agraph))
+
+
+@pytest.mark.parametrize("metric", ["mae", "mse", "rmse"])
+def test_multi_target_fitness_is_normalized_per_target(metric):
+    x = np.linspace(-1, 1, 30).reshape((-1, 1))
+    y = np.hstack((x, 1000 * x + 5))
+    regressor = MultiTargetExplicitRegression(ExplicitTrainingData(x, y),
+                                              metric)
+    np.testing.assert_allclose(regressor.target_scales,
+                               [regressor._metric(y[:, 0] - np.mean(y[:, 0])),
+                                regressor._metric(y[:, 1] - np.mean(y[:, 1]))])
+
+    scaled_graph = AGraph()
+    scaled_graph.command_array = np.array([[0, 0, 0],  # 1.1 X_0
+                                           [1, 0, 0],
+                                           [4, 0, 1]])
+    scaled_graph.set_local_optimization_params([1.1])
+    target_fitness = regressor.evaluate_target_fitness(
+        scaled_graph, np.array([[1.1], [1100.]]))
+    assert target_fitness[0] == pytest.approx(target_fitness[1], rel=0.1)
+
+
+def test_multi_target_individuals_reuse_evaluated_targets(
+        mocker, multi_target_data):
+    np.random.seed(0)
+    test_graph = AGraph()
+    test_graph.command_array = np.array([[0, 0, 0],  # c_0 X_0
+                                         [1, 0, 0],
+                                         [4, 0, 1]])
+    regressor = MultiTargetExplicitRegression(multi_target_data, "mse")
+    fitness = regressor(test_graph)
+    optimize_spy = mocker.spy(regressor, "optimize_target_constants")
+    evaluate_spy = mocker.spy(regressor, "evaluate_target_fitness")
+    target_individuals = regressor.get_target_individuals(test_graph)
+    assert optimize_spy.call_count == 0
+    assert evaluate_spy.call_count == 0
+    assert min(indv.fitness for indv in target_individuals) == fitness
+
+
+def test_multi_target_fitness_is_best_target(nonlinear_agraph,
+                                             multi_target_data):
+    np.random.seed(0)
+    regressor = MultiTargetExplicitRegression(multi_target_data, "mse")
+    nonlinear_agraph.set_local_optimization_params(np.array([-1.9, 1.4]))
+    fitness = regressor(nonlinear_agraph)
+    target_fitness = regressor.evaluate_target_fitness(
+        nonlinear_agraph,
+        np.tile(nonlinear_agraph.constants, (3, 1)))
+    assert fitness == target_fitness[1] == np.min(target_fitness)
+
+
+def test_multi_target_individuals(nonlinear_agraph, multi_target_data):
+    regressor = MultiTargetExplicitRegression(multi_target_data, "mse")
+    target_individuals = regressor.get_target_individuals(nonlinear_agraph)
+    assert len(target_individuals) == 3
+    for target_individual in target_individuals:
+        assert target_individual.fitness == pytest.approx(0., abs=1e-10)
+        assert target_individual is not nonlinear_agraph
+
+
+def test_multi_target_needs_local_optimization(multi_target_data):
+    np.random.seed(0)
+    test_graph = AGraph()
+    test_graph.command_array = np.array([[0, 0, 0],  # c_0 X_0
+                                         [1, 0, 0],
+                                         [4, 0, 1]])
+    regressor = MultiTargetExplicitRegression(multi_target_data, "mse")
+    fitness = regressor(test_graph)
+    assert not test_graph.needs_local_optimization()
+    assert fitness == pytest.approx(regressor.evaluate_target_fitness(
+        test_graph, np.tile(test_graph.constants, (3, 1))).min())
@@ -5,9 +5,11 @@ import warnings
 import pytest
 import numpy as np
 
+from bingo.symbolic_regression.agraph.agraph import AGraph
 from bingo.symbolic_regression.implicit_regression import ImplicitRegression, \
                                      ImplicitRegressionSchmidt, \
-                                     ImplicitTrainingData
+                                     ImplicitTrainingData, \
+                                     calculate_partials, savitzky_golay_gram
 try:
     from bingocpp.build import bingocpp as bingocpp
 except ImportError:
@@ -100,6 +102,57 @@ def test_schmidt_regression(implicit_data):
     np.testing.assert_almost_equal(fitness, 0.44420421701352086)
 
 
+def _schmidt_fitness_vector_by_pairs(df_dx, dx_dt):
+    num_parameters = df_dx.shape[1]
+    worst_fitness = 0
+    diff_worst = np.full((num_parameters, ), np.inf)
+    for i in range(num_parameters):
+        for j in range(num_parameters):
+            if i != j:
+                df_dxj = np.copy(df_dx[:, j])
+                for k in range(num_parameters):
+                    if k not in (i, j):
+                        df_dxj += df_dx[:, k] * dx_dt[:, k] / dx_dt[:, j]
+                diff = np.log(1. + np.abs(df_dxj / df_dx[:, i] +
+                                          dx_dt[:, i] / dx_dt[:, j]))
+                if np.isfinite(np.mean(diff)) and \
+                        np.mean(diff) > worst_fitness:
+                    diff_worst = diff
+                    worst_fitness = np.mean(diff)
+    return diff_worst
+
+
+def test_schmidt_regression_matches_pairwise_calculation(mocker):
+    np.random.seed(0)
+    x = np.random.normal(size=(20, 4))
+    dx_dt = np.random.normal(size=(20, 4))
+    df_dx = np.random.normal(size=(20, 4))
+    individual = mocker.Mock()
+    individual.evaluate_equation_with_x_gradient_at.return_value = (None,
+                                                                    df_dx)
+    regressor = ImplicitRegressionSchmidt(SampleTrainingData(x, dx_dt))
+    np.testing.assert_allclose(regressor.evaluate_fitness_vector(individual),
+                               _schmidt_fitness_vector_by_pairs(df_dx,
+                                                                dx_dt))
+
+
+@pytest.mark.parametrize("chunk_size", [16, 160, 2**20])
+def test_schmidt_regression_in_chunks_matches_pairwise_calculation(
+        mocker, chunk_size):
+    np.random.seed(0)
+    x = np.random.normal(size=(25, 4))
+    dx_dt = np.random.normal(size=(25, 4))
+    df_dx = np.random.normal(size=(25, 4))
+    individual = mocker.Mock()
+    individual.evaluate_equation_with_x_gradient_at.return_value = (None,
+                                                                    df_dx)
+    regressor = ImplicitRegressionSchmidt(SampleTrainingData(x, dx_dt))
+    mocker.patch.object(regressor, "CHUNK_SIZE", chunk_size)
+    np.testing.assert_allclose(regressor.evaluate_fitness_vector(individual),
+                               _schmidt_fitness_vector_by_pairs(df_dx,
+                                                                dx_dt))
+
+
 def test_reshaping_of_training_data():
     x = np.zeros(5)
     dx_dt = np.zeros((5, 1))
@@ -140,6 +193,29 @@ def test_getting_subset_of_training_data(python):
                                   expected_subset)
 
 
+def test_contiguous_subset_of_training_data_is_view():
+    data_input = np.arange(10).reshape((-1, 1))
+    training_data = ImplicitTrainingData(data_input, data_input)
+    subset_training_data = training_data[[4, 5, 6]]
+    np.testing.assert_array_equal(subset_training_data.x, data_input[4:7])
+    assert np.shares_memory(subset_training_data.x, data_input)
+    assert np.shares_memory(subset_training_data.dx_dt, data_input)
+
+
+def test_memory_mapped_training_data(tmp_path):
+    x = np.arange(20.).reshape((-1, 2))
+    x_file = str(tmp_path / "x.npy")
+    dx_dt_file = str(tmp_path / "dx_dt.npy")
+    ImplicitTrainingData(x, 2 * x).save_npy(x_file, dx_dt_file,
+                                            column_major=True)
+
+    training_data = ImplicitTrainingData.from_npy(x_file, dx_dt_file)
+    assert isinstance(training_data.x, np.memmap)
+    assert training_data.x.flags.f_contiguous
+    np.testing.assert_array_equal(training_data.x, x)
+    np.testing.assert_array_equal(training_data.dx_dt, 2 * x)
+
+
 @pytest.mark.parametrize("python", 
     [True, pytest.param(False, marks = pytest.mark.skipif(not bingocpp,
                                reason = 'BingoCpp import failure'))])
@@ -184,3 +260,80 @@ def test_correct_partial_calculation_in_training_data_2(python):
     expected_derivative = np.full((26, 1), 2.0)
     np.testing.assert_array_almost_equal(training_data.dx_dt,
                                          expected_derivative)
+
+
+def test_savitzky_golay_filters_columns_independently():
+    np.random.seed(0)
+    y = np.random.random((30, 3))
+    filtered = savitzky_golay_gram(y, 7, 3, 1)
+    for i in range(3):
+        np.testing.assert_array_almost_equal(
+            filtered[:, i], savitzky_golay_gram(y[:, i], 7, 3, 1))
+
+
+@pytest.mark.parametrize("deriv", [0, 1, 2])
+def test_savitzky_golay_is_exact_for_low_order_polynomials(deriv):
+    t = np.arange(15, dtype=float)
+    y = np.c_[t**2, t**3 - t]
+    expected = [np.c_[t**2, t**3 - t],
+                np.c_[2 * t, 3 * t**2 - 1],
+                np.c_[np.full_like(t, 2), 6 * t]][deriv]
+    np.testing.assert_array_almost_equal(savitzky_golay_gram(y, 7, 3, deriv),
+                                         expected)
+
+
+def test_partial_calculation_skips_short_trajectories():
+    data_input = np.arange(10, dtype=float).reshape((10, 1))
+    data_input = np.vstack((data_input, [np.nan], data_input[:5], [np.nan],
+                            [np.nan], data_input))
+    x, dx_dt, inds = calculate_partials(data_input)
+    np.testing.assert_array_equal(inds, [3, 4, 5, 21, 22, 23])
+    np.testing.assert_array_equal(x, data_input[inds])
+    np.testing.assert_array_almost_equal(dx_dt, np.ones((6, 1)))
+
+
+@pytest.mark.parametrize("normalize_dot", [True, False])
+def test_implicit_regression_jacobian(normalize_dot):
+    test_graph = AGraph()
+    test_graph.command_array = np.array([[0, 0, 0],  # c_0 X_0^2 + sin(c_1 X_1)
+                                         [0, 1, 1],
+                                         [1, 0, 0],
+                                         [1, 1, 1],
+                                         [4, 0, 0],
+                                         [4, 2, 4],
+                                         [4, 3, 1],
+                                         [6, 6, 6],
+                                         [2, 5, 7]])
+    x = np.random.RandomState(0).uniform(0.1, 1, (10, 2))
+    dx_dt = np.random.RandomState(1).uniform(-1, 1, (10, 2))
+    regressor = ImplicitRegression(SampleTrainingData(x, dx_dt),
+                                   normalize_dot=normalize_dot)
+    constants = np.array([0.7, 1.6])
+    test_graph.set_local_optimization_params(constants)
+    fitness_vector, jacobian = \
+        regressor.get_fitness_vector_and_jacobian(test_graph)
+    np.testing.assert_allclose(fitness_vector,
+                               regressor.evaluate_fitness_vector(test_graph))
+
+    for i, delta in enumerate(1e-6 * np.eye(2)):
+        test_graph.set_local_optimization_params(constants + delta)
+        vector_plus = regressor.evaluate_fitness_vector(test_graph)
+        test_graph.set_local_optimization_params(constants - delta)
+        vector_minus = regressor.evaluate_fitness_vector(test_graph)
+        np.testing.assert_allclose(jacobian[:, i],
+                                   (vector_plus - vector_minus) / 2e-6,
+                                   rtol=1e-4, atol=1e-8)
+
+
+def test_implicit_regression_jacobian_not_enough_params(dummy_training_data):
+    test_graph = AGraph()
+    test_graph.command_array = np.array([[0, 0, 0],
+                                         [1, 0, 0],
+                                         [4, 0, 1]])
+    test_graph.set_local_optimization_params(np.array([1.0]))
+    regressor = ImplicitRegression(dummy_training_data, required_params=2)
+    fitness_vector, jacobian = \
+        regressor.get_fitness_vector_and_jacobian(test_graph)
+    assert np.all(np.isinf(fitness_vector))
+    assert jacobian.shape == (10, 1)
+    assert np.all(np.isnan(jacobian))
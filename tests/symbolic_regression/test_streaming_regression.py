@@ -0,0 +1,184 @@
+# Ignoring some linting rules in tests
+# pylint: disable=redefined-outer-name
+# pylint: disable=missing-docstring
+import pytest
+import numpy as np
+
+from bingo.local_optimizers.continuous_local_opt \
+    import ContinuousLocalOptimization
+from bingo.symbolic_regression.agraph.agraph import AGraph
+from bingo.symbolic_regression.explicit_regression \
+    import ExplicitRegression, ExplicitTrainingData
+from bingo.symbolic_regression.streaming_regression \
+    import StreamingExplicitRegression, StreamingExplicitTrainingData
+
+
+@pytest.fixture
+def stream():
+    x = np.linspace(-2, 2, 100).reshape((-1, 1))
+    y = np.sin(x) + 0.1 * x ** 2
+    return x, y
+
+
+@pytest.fixture
+def sin_agraph():
+    agraph = AGraph()
+    agraph.command_array = np.array([[0, 0, 0],
+                                     [1, 0, 0],
+                                     [6, 0, 0],
+                                     [4, 2, 1]])
+    agraph.set_local_optimization_params([0.9])
+    return agraph
+
+
+def test_window_size_evicts_oldest_points(stream):
+    x, y = stream
+    training_data = StreamingExplicitTrainingData(x[:30], y[:30],
+                                                  window_size=20)
+    np.testing.assert_array_equal(training_data.x, x[10:30])
+    assert training_data.num_evicted == 10
+
+    training_data.append(x[30:35], y[30:35])
+    np.testing.assert_array_equal(training_data.x, x[15:35])
+    np.testing.assert_array_equal(training_data.y, y[15:35])
+    np.testing.assert_array_equal(training_data.x_bounds,
+                                  [x[15], x[34]])
+
+    training_data.evict(5)
+    np.testing.assert_array_equal(training_data.x, x[20:35])
+    assert training_data.num_evicted == 20
+
+
+def test_append_keeps_previous_views_unchanged(stream):
+    x, y = stream
+    training_data = StreamingExplicitTrainingData(x[:10], y[:10],
+                                                  window_size=10)
+    previous_x = training_data.x
+    for start in range(10, 100, 3):
+        training_data.append(x[start:start + 3], y[start:start + 3])
+        end = min(start + 3, 100)
+        np.testing.assert_array_equal(training_data.x, x[end - 10:end])
+        np.testing.assert_array_equal(training_data.y, y[end - 10:end])
+    np.testing.assert_array_equal(previous_x, x[:10])
+
+
+def test_append_reallocates_buffers_rarely(mocker, stream):
+    x, y = stream
+    training_data = StreamingExplicitTrainingData(x[:10], y[:10],
+                                                  window_size=10)
+    spy = mocker.spy(training_data, "_reallocate_buffers")
+    for i in range(10, 100):
+        training_data.append(x[i], y[i])
+    assert spy.call_count <= 90 // 10
+
+
+def test_evict_raises_error_on_negative_points(stream):
+    training_data = StreamingExplicitTrainingData(*stream)
+    with pytest.raises(ValueError):
+        training_data.evict(-1)
+
+
+@pytest.mark.parametrize("metric", ["mae", "mse", "rmse"])
+def test_incremental_fitness_matches_full_evaluation(stream, sin_agraph,
+                                                     metric):
+    x, y = stream
+    training_data = StreamingExplicitTrainingData(x[:40], y[:40],
+                                                  window_size=50)
+    fitness_function = StreamingExplicitRegression(training_data, metric)
+    for start, end in [(40, 45), (45, 60), (60, 63), (63, 100)]:
+        fitness_function(sin_agraph)
+        training_data.append(x[start:end], y[start:end])
+        if end == 60:
+            training_data.evict(7)
+        first = training_data.num_evicted
+        expected_fitness = ExplicitRegression(
+            ExplicitTrainingData(x[first:end], y[first:end]),
+            metric)(sin_agraph)
+        assert fitness_function(sin_agraph) == pytest.approx(expected_fitness)
+
+
+def test_only_new_points_are_evaluated(mocker, stream, sin_agraph):
+    x, y = stream
+    training_data = StreamingExplicitTrainingData(x[:40], y[:40],
+                                                  window_size=50)
+    fitness_function = StreamingExplicitRegression(training_data)
+    spy = mocker.spy(sin_agraph, "evaluate_equation_at")
+    fitness_function(sin_agraph)
+    training_data.append(x[40:55], y[40:55])
+    fitness_function(sin_agraph)
+    fitness_function(sin_agraph)
+
+    assert [len(call[0][0]) for call in spy.call_args_list] == [40, 15]
+    assert fitness_function.eval_count == 2
+
+
+def test_changed_constants_are_evaluated_on_full_window(stream, sin_agraph):
+    x, y = stream
+    training_data = StreamingExplicitTrainingData(x, y)
+    fitness_function = StreamingExplicitRegression(training_data)
+    fitness_function(sin_agraph)
+    sin_agraph.set_local_optimization_params([1.0])
+    expected_fitness = ExplicitRegression(
+        ExplicitTrainingData(x, y))(sin_agraph)
+    assert fitness_function(sin_agraph) == pytest.approx(expected_fitness)
+    assert fitness_function.eval_count == 2
+
+
+def test_accumulators_are_reset_with_new_training_data(stream, sin_agraph):
+    x, y = stream
+    fitness_function = StreamingExplicitRegression(
+        StreamingExplicitTrainingData(x[:50], y[:50]))
+    fitness_function(sin_agraph)
+    fitness_function.training_data = StreamingExplicitTrainingData(x[50:],
+                                                                   y[50:])
+    expected_fitness = ExplicitRegression(
+        ExplicitTrainingData(x[50:], y[50:]))(sin_agraph)
+    assert fitness_function(sin_agraph) == pytest.approx(expected_fitness)
+
+
+def test_cache_size_limits_accumulators(stream, sin_agraph):
+    training_data = StreamingExplicitTrainingData(*stream)
+    fitness_function = StreamingExplicitRegression(training_data,
+                                                   cache_size=1)
+    other_agraph = sin_agraph.copy()
+    other_agraph.command_array = np.array([[0, 0, 0],
+                                           [1, 0, 0],
+                                           [7, 0, 0],
+                                           [4, 2, 1]])
+    fitness_function(sin_agraph)
+    fitness_function(other_agraph)
+    fitness_function(sin_agraph)
+    assert fitness_function.eval_count == 3
+
+
+def test_local_optimization_keeps_one_accumulator_per_structure(stream,
+                                                                sin_agraph):
+    training_data = StreamingExplicitTrainingData(*stream)
+    fitness_function = StreamingExplicitRegression(training_data,
+                                                   cache_size=2)
+    other_agraph = sin_agraph.copy()
+    other_agraph.command_array = np.array([[0, 0, 0],
+                                           [1, 0, 0],
+                                           [7, 0, 0],
+                                           [4, 2, 1]])
+    fitness_function(other_agraph)
+    local_opt_fitness_function = ContinuousLocalOptimization(fitness_function,
+                                                             "Nelder-Mead")
+    unoptimized_agraph = AGraph()
+    unoptimized_agraph.command_array = sin_agraph.command_array
+    local_opt_fitness_function(unoptimized_agraph)
+    assert fitness_function.eval_count > 10
+
+    num_evals = fitness_function.eval_count
+    fitness_function(unoptimized_agraph)
+    fitness_function(other_agraph)
+    assert fitness_function.eval_count == num_evals
+
+
+def test_non_streaming_training_data_is_fully_evaluated(stream, sin_agraph):
+    training_data = ExplicitTrainingData(*stream)
+    fitness_function = StreamingExplicitRegression(training_data)
+    expected_fitness = ExplicitRegression(training_data)(sin_agraph)
+    assert fitness_function(sin_agraph) == pytest.approx(expected_fitness)
+    fitness_function(sin_agraph)
+    assert fitness_function.eval_count == 2